@@ -0,0 +1,149 @@
+"""Benchmark the status history queries on a large database.
+
+Builds a status_history of N rows (one account checked every 15 s, with
+short outages and a long outage still open at the end) in the pre-migration
+layout, times the legacy queries (strftime month filter, timestamp scans,
+no indexes, raw rows for a 90-day chart), migrates it with ``init_db`` and
+times the same questions through ``src.shared.database``.
+
+Usage:
+    python bench_db.py [rows]
+"""
+
+import logging
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.shared import database
+
+ACCOUNT = "usuario@contoso.com"
+OPEN_OUTAGE_ROWS = 50_000
+
+LEGACY_MONTH_SQL = """
+    SELECT status FROM status_history
+    WHERE strftime('%Y', timestamp) = ? AND strftime('%m', timestamp) = ?
+    ORDER BY id ASC
+"""
+LEGACY_LAST_OK_SQL = "SELECT timestamp FROM status_history WHERE status = 'OK' AND (? IS NULL OR account = ?) ORDER BY id DESC LIMIT 1"
+LEGACY_FIRST_AFTER_SQL = "SELECT timestamp FROM status_history WHERE timestamp > ? AND (? IS NULL OR account = ?) ORDER BY id ASC LIMIT 1"
+LEGACY_RANGE_SQL = "SELECT timestamp, status, message FROM status_history WHERE timestamp >= ? ORDER BY timestamp ASC"
+CHART_HOURS = 90 * 24
+
+
+def build_legacy(path: Path, rows: int) -> datetime:
+    rng = random.Random(3)
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE status_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+            status TEXT NOT NULL,
+            message TEXT,
+            is_change BOOLEAN DEFAULT 0,
+            account TEXT
+        )
+    """)
+    t = datetime(2024, 1, 1)
+    step = timedelta(seconds=15)
+
+    def generate():
+        nonlocal t
+        status, remaining = "OK", 0
+        for i in range(rows):
+            if i >= rows - OPEN_OUTAGE_ROWS:
+                status = "NOT_RUNNING"
+            elif remaining <= 0:
+                status = "OK" if status != "OK" else rng.choice(["PAUSED", "NOT_RUNNING", "AUTH_REQUIRED"])
+                remaining = rng.randint(200, 2000) if status == "OK" else rng.randint(2, 40)
+            remaining -= 1
+            yield str(t), status, status, False, ACCOUNT
+            t += step
+
+    conn.executemany("INSERT INTO status_history (timestamp, status, message, is_change, account) VALUES (?, ?, ?, ?, ?)",
+                     generate())
+    conn.commit()
+    conn.close()
+    return t
+
+
+def count_incidents(statuses) -> int:
+    """The walk of get_monthly_incident_count over (status,) rows."""
+    count, in_incident = 0, False
+    for (status,) in statuses:
+        if status != "OK":
+            count += not in_incident
+            in_incident = True
+        else:
+            in_incident = False
+    return count
+
+
+def timed(fn, repeat: int = 5) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.WARNING)
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "history.db"
+        start = time.perf_counter()
+        end = build_legacy(path, rows)
+        print(f"Built {rows:,} rows ({path.stat().st_size / 1e6:.0f} MB) in {time.perf_counter() - start:.1f} s, "
+              f"last row {end:%Y-%m-%d}")
+        month = (end.year, end.month)
+
+        conn = sqlite3.connect(path)
+
+        def legacy_month():
+            return count_incidents(conn.execute(LEGACY_MONTH_SQL, (str(month[0]), f"{month[1]:02d}")))
+
+        def legacy_outage():
+            last_ok = conn.execute(LEGACY_LAST_OK_SQL, (ACCOUNT, ACCOUNT)).fetchone()
+            return conn.execute(LEGACY_FIRST_AFTER_SQL, (last_ok[0], ACCOUNT, ACCOUNT)).fetchone()[0]
+
+        def legacy_chart():
+            conn.execute(LEGACY_RANGE_SQL, (str(end - timedelta(hours=CHART_HOURS)),)).fetchall()
+
+        legacy = {
+            "monthly count": timed(legacy_month),
+            "outage start": timed(legacy_outage),
+            "90-day chart": timed(legacy_chart),
+        }
+        conn.close()
+
+        database.DB_NAME = str(path)
+        start = time.perf_counter()
+        database.init_db()
+        print(f"Migrated to schema v{database.SCHEMA_VERSION} (indexes, incidents and rollups built) in {time.perf_counter() - start:.1f} s")
+
+        current = {
+            "monthly count": timed(lambda: database.get_monthly_incident_count(*month)),
+            "outage start": timed(lambda: str(database.get_outage_start_time(ACCOUNT))),
+            "90-day chart": timed(lambda: database.get_chart_series(hours=CHART_HOURS, end=end) and None),
+        }
+        database.close_pools()
+
+        print(f"{'query':<14} {'legacy ms':>10} {'indexed ms':>11} {'speedup':>8}")
+        for name, (before, before_result) in legacy.items():
+            after, after_result = current[name]
+            same = "" if str(before_result) == str(after_result) else f"  (results differ: {before_result} vs {after_result})"
+            print(f"{name:<14} {before:10.2f} {after:11.3f} {before / after:7.0f}x{same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Load test: thousands of simulated agents pushing to the fleet collector.
+
+Runs the collector app in-process (httpx ASGI transport, no sockets) with a
+temporary SQLite store. Every agent pushes one report per round; a fraction
+of them flips to a failing status each round so the history table sees
+changes. Reports ingest throughput, batch count and fleet query latency.
+
+Usage:
+    python bench_fleet_collector.py [agents] [rounds] [concurrency]
+"""
+
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import httpx
+
+from src.collector.main import create_app
+from src.collector.store import FleetStore
+from src.shared.schemas import FleetIngest, OneDriveStatus, StatusReport
+
+FAILING = [OneDriveStatus.SYNCING, OneDriveStatus.PAUSED, OneDriveStatus.NOT_RUNNING, OneDriveStatus.AUTH_REQUIRED]
+
+
+def make_report(agent: int, status: OneDriveStatus) -> StatusReport:
+    return StatusReport(
+        timestamp=datetime.now(),
+        account_email=f"user{agent}@contoso.com",
+        account_folder=f"C:\\Users\\user{agent}\\OneDrive - Contoso",
+        status=status,
+        process_running=status != OneDriveStatus.NOT_RUNNING,
+        out_of_sync_since=None if status == OneDriveStatus.OK else datetime.now(),
+    )
+
+
+async def run(agents: int, rounds: int, concurrency: int) -> None:
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FleetStore(str(Path(tmp) / "fleet.db"))
+        app = create_app(store)
+        limit = asyncio.Semaphore(concurrency)
+        latencies: list[float] = []
+
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://collector") as client:
+
+                async def push(agent: int) -> None:
+                    status = rng.choice(FAILING) if rng.random() < 0.05 else OneDriveStatus.OK
+                    body = FleetIngest(host=f"pc-{agent:05d}", reports=[make_report(agent, status)])
+                    async with limit:
+                        start = time.perf_counter()
+                        response = await client.post("/api/ingest", content=body.model_dump_json(),
+                                                     headers={"Content-Type": "application/json"})
+                        latencies.append(time.perf_counter() - start)
+                    assert response.status_code == 202, response.text
+
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    await asyncio.gather(*(push(agent) for agent in range(agents)))
+                ingest_elapsed = time.perf_counter() - start
+
+                while store.pending:
+                    await asyncio.sleep(0.05)
+                drained_elapsed = time.perf_counter() - start
+
+                query_start = time.perf_counter()
+                summary = (await client.get("/api/fleet/summary")).json()
+                worst = (await client.get("/api/fleet/worst", params={"limit": 10})).json()
+                detail = (await client.get("/api/fleet/hosts/pc-00000")).json()
+                query_elapsed = time.perf_counter() - query_start
+
+        total = agents * rounds
+        latencies.sort()
+        print(f"Simulated fleet: {agents} agents x {rounds} rounds = {total} reports (concurrency {concurrency})")
+        print(f"  Ingest accepted  : {ingest_elapsed:8.2f} s ({total / ingest_elapsed:8.0f} reports/s)")
+        print(f"  Written to SQLite: {drained_elapsed:8.2f} s in {store.batches_written} batches "
+              f"({store.reports_written} reports)")
+        print(f"  POST latency     : p50 {latencies[len(latencies) // 2] * 1000:6.2f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:6.2f} ms")
+        print(f"  Fleet queries    : {query_elapsed * 1000:8.2f} ms (summary + worst + host)")
+        print(f"  By status        : {summary['by_status']}")
+        print(f"  Worst offender   : {worst[0]['host'] if worst else '-'}; "
+              f"pc-00000 changes: {len(detail['history'])}")
+
+
+def main() -> None:
+    agents = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    asyncio.run(run(agents, rounds, concurrency))
+
+
+if __name__ == "__main__":
+    main()
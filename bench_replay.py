@@ -0,0 +1,97 @@
+"""Benchmark the replay engine on a synthetic flapping trace.
+
+Writes a trace of one account checked every 15 s for N days, with random
+short NOT_RUNNING blips, PAUSED spells and an occasional AUTH_REQUIRED
+outage. Then replays it through the remediator and notification rules on a
+virtual clock and reports trace size, replay speed and the decisions taken.
+
+Usage:
+    python bench_replay.py [days] [interval_seconds]
+"""
+
+import logging
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.monitor.recorder import Observation, ObservationRecorder
+from src.shared.schemas import OneDriveStatus
+from src.simulator.replay import replay_trace, summarize
+
+ACCOUNT = "usuario@contoso.com"
+
+
+def observation(t: float, status: OneDriveStatus) -> Observation:
+    running = status != OneDriveStatus.NOT_RUNNING
+    liveness = status if status in (OneDriveStatus.OK, OneDriveStatus.PAUSED) else OneDriveStatus.OK
+    return Observation(
+        t=t,
+        account=ACCOUNT,
+        status=status,
+        process=running,
+        registry=True,
+        tray_auth=status == OneDriveStatus.AUTH_REQUIRED if running else None,
+        auth_window=False if running else None,
+        liveness=liveness if running else None,
+        liveness_detail="Activo" if running else None,
+        canary_age=12.0 if running else None,
+        canary_state="IN_SYNC" if running else None,
+        sync={"files_to_upload": 0, "blocks_parsed": 1} if running else None,
+    )
+
+
+def write_trace(path: Path, days: float, interval: float) -> int:
+    rng = random.Random(7)
+    recorder = ObservationRecorder(path)
+    t = 1_700_000_000.0
+    end = t + days * 86400
+    status, remaining = OneDriveStatus.OK, 0
+    while t < end:
+        if remaining <= 0:
+            roll = rng.random()
+            if status != OneDriveStatus.OK:
+                status, remaining = OneDriveStatus.OK, rng.randint(20, 400)
+            elif roll < 0.5:
+                status, remaining = OneDriveStatus.NOT_RUNNING, rng.randint(1, 3)
+            elif roll < 0.9:
+                status, remaining = OneDriveStatus.PAUSED, rng.randint(2, 30)
+            else:
+                status, remaining = OneDriveStatus.AUTH_REQUIRED, rng.randint(10, 120)
+        recorder.record(observation(t, status))
+        remaining -= 1
+        t += interval
+    recorder.close()
+    return recorder.recorded
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.ERROR)
+    days = float(sys.argv[1]) if len(sys.argv) > 1 else 30
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 15
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "trace.jsonl.gz"
+        start = time.perf_counter()
+        cycles = write_trace(path, days, interval)
+        write_elapsed = time.perf_counter() - start
+        print(f"Synthetic trace: {cycles} cycles ({days:g} days every {interval:g}s), "
+              f"{path.stat().st_size / 1024:.0f} KiB gzip ({path.stat().st_size / cycles:.1f} B/cycle), "
+              f"written in {write_elapsed:.2f} s")
+
+        start = time.perf_counter()
+        results = replay_trace(path)
+        total = time.perf_counter() - start
+        for result in results.values():
+            print(summarize(result).splitlines()[0])
+            print(f"  Transitions {len(result.transitions)}, restarts {len(result.restarts)}, "
+                  f"notifications {len(result.notifications)}, mismatches {result.mismatches}")
+        print(f"  Read + replay: {total:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark the full monitor pipeline against the OneDrive digital twin.
+
+Plays scenarios (built-in or from a YAML/JSON file) through the real
+checker, status.json, SQLite history, remediator and notification logic on
+any OS. Reports per-scenario detection latency, restarts, notifications and
+cycle duration percentiles.
+
+Usage:
+    python bench_simulator.py [scenario|all|file.yaml] [time_scale]
+
+A time_scale of 0.05 runs monitor time 20x faster than real time.
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.simulator.runner import SimulationResult, SimulationRunner
+from src.simulator.scenario import BUILTIN_SCENARIOS, Scenario
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def print_result(result: SimulationResult, elapsed: float) -> None:
+    cycles_ms = [s * 1000 for s in result.cycle_seconds]
+    print(f"{result.scenario}: {'PASS' if result.passed else 'FAIL'} "
+          f"({len(result.timeline)} cycles in {elapsed:.1f} s, final {result.final_status.value if result.final_status else '-'})")
+    for d in result.detections:
+        latency = f"{d.latency:6.1f} s" if d.latency is not None else "  never"
+        print(f"  {d.event:<15} @ {d.at:6.1f} s -> {d.expected.value:<14} detected after {latency}")
+    print(f"  Restarts         : {result.restarts}")
+    print(f"  Notifications    : {len(result.notifications)} "
+          f"({', '.join(n.subject for n in result.notifications) or '-'})")
+    if cycles_ms:
+        print(f"  Cycle duration   : p50 {percentile(cycles_ms, 0.5):6.2f} ms, "
+              f"p95 {percentile(cycles_ms, 0.95):6.2f} ms, max {max(cycles_ms):6.2f} ms")
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.WARNING)
+    which = sys.argv[1] if len(sys.argv) > 1 else "all"
+    time_scale = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+
+    if which == "all":
+        scenarios = list(BUILTIN_SCENARIOS.values())
+    elif which in BUILTIN_SCENARIOS:
+        scenarios = [BUILTIN_SCENARIOS[which]]
+    else:
+        scenarios = [Scenario.load(Path(which))]
+
+    failed = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        runner = SimulationRunner(Path(tmp), time_scale=time_scale)
+        for scenario in scenarios:
+            start = time.perf_counter()
+            result = runner.run(scenario)
+            print_result(result, time.perf_counter() - start)
+            failed += not result.passed
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
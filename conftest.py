@@ -0,0 +1,26 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from src.shared import database
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Path of a monitor database that does not exist yet.
+
+    The writer thread and pooled connections opened by the test are closed
+    afterwards.
+    """
+    path = tmp_path / "monitor.db"
+    monkeypatch.setattr(database, "DB_NAME", str(path))
+    yield path
+    database.stop_writer()
+    database.close_pools()
+
+
+@pytest.fixture
+def db(db_path):
+    """Path of a monitor database initialised at the current schema version."""
+    database.init_db()
+    return db_path
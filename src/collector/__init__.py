@@ -0,0 +1 @@
+# Collector module
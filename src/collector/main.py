@@ -0,0 +1,107 @@
+"""OneDrive Fleet Collector - Aplicación FastAPI.
+
+Receives the status reports pushed by many monitor agents and serves fleet
+views: counts per status, worst offenders and a per-host drill-down.
+"""
+
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+
+from src.collector.store import FleetStore
+from src.shared.config import get_config
+from src.shared.schemas import FleetIngest
+
+logger = logging.getLogger(__name__)
+
+# Upper bound of the ``limit`` query parameter of the fleet views
+MAX_LIMIT = 500
+
+
+def create_app(store: Optional[FleetStore] = None) -> FastAPI:
+    """Build the collector app.
+
+    Args:
+        store: Fleet store to use (built from ``collector`` config on startup if None).
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        fleet = store
+        if fleet is None:
+            settings = get_config().collector
+            fleet = FleetStore(
+                settings.db_path,
+                batch_size=settings.batch_size,
+                flush_interval=settings.flush_interval_seconds,
+            )
+        app.state.store = fleet
+        fleet.start()
+        logger.info(f"Colector de flota listo (BD: {fleet.db_path})")
+        try:
+            yield
+        finally:
+            fleet.stop()
+
+    app = FastAPI(
+        title="Monitor OneDrive Empresarial - Colector de Flota",
+        description="Agrega el estado de sincronización de OneDrive de muchos equipos",
+        version="1.0.0",
+        lifespan=lifespan,
+    )
+
+    @app.post("/api/ingest", status_code=202)
+    async def api_ingest(batch: FleetIngest) -> Any:
+        """Recibe uno o más reportes de estado de un agente."""
+        accepted = app.state.store.enqueue(batch.host, batch.reports)
+        if accepted < len(batch.reports):
+            # Queue full: tell the agent to keep the rest and retry later
+            return JSONResponse(status_code=503, content={"accepted": accepted, "rejected": len(batch.reports) - accepted})
+        return {"accepted": accepted}
+
+    # Fleet views query SQLite synchronously: plain ``def`` runs them in the
+    # threadpool so they never hold up ingest on the event loop
+
+    @app.get("/api/fleet/summary")
+    def api_fleet_summary() -> dict[str, Any]:
+        """Cantidad de cuentas por estado en toda la flota."""
+        return app.state.store.summary(stale_after=get_config().collector.stale_after_seconds)
+
+    @app.get("/api/fleet/worst")
+    def api_fleet_worst(limit: int = 20) -> list[dict[str, Any]]:
+        """Cuentas con peor estado, primero las de incidente más largo."""
+        _check_limit(limit)
+        return app.state.store.worst(limit)
+
+    @app.get("/api/fleet/hosts/{host}")
+    def api_fleet_host(host: str, limit: int = 50) -> dict[str, Any]:
+        """Último reporte de cada cuenta de un equipo y sus cambios recientes."""
+        _check_limit(limit)
+        detail = app.state.store.host_detail(host, limit)
+        if detail is None:
+            raise HTTPException(status_code=404, detail=f"Equipo desconocido: {host}")
+        return detail
+
+    @app.get("/api/fleet/ingest-stats")
+    async def api_ingest_stats() -> dict[str, int]:
+        """Contadores del escritor por lotes."""
+        fleet = app.state.store
+        return {
+            "pending": fleet.pending,
+            "reports_written": fleet.reports_written,
+            "batches_written": fleet.batches_written,
+            "reports_rejected": fleet.reports_rejected,
+        }
+
+    return app
+
+
+def _check_limit(limit: int) -> None:
+    if not 1 <= limit <= MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit debe estar entre 1 y {MAX_LIMIT}")
+
+
+app = create_app()
@@ -0,0 +1,283 @@
+"""Fleet store: latest status per host/account plus status-change history.
+
+Agents push ``StatusReport``s to the collector. ``FleetStore.enqueue`` only
+appends to an in-memory queue; a single writer thread drains it and writes
+each batch in one SQLite transaction (WAL mode), so thousands of agents cost
+a handful of commits per second instead of one per report.
+
+Tables:
+    fleet_hosts   : one row per (host, account) with the latest report.
+    fleet_history : one row per status change (host, account, status, time).
+"""
+
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Any, NamedTuple, Optional
+
+from src.shared.schemas import STATUS_SEVERITY, OneDriveStatus, StatusReport
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS fleet_hosts (
+    host TEXT NOT NULL,
+    account TEXT NOT NULL,
+    status TEXT NOT NULL,
+    severity INTEGER NOT NULL,
+    status_detail TEXT,
+    reported_at TEXT NOT NULL,
+    received_at REAL NOT NULL,
+    out_of_sync_since TEXT,
+    report TEXT NOT NULL,
+    PRIMARY KEY (host, account)
+);
+CREATE INDEX IF NOT EXISTS idx_fleet_hosts_severity ON fleet_hosts (severity DESC, out_of_sync_since);
+CREATE TABLE IF NOT EXISTS fleet_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    host TEXT NOT NULL,
+    account TEXT NOT NULL,
+    status TEXT NOT NULL,
+    reported_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fleet_history_host ON fleet_history (host, id);
+"""
+
+
+class AgentReport(NamedTuple):
+    """One status report pushed by an agent, stamped on arrival."""
+
+    host: str
+    report: StatusReport
+    received_at: float
+
+
+class FleetStore:
+    """SQLite-backed fleet state with a batching writer thread."""
+
+    def __init__(
+        self,
+        db_path: str = "fleet.db",
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_queue: int = 100_000,
+    ) -> None:
+        """
+        Args:
+            db_path: SQLite database file.
+            batch_size: Reports written per transaction at most.
+            flush_interval: Seconds the writer waits to fill a batch.
+            max_queue: Reports held in memory before ingest is refused.
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.reports_written = 0
+        self.batches_written = 0
+        # Refused because the queue was full, or lost in a batch that failed to commit
+        self.reports_rejected = 0
+        self._queue: "queue.Queue[AgentReport]" = queue.Queue(maxsize=max_queue)
+        self._last_status: dict[tuple[str, str], str] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            for host, account, status in conn.execute("SELECT host, account, status FROM fleet_hosts"):
+                self._last_status[(host, account)] = status
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # --- Ingest ---------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="fleet-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Flush pending reports and stop the writer thread.
+
+        The writer thread writes what is still queued before it exits; if it
+        does not exit in time the queue is left to it rather than written
+        concurrently from here.
+        """
+        self._stop.set()
+        if self._thread is None:
+            self.flush()
+            return
+        self._thread.join(timeout=10)
+        if self._thread.is_alive():
+            logger.warning(f"Colector: el escritor no terminó a tiempo; {self.pending} reportes sin escribir")
+
+    def enqueue(self, host: str, reports: list[StatusReport]) -> int:
+        """Queue reports for the writer.
+
+        Returns:
+            Number of reports accepted (the rest were refused: queue full).
+        """
+        received_at = time.time()
+        accepted = 0
+        for report in reports:
+            try:
+                self._queue.put_nowait(AgentReport(host, report, received_at))
+                accepted += 1
+            except queue.Full:
+                self.reports_rejected += len(reports) - accepted
+                logger.warning(f"Colector: cola llena, {len(reports) - accepted} reportes de {host} rechazados")
+                break
+        return accepted
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self) -> int:
+        """Write everything queued so far (used on shutdown and in tests)."""
+        written = 0
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return written
+            self._write_batch(batch)
+            written += len(batch)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._write_or_reject(self._drain(block=True))
+        # Final drain on stop, from this thread only
+        while batch := self._drain(block=False):
+            self._write_or_reject(batch)
+
+    def _write_or_reject(self, batch: list[AgentReport]) -> None:
+        if not batch:
+            return
+        try:
+            self._write_batch(batch)
+        except Exception as e:
+            self.reports_rejected += len(batch)
+            logger.error(f"Colector: error escribiendo lote de {len(batch)} reportes (descartados): {e}")
+
+    def _drain(self, block: bool) -> list[AgentReport]:
+        batch: list[AgentReport] = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch: list[AgentReport]) -> None:
+        hosts = []
+        changes = []
+        # Only remembered once committed: a failed batch keeps its changes pending
+        latest: dict[tuple[str, str], str] = {}
+        for item in batch:
+            report = item.report
+            status = _status_value(report.status)
+            key = (item.host, report.account_email)
+            reported_at = report.timestamp.isoformat()
+            hosts.append((
+                item.host,
+                report.account_email,
+                status,
+                STATUS_SEVERITY.get(status, 1),
+                report.status_detail,
+                reported_at,
+                item.received_at,
+                report.out_of_sync_since.isoformat() if report.out_of_sync_since else None,
+                json.dumps(report.model_dump(mode="json"), separators=(",", ":")),
+            ))
+            if latest.get(key, self._last_status.get(key)) != status:
+                latest[key] = status
+                changes.append((item.host, report.account_email, status, reported_at))
+
+        with self._connect() as conn:
+            conn.executemany("""
+                INSERT INTO fleet_hosts (host, account, status, severity, status_detail, reported_at,
+                                         received_at, out_of_sync_since, report)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(host, account) DO UPDATE SET
+                    status = excluded.status,
+                    severity = excluded.severity,
+                    status_detail = excluded.status_detail,
+                    reported_at = excluded.reported_at,
+                    received_at = excluded.received_at,
+                    out_of_sync_since = excluded.out_of_sync_since,
+                    report = excluded.report
+            """, hosts)
+            if changes:
+                conn.executemany(
+                    "INSERT INTO fleet_history (host, account, status, reported_at) VALUES (?, ?, ?, ?)",
+                    changes,
+                )
+        self._last_status.update(latest)
+        self.reports_written += len(batch)
+        self.batches_written += 1
+
+    # --- Views ----------------------------------------------------------
+
+    def summary(self, stale_after: float = 300) -> dict[str, Any]:
+        """Counts per status plus agents that stopped reporting."""
+        cutoff = time.time() - stale_after
+        with self._connect() as conn:
+            counts = {row["status"]: row["n"] for row in conn.execute(
+                "SELECT status, COUNT(*) AS n FROM fleet_hosts GROUP BY status")}
+            hosts = conn.execute("SELECT COUNT(DISTINCT host) FROM fleet_hosts").fetchone()[0]
+            stale = conn.execute("SELECT COUNT(*) FROM fleet_hosts WHERE received_at < ?", (cutoff,)).fetchone()[0]
+        return {
+            "hosts": hosts,
+            "accounts": sum(counts.values()),
+            "by_status": counts,
+            "stale": stale,
+            "pending_ingest": self.pending,
+            "generated_at": datetime.now().isoformat(),
+        }
+
+    def worst(self, limit: int = 20) -> list[dict[str, Any]]:
+        """Accounts in the worst state, longest outage first."""
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT host, account, status, status_detail, reported_at, out_of_sync_since
+                FROM fleet_hosts
+                WHERE severity > 0
+                ORDER BY severity DESC, out_of_sync_since IS NULL, out_of_sync_since ASC
+                LIMIT ?
+            """, (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+    def host_detail(self, host: str, history_limit: int = 50) -> Optional[dict[str, Any]]:
+        """Latest report of every account of ``host`` and its recent changes."""
+        with self._connect() as conn:
+            accounts = conn.execute(
+                "SELECT report FROM fleet_hosts WHERE host = ? ORDER BY account", (host,)).fetchall()
+            if not accounts:
+                return None
+            history = conn.execute("""
+                SELECT account, status, reported_at FROM fleet_history
+                WHERE host = ? ORDER BY id DESC LIMIT ?
+            """, (host, history_limit)).fetchall()
+        return {
+            "host": host,
+            "accounts": [json.loads(row["report"]) for row in accounts],
+            "history": [dict(row) for row in history],
+        }
+
+
+def _status_value(status: Any) -> str:
+    # StatusReport uses use_enum_values, so status is usually already a str
+    return status.value if isinstance(status, OneDriveStatus) else str(status)
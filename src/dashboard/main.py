@@ -9,13 +9,22 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import HTMLResponse
 
-from src.shared.config import get_config
-from src.shared.database import get_recent_history, get_chart_data
+from src.shared.config import get_config, status_path_for
+from src.shared.database import (
+    get_chart_data,
+    get_chart_series,
+    get_longest_incident,
+    get_monthly_incident_count,
+    get_mttr,
+    get_open_incident,
+    get_recent_history,
+)
+from src.shared.status_file import read_status
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,59 +36,174 @@ app = FastAPI(
 )
 
 
-def get_status() -> dict[str, Any]:
-    """Lee el estado actual desde status.json."""
+def get_status(account: Optional[str] = None) -> dict[str, Any]:
+    """Lee el estado actual desde status.json (de la cuenta indicada o la principal)."""
     config = get_config()
-    status_path = Path(config.monitor.status_file)
+    index, target = 0, config.target
+    if account:
+        matches = [(i, t) for i, t in enumerate(config.targets) if t.email.lower() == account.lower()]
+        if not matches:
+            raise HTTPException(status_code=404, detail=f"Cuenta no monitoreada: {account}")
+        index, target = matches[0]
+    status_path = status_path_for(target, index, Path(config.monitor.status_file))
 
     if not status_path.exists():
         return {
             "status": "UNKNOWN",
             "message": "Archivo de estado no encontrado. ¿Está ejecutándose el monitor?",
             "timestamp": datetime.now().isoformat(),
-            "account_email": config.target.email,
-            "account_folder": config.target.folder,
+            "account_email": target.email,
+            "account_folder": target.folder,
             "process_running": False,
             "tooltip_text": None,
         }
 
     try:
-        with open(status_path, encoding="utf-8") as f:
-            return json.load(f)
+        return read_status(status_path)
     except Exception as e:
         logger.error(f"Error al leer archivo de estado: {e}")
         return {
             "status": "ERROR",
             "message": f"Error al leer archivo de estado: {e}",
             "timestamp": datetime.now().isoformat(),
-            "account_email": config.target.email,
-            "account_folder": config.target.folder,
+            "account_email": target.email,
+            "account_folder": target.folder,
             "process_running": False,
             "tooltip_text": None,
         }
 
 
 @app.get("/api/status")
-async def api_status() -> dict[str, Any]:
+async def api_status(account: Optional[str] = None) -> dict[str, Any]:
     """Obtiene el estado actual de OneDrive como JSON."""
-    return get_status()
+    return get_status(account)
+
+
+@app.get("/api/accounts")
+async def api_accounts() -> list[dict[str, Any]]:
+    """Estado actual de cada cuenta monitoreada."""
+    return [get_status(t.email) for t in get_config().targets]
+
+@app.get("/api/metrics")
+async def api_metrics(account: Optional[str] = None) -> dict[str, Any]:
+    """Latencia, errores, timeouts y procesos lanzados por cada validación."""
+    status = get_status(account)
+    return {
+        "timestamp": status.get("timestamp"),
+        "account_email": status.get("account_email"),
+        "probes": status.get("probe_metrics", {}),
+        "db_writer": status.get("db_writer"),
+    }
+
+
+@app.post("/api/profile", status_code=202)
+async def api_profile_request(cycles: int = 3) -> dict[str, Any]:
+    """Solicita al monitor perfilar sus próximos ciclos."""
+    if not 1 <= cycles <= 100:
+        raise HTTPException(status_code=400, detail="cycles debe estar entre 1 y 100")
+    request_path = Path(get_config().monitor.profile_request_file)
+    temp_path = request_path.with_suffix(".tmp")
+    temp_path.write_text(json.dumps({"cycles": cycles, "requested_at": datetime.now().isoformat()}), encoding="utf-8")
+    temp_path.replace(request_path)
+    return {"requested_cycles": cycles, "request_file": str(request_path)}
+
+
+@app.get("/api/profile")
+async def api_profile_list() -> dict[str, Any]:
+    """Perfiles de ciclo disponibles (.prof / .speedscope.json) y solicitud pendiente."""
+    monitor = get_config().monitor
+    profile_dir = Path(monitor.profile_dir)
+    files = sorted(
+        (p for p in profile_dir.glob("cycle_*") if p.suffix in (".prof", ".json")),
+        key=lambda p: p.stat().st_mtime,
+        reverse=True,
+    ) if profile_dir.exists() else []
+    return {
+        "pending_request": Path(monitor.profile_request_file).exists(),
+        "profiles": [
+            {"file": str(p), "size": p.stat().st_size, "modified": datetime.fromtimestamp(p.stat().st_mtime).isoformat()}
+            for p in files[:50]
+        ],
+    }
+
 
 @app.get("/api/history")
-async def api_history():
+async def api_history(account: Optional[str] = None):
     """Obtiene el historial reciente de estados."""
     try:
-        return get_recent_history(limit=50)
+        return get_recent_history(limit=50, account=account)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/chart-data")
-async def api_chart():
-    """Obtiene los datos para el gráfico de estados."""
+async def api_chart(account: Optional[str] = None, hours: Optional[float] = None):
+    """Obtiene los datos para el gráfico de estados.
+
+    Con ``hours`` devuelve las agregaciones (minuto, hora o día según el
+    rango); sin él, las últimas filas del historial.
+    """
+    if hours is not None and not 0 < hours <= 24 * 366:
+        raise HTTPException(status_code=400, detail="hours debe estar entre 0 y 8784")
     try:
-        return get_chart_data()
+        if hours is not None:
+            return get_chart_series(hours=hours, account=account)
+        return get_chart_data(account=account)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/incidents")
+async def api_incidents(account: Optional[str] = None) -> dict[str, Any]:
+    """Resumen de incidentes: del mes, MTTR, el más largo y el abierto."""
+    return {
+        "month_count": get_monthly_incident_count(account=account),
+        "mttr_seconds": get_mttr(account=account),
+        "longest": get_longest_incident(account=account),
+        "open": get_open_incident(account=account),
+    }
+
+
+def _render_sync_diagnostics(snapshot: Any) -> str:
+    """Renderiza los campos del último bloque de SyncDiagnostics.log."""
+    if not isinstance(snapshot, dict):
+        return ""
+    fields = [
+        ("Archivos por Subir", snapshot.get("files_to_upload")),
+        ("Archivos por Descargar", snapshot.get("files_to_download")),
+        ("Bytes por Subir", snapshot.get("bytes_to_upload")),
+        ("Estado de Progreso", snapshot.get("sync_progress_state")),
+        ("Diagnóstico (UTC)", snapshot.get("utc_now")),
+    ]
+    items = "".join(
+        f'<div><dt class="text-gray-400 text-sm">{label}</dt><dd class="font-mono text-sm">{value}</dd></div>'
+        for label, value in fields
+        if value is not None
+    )
+    if snapshot.get("auth_indicator"):
+        items += (
+            '<div><dt class="text-red-400 text-sm">Indicador de Autenticación</dt>'
+            f'<dd class="font-mono text-sm text-red-300">{snapshot["auth_indicator"]}</dd></div>'
+        )
+    return items
+
+
+def _render_watchdog(status: dict) -> str:
+    """Renderiza avisos del watchdog: ciclo excedido y validaciones obsoletas."""
+    items = ""
+    overrun = status.get("cycle_overrun_seconds")
+    if overrun:
+        items += (
+            '<div class="md:col-span-2 bg-yellow-900/30 p-2 rounded border border-yellow-500/30">'
+            '<dt class="text-yellow-400 text-xs uppercase font-bold">⏱️ Ciclo de Monitoreo Excedido</dt>'
+            f'<dd class="font-mono text-sm text-yellow-300">{overrun:.0f}s sin completar la verificación</dd></div>'
+        )
+    stale = status.get("stale_probes") or []
+    if stale:
+        items += (
+            '<div class="md:col-span-2"><dt class="text-yellow-400 text-sm">Validaciones con Resultado Anterior</dt>'
+            f'<dd class="font-mono text-sm text-yellow-300">{", ".join(stale)}</dd></div>'
+        )
+    return items
+
 
 @app.get("/", response_class=HTMLResponse)
 async def dashboard(request: Request) -> HTMLResponse:
@@ -126,7 +250,9 @@ async def dashboard(request: Request) -> HTMLResponse:
         except Exception:
             not_sync_display = str(not_sync_raw)
 
-    from src.shared.database import get_monthly_incident_count
+    sync_diag_html = _render_sync_diagnostics(status.get("sync_diagnostics"))
+    watchdog_html = _render_watchdog(status)
+
     incident_count = get_monthly_incident_count()
     html = f"""<!DOCTYPE html>
 <html lang="es">
@@ -184,13 +310,24 @@ async def dashboard(request: Request) -> HTMLResponse:
                         <dt class="text-gray-400 text-sm">Carpeta</dt>
                         <dd class="font-mono text-sm truncate" title="{status.get('account_folder', 'N/A')}">{status.get('account_folder', 'N/A')}</dd>
                     </div>
+
+                    {watchdog_html}
+                    {sync_diag_html}
                 </dl>
             </div>
 
 
             <!-- Gráfico de Actividad -->
             <div class="bg-gray-800 rounded-xl p-6 shadow-xl">
-                <h3 class="text-xl font-semibold mb-4 border-b border-gray-700 pb-2">📈 Actividad</h3>
+                <div class="flex justify-between items-center mb-4 border-b border-gray-700 pb-2">
+                    <h3 class="text-xl font-semibold">📈 Actividad</h3>
+                    <select id="chartRange" class="bg-gray-700 text-sm rounded px-2 py-1" onchange="loadChart()">
+                        <option value="24">24 horas</option>
+                        <option value="168">7 días</option>
+                        <option value="720">30 días</option>
+                        <option value="2160">90 días</option>
+                    </select>
+                </div>
                 <div class="relative h-64 w-full">
                     <canvas id="activityChart"></canvas>
                 </div>
@@ -236,16 +373,23 @@ async def dashboard(request: Request) -> HTMLResponse:
             'AUTH_REQUIRED': 0.2, 'NOT_RUNNING': 0, 'ERROR': 0, 'UNKNOWN': -0.1
         }};
         
+        let activityChart = null;
+
         async function loadChart() {{
             try {{
-                const res = await fetch('/api/chart-data');
+                // Peor estado de cada intervalo (minuto, hora o día según el rango)
+                const hours = Number(document.getElementById('chartRange').value);
+                const res = await fetch(`/api/chart-data?hours=${{hours}}`);
                 const data = await res.json();
                 
                 const ctx = document.getElementById('activityChart').getContext('2d');
-                const labels = data.map(d => new Date(d.timestamp).toLocaleTimeString());
+                const labels = data.map(d => hours > 24
+                    ? new Date(d.timestamp).toLocaleString()
+                    : new Date(d.timestamp).toLocaleTimeString());
                 const points = data.map(d => STATUS_SCORES[d.status] || 0);
                 
-                new Chart(ctx, {{
+                if (activityChart) activityChart.destroy();
+                activityChart = new Chart(ctx, {{
                     type: 'line',
                     data: {{
                         labels: labels,
@@ -37,23 +37,19 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def run_monitor_async() -> None:
-    """Run the monitor in a thread to not block the event loop."""
-    from src.monitor.main import run_monitor
-    import asyncio
+async def run_monitor_async(shutdown_event: asyncio.Event) -> None:
+    """Run the monitor as a task of the shared event loop."""
+    from src.monitor.main import run_monitor_async as monitor_loop
     logger.info("🔍 Starting OneDrive Monitor...")
     try:
-        # Pasar shutdown_event al monitor para cierre limpio
-        loop = asyncio.get_running_loop()
-        shutdown_event = getattr(loop, "_shutdown_event", None)
-        await asyncio.to_thread(run_monitor, shutdown_event)
+        await monitor_loop(shutdown_event)
     except Exception as e:
         logger.error(f"Monitor error: {e}")
         raise
 
 
-async def run_dashboard_async(host: str = "0.0.0.0", port: int = 2048) -> None:
-    """Run the FastAPI dashboard with uvicorn."""
+async def run_dashboard_async(shutdown_event: asyncio.Event, host: str = "0.0.0.0", port: int = 2048) -> None:
+    """Run the FastAPI dashboard with uvicorn until shutdown_event is set."""
     import uvicorn
     from src.dashboard.main import app
     
@@ -67,12 +63,21 @@ async def run_dashboard_async(host: str = "0.0.0.0", port: int = 2048) -> None:
         access_log=True,
     )
     server = uvicorn.Server(config)
-    
+    # Stop uvicorn when main() receives a signal, and the monitor when uvicorn
+    # caught it first (it captures SIGINT/SIGTERM while serving)
+    async def stop_on_shutdown() -> None:
+        await shutdown_event.wait()
+        server.should_exit = True
+
+    stopper = asyncio.create_task(stop_on_shutdown())
     try:
         await server.serve()
+        shutdown_event.set()
     except Exception as e:
         logger.error(f"Dashboard error: {e}")
         raise
+    finally:
+        stopper.cancel()
 
 
 async def main() -> None:
@@ -83,10 +88,7 @@ async def main() -> None:
     
     # Handle graceful shutdown
     shutdown_event = asyncio.Event()
-    # Guardar shutdown_event en el loop para acceso desde run_monitor_async
-    loop = asyncio.get_running_loop()
-    loop._shutdown_event = shutdown_event
-    
+
     def signal_handler():
         logger.info("\n⚠️ Shutdown signal received, stopping services...")
         shutdown_event.set()
@@ -103,8 +105,8 @@ async def main() -> None:
     try:
         # Run both services concurrently
         await asyncio.gather(
-            run_monitor_async(),
-            run_dashboard_async(),
+            run_monitor_async(shutdown_event),
+            run_dashboard_async(shutdown_event),
             return_exceptions=True,
         )
     except asyncio.CancelledError:
@@ -152,6 +154,10 @@ def cli() -> None:
         uv run onedrive_monitor           # Run both monitor and dashboard
         uv run onedrive_monitor monitor   # Run only the monitor
         uv run onedrive_monitor dashboard # Run only the dashboard (with reload)
+        uv run onedrive_monitor collector # Run the fleet collector service
+        uv run onedrive_monitor replay --trace monitor.jsonl.gz  # Replay a recorded trace
+        uv run onedrive_monitor backfill-incidents  # Rebuild the incidents table from the history
+        uv run onedrive_monitor backfill-rollups    # Rebuild the chart rollups from the history
     """
     parser = argparse.ArgumentParser(
         prog="onedrive_monitor",
@@ -160,15 +166,15 @@ def cli() -> None:
     parser.add_argument(
         "command",
         nargs="?",
-        choices=["monitor", "dashboard", "clean"],
+        choices=["monitor", "dashboard", "collector", "replay", "backfill-incidents", "backfill-rollups", "clean"],
         default=None,
-        help="Component to run: 'monitor', 'dashboard', 'clean', or omit for both",
+        help="Component to run: 'monitor', 'dashboard', 'collector', 'replay', 'backfill-incidents', 'backfill-rollups', 'clean', or omit for both",
     )
     parser.add_argument(
         "--port",
         type=int,
-        default=2048,
-        help="Port for the dashboard (default: 2048)",
+        default=None,
+        help="Port for the dashboard (default: 2048) or the collector (default: collector.port)",
     )
     parser.add_argument(
         "--host",
@@ -180,6 +186,15 @@ def cli() -> None:
         action="store_true",
         help="Disable auto-reload for dashboard",
     )
+    parser.add_argument(
+        "--trace",
+        help="Observation trace to replay (monitor.record_observations)",
+    )
+    parser.add_argument(
+        "--account",
+        default=None,
+        help="Replay only this account of the trace",
+    )
     
     args = parser.parse_args()
     
@@ -189,24 +204,62 @@ def cli() -> None:
             logger.info("=" * 60)
             logger.info("OneDrive Business Monitor - Monitor Only")
             logger.info("=" * 60)
-            from src.monitor.main import run_monitor
-            run_monitor()
+            from src.monitor.main import run_monitor_async as monitor_loop
+            asyncio.run(monitor_loop())
 
         elif args.command == "dashboard":
             # Run only dashboard with reload by default
             logger.info("=" * 60)
             logger.info(f"OneDrive Business Monitor - Dashboard Only")
-            logger.info(f"URL: http://{args.host}:{args.port}")
+            logger.info(f"URL: http://{args.host}:{args.port or 2048}")
             logger.info("=" * 60)
             import uvicorn
             uvicorn.run(
                 "src.dashboard.main:app",
                 host=args.host,
-                port=args.port,
+                port=args.port or 2048,
                 reload=not args.no_reload,
                 log_level="info",
             )
 
+        elif args.command == "collector":
+            # Fleet collector: agents push their status reports here
+            from src.shared.config import get_config
+            settings = get_config().collector
+            port = args.port or settings.port
+            logger.info("=" * 60)
+            logger.info("OneDrive Business Monitor - Fleet Collector")
+            logger.info(f"URL: http://{args.host}:{port}")
+            logger.info("=" * 60)
+            import uvicorn
+            uvicorn.run(
+                "src.collector.main:app",
+                host=args.host,
+                port=port,
+                log_level="info",
+            )
+
+        elif args.command == "replay":
+            # Remediator and notification rules over a recorded trace (virtual clock)
+            if not args.trace:
+                parser.error("replay requires --trace")
+            from src.simulator.replay import replay_trace, summarize
+            logging.getLogger("src.monitor.remediator").setLevel(logging.WARNING)
+            for result in replay_trace(Path(args.trace), args.account).values():
+                print(summarize(result))
+
+        elif args.command == "backfill-incidents":
+            # Incidents of databases written before the incidents table, or imported history
+            from src.shared.database import backfill_incidents
+            count = backfill_incidents()
+            logger.info(f"Tabla incidents reconstruida: {count} incidentes.")
+
+        elif args.command == "backfill-rollups":
+            # Minute/hour/day chart rollups of imported or pre-rollup history
+            from src.shared.database import backfill_rollups
+            backfill_rollups()
+            logger.info("Agregaciones del gráfico reconstruidas.")
+
         elif args.command == "clean":
             from src.main_clean import clean_monitor_data
             clean_monitor_data()
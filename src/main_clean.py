@@ -1,12 +1,14 @@
 import os
 from pathlib import Path
 
+from src.shared.status_file import heartbeat_path_for
+
 def clean_monitor_data():
-    """Elimina la base de datos y el archivo de estado actual del monitor."""
+    """Elimina la base de datos y el archivo de estado actual del monitor (con su heartbeat)."""
     db_path = Path("onedrive_monitor.db")
     status_path = Path("status.json")
     removed = []
-    for path in [db_path, status_path]:
+    for path in [db_path, status_path, heartbeat_path_for(status_path)]:
         if path.exists():
             path.unlink()
             removed.append(str(path))
@@ -1,40 +1,160 @@
 """OneDrive Business status checker - Headless Mode (No Tooltips)."""
 
 import logging
-import winreg
 import os
 import time
-import subprocess
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-import psutil
-import win32api
-import win32con
-
-from src.shared.config import get_config, is_validation_enabled
-from src.shared.schemas import OneDriveStatus
+try:
+    import win32api
+    import win32con
+
+    HAS_WIN32 = True
+except ImportError:  # Not on Windows (simulator, tests): attributes come from the placeholder provider
+    HAS_WIN32 = False
+
+from src.monitor.cycle_context import CycleContext, cycle_cached
+from src.monitor.log_tailer import LogTailer
+from src.monitor.metrics import get_metrics, instrumented
+from src.monitor.profiler import InlineExecutor, get_profiler
+from src.monitor.probes import DEFAULT_PROBE_DEADLINES, ProbeResult, format_timings, resolve_status, run_probes
+from src.monitor.placeholder import PlaceholderProvider, PlaceholderState, decode_attributes
+from src.monitor.process_finder import OneDriveProcessLocator
+from src.monitor.machine import MachineObservations
+from src.monitor.registry_index import RegistryProvider
+from src.monitor.settings_scan import SETTINGS_FILES
+from src.monitor.shell_worker import ShellStatusWorker
+from src.monitor.sync_diagnostics import AUTH_LOG_WINDOW_BYTES, SyncDiagnosticsParser, only_canary_pending
+from src.monitor.watchdog import ProbeTimeoutError, run_with_deadline
+from src.shared.config import TargetConfig, get_config, is_validation_enabled
+from src.shared.schemas import OneDriveStatus, SyncDiagnosticsSnapshot
 
 logger = logging.getLogger(__name__)
 
+# Values assumed when a probe misses its deadline: never raise an alarm on a
+# slow probe alone.
+PROBE_TIMEOUT_DEFAULTS = {
+    "registry_check": True,
+    "process_check": True,
+    "tray_auth_check": False,
+    "liveness_check": (OneDriveStatus.UNKNOWN, "Verificación de liveness excedió el tiempo límite"),
+    "auth_window_check": False,
+}
+
 
 class OneDriveChecker:
     """Check OneDrive for Business status via Process and File Attributes (Headless)."""
 
-    def __init__(self) -> None:
+    # How often to force a re-check (turn valid cloud file into local)
+    LIVENESS_PROBE_INTERVAL = 60
+    # How long to wait for sync before declaring PAUSED
+    LIVENESS_SYNC_TIMEOUT = 60
+
+    def __init__(
+        self,
+        registry_provider: Optional[RegistryProvider] = None,
+        target: Optional[TargetConfig] = None,
+        machine: Optional[MachineObservations] = None,
+    ) -> None:
+        """
+        Args:
+            registry_provider: Registry source (only used if ``machine`` is not given).
+            target: Account to check. Defaults to the first configured target.
+            machine: Machine-wide observations shared with other accounts'
+                checkers. A private instance is created if omitted.
+        """
         self.config = get_config()
+        self.target = target or self.config.target
         # tooltip_prefix is no longer used for detection, but kept in config if needed later
-        
+
+        # Process, registry, desktop windows and PowerShell host are machine-wide
+        self._owns_machine = machine is None
+        self.machine = machine or MachineObservations(registry_provider)
+        self.account_index = self.machine.account_index
+        self.target_is_personal = "personal" in self.target.folder.lower()
+
         # Active Check State
-        self.log_path = Path(os.path.expandvars(self.config.monitor.log_path))
-        self.canary_path = Path(self.config.target.folder) / self.config.monitor.canary_file
+        self.log_path = Path(os.path.expandvars(self.target.log_path or self.config.monitor.log_path))
+        self.canary_path = Path(self.target.folder) / self.config.monitor.canary_file
         self.last_log_mtime = 0.0
         self.last_canary_write_time = 0.0
         self.waiting_for_log_update = False
         self.stalled_detected = False  # Persist STALLED state
         self.stalled_since = 0.0
+        # Canary placeholder state from attribute bits (None: legacy COM column)
+        self.placeholder_provider: Optional[PlaceholderProvider] = self.machine.placeholder_provider
+        self.last_canary_state = PlaceholderState.UNKNOWN
+        # Raw liveness observations of the last cycle (observation recorder)
+        self.last_canary_age: Optional[float] = None
+        self.last_shell_status: Optional[str] = None
+        # Last cycle's probe results
+        self.last_probe_results: dict[str, ProbeResult] = {}
+        # Last successful value per probe, used when a probe hangs or fails
+        self.last_good_results: dict[str, object] = {}
+        # Observations of the cycle in progress (see begin_cycle)
+        self.cycle: Optional[CycleContext] = None
+        self._cycle_count = 0
+
+        # One incremental tailer for SyncDiagnostics.log feeding the typed parser
+        self.sync_log_tailer = LogTailer(self.log_path.parent / "SyncDiagnostics.log",
+                                         backfill_bytes=AUTH_LOG_WINDOW_BYTES)
+        self.sync_diagnostics = SyncDiagnosticsParser()
+        self.sync_log_tailer.subscribe(self.sync_diagnostics.feed, self.sync_diagnostics.reset)
+        # Probes run concurrently; the tailer/parser pair is not thread-safe
+        self._sync_log_lock = threading.Lock()
+
+    def begin_cycle(self) -> CycleContext:
+        """Start a new observation cycle.
+
+        Every probe result and observation made until the next call is cached
+        in the returned context, so repeated questions within one cycle do
+        not spawn PowerShell or re-read files again. A private
+        ``MachineObservations`` starts its cycle here too; a shared one is
+        cycled by the monitor loop once for all accounts.
+        """
+        if self._owns_machine:
+            self.machine.begin_cycle()
+        self._cycle_count += 1
+        self.cycle = CycleContext(self._cycle_count)
+        self.last_canary_age = None
+        self.last_shell_status = None
+        return self.cycle
+
+    @cycle_cached("sync_snapshot")
+    def get_sync_snapshot(self) -> Optional[SyncDiagnosticsSnapshot]:
+        """Read new SyncDiagnostics.log lines and return the latest typed snapshot.
 
+        Returns:
+            The snapshot, or None if the log file is not available.
+        """
+        with self._sync_log_lock:
+            try:
+                self.sync_log_tailer.poll()
+            except Exception as e:
+                logger.debug(f"Error reading SyncDiagnostics.log: {e}")
+                return None
+            if self.sync_log_tailer.identity is None:
+                return None
+            return self.sync_diagnostics.snapshot(self.sync_log_tailer.offset)
+
+    @property
+    def process_locator(self) -> OneDriveProcessLocator:
+        return self.machine.locator(self.target_is_personal)
+
+    @property
+    def shell_worker(self) -> Optional[ShellStatusWorker]:
+        return self.machine.shell_worker
+
+    def close(self) -> None:
+        """Release background resources (only if the machine observations are private)."""
+        if self._owns_machine:
+            self.machine.close()
+
+    @cycle_cached("process_check")
+    @instrumented("process_check")
     def check_process(self) -> bool:
         """Check if the specific OneDrive process for this account is running."""
         validation_name = "process_check"
@@ -43,34 +163,15 @@ class OneDriveChecker:
         if not is_validation_enabled(validation_name):
             logger.info(f"Validation '{validation_name}' is disabled. Skipping.")
             return True
-        target_is_personal = "personal" in self.config.target.folder.lower()
-        
-        for proc in psutil.process_iter(["name", "cmdline"]):
-            try:
-                if proc.info["name"] and proc.info["name"].lower() == "onedrive.exe":
-                    cmdline = proc.info.get("cmdline", [])
-                    if not cmdline:
-                        continue
-                        
-                    cmd_str = " ".join(cmdline).lower()
-                    
-                    # If monitoring Business/Enterprise
-                    if not target_is_personal:
-                        # Ignore explicitly Personal instances
-                        if "/client=personal" in cmd_str:
-                            continue
-                        return True
-                    else:
-                        # Monitoring Personal
-                        if "/client=personal" in cmd_str:
-                            return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                continue
-                
-        return False
+        return self.machine.find_onedrive(self.target_is_personal) is not None
 
+    @cycle_cached("shell_status")
+    @instrumented("shell_status")
     def _get_shell_status_ps(self, file_path: Path) -> Optional[str]:
         """Query 'Availability status' (Col 305) via PowerShell Shell.Application.
+
+        Uses the persistent worker host unless ``shell_worker_enabled`` is off,
+        in which case a one-shot PowerShell process is spawned.
         
         Args:
             file_path: Valid path to a file in OneDrive.
@@ -80,6 +181,12 @@ class OneDriveChecker:
         """
         if not file_path.exists():
             return None
+
+        if self.config.monitor.shell_worker_enabled:
+            raw = self.machine.get_shell_worker().query(file_path)
+            if raw:
+                logger.debug(f"PowerShell Status for {file_path.name}: '{raw}'")
+            return raw
             
         try:
             # PowerShell command to get detail 305 specifically
@@ -93,11 +200,10 @@ class OneDriveChecker:
             if ($item) {{ $folder.GetDetailsOf($item, 305) }}
             """
             
-            result = subprocess.run(
+            result = run_with_deadline(
                 ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+                timeout=self.config.monitor.probe_subprocess_timeout_seconds,
+                name="shell_status",
             )
             
             if result.returncode == 0:
@@ -106,53 +212,33 @@ class OneDriveChecker:
                     logger.debug(f"PowerShell Status for {file_path.name}: '{raw}'")
                     return raw
             return None
+        except ProbeTimeoutError:
+            raise
         except Exception as e:
             logger.error(f"Error checking PowerShell status: {e}")
+            get_metrics().record_error("shell_status")
             return None
 
     def is_only_canary_syncing(self) -> bool:
         """Check if only the canary file is syncing (to suppress SYNCING notifications).
         
-        Reads SyncDiagnostics.log to check FilesToUpload count.
+        Uses the FilesToUpload field of the latest SyncDiagnostics.log snapshot.
         If FilesToUpload <= 1 and canary is pending, assume it's just the canary.
         """
-        try:
-            log_path = self.log_path
-            if not log_path.exists():
-                return False
-            
-            # Read last 10KB of the log to find FilesToUpload
-            with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                f.seek(0, 2)
-                file_size = f.tell()
-                read_size = min(file_size, 10000)
-                f.seek(max(0, file_size - read_size))
-                content = f.read()
-            
-            # Parse FilesToUpload from log
-            files_to_upload = 0
-            for line in content.split('\n'):
-                if 'FilesToUpload' in line and '=' in line:
-                    try:
-                        value = line.split('=')[1].strip()
-                        files_to_upload = int(value)
-                    except (ValueError, IndexError):
-                        pass
-            
-            # If only 0 or 1 file is pending upload, it's likely just the canary
-            if files_to_upload <= 1:
-                logger.debug(f"Only {files_to_upload} file(s) to upload - likely just canary")
-                return True
-            else:
-                logger.debug(f"{files_to_upload} files to upload - real sync in progress")
-                return False
-                
-        except Exception as e:
-            logger.debug(f"Error checking sync file count: {e}")
+        snapshot = self.get_sync_snapshot()
+        if snapshot is None:
             return False
 
+        if only_canary_pending(snapshot):
+            logger.debug(f"Only {snapshot.files_to_upload or 0} file(s) to upload - likely just canary")
+            return True
+        logger.debug(f"{snapshot.files_to_upload} files to upload - real sync in progress")
+        return False
+
+    @cycle_cached("registry_check")
+    @instrumented("registry_check")
     def verify_registry_account(self) -> bool:
-        """Verify the target account exists in registry."""
+        """Verify the target account exists in registry (cached account index)."""
         logger.info("Ejecutando validación: registry_check")
         validation_name = "registry_check"
         if not is_validation_enabled(validation_name):
@@ -160,35 +246,21 @@ class OneDriveChecker:
             return True
 
         try:
-            accounts_path = r"Software\Microsoft\OneDrive\Accounts"
-            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, accounts_path) as accounts_key:
-                i = 0
-                while True:
-                    try:
-                        subkey_name = winreg.EnumKey(accounts_key, i)
-                        if subkey_name.startswith("Business"):
-                            subkey_path = f"{accounts_path}\\{subkey_name}"
-                            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, subkey_path) as subkey:
-                                try:
-                                    user_email, _ = winreg.QueryValueEx(subkey, "UserEmail")
-                                    user_folder, _ = winreg.QueryValueEx(subkey, "UserFolder")
-
-                                    if user_email.lower() == self.config.target.email.lower():
-                                        logger.info(f"Found matching account in registry: {user_email} -> {user_folder}")
-                                        return True
-                                except FileNotFoundError:
-                                    pass
-                        i += 1
-                    except OSError:
-                        break
-            logger.warning(f"Account {self.config.target.email} not found in OneDrive registry")
+            entry = self.machine.lookup_account(self.target.email, self.target_is_personal)
+            if entry is not None:
+                logger.info(f"Found matching account in registry: {self.target.email} -> {entry.user_folder}")
+                return True
+            logger.warning(f"Account {self.target.email} not found in OneDrive registry")
             return False
         except Exception as e:
             logger.error(f"Error checking registry: {e}")
+            get_metrics().record_error("registry_check")
             return False
 
+    @instrumented("canary_check")
     def _check_canary_attributes_changed(self) -> bool:
         """Check if canary file attributes indicate it was processed by OneDrive (ReparsePoint)."""
+        self.last_canary_state = PlaceholderState.UNKNOWN
         validation_name = "canary_check"
         logger.info("Ejecutando validación: canary_check")
         from src.shared.config import is_validation_enabled
@@ -197,17 +269,25 @@ class OneDriveChecker:
             return False
         if not self.canary_path.exists():
             return False
+        self.last_canary_state = self.canary_state()
+        if self.last_canary_state.is_placeholder:
+            logger.debug(f"Canary is a placeholder ({self.last_canary_state.value}). OneDrive alive.")
+            return True
+        return False
+
+    def canary_state(self) -> PlaceholderState:
+        """Placeholder state of the canary from its attribute bits (one stat call)."""
+        if self.placeholder_provider is not None:
+            return self.placeholder_provider.state(self.canary_path)
+        if not HAS_WIN32:
+            return PlaceholderState.UNKNOWN
         try:
-            attrs = win32api.GetFileAttributes(str(self.canary_path))
             # FILE_ATTRIBUTE_REPARSE_POINT (0x400) is the standard indicator for Cloud Files
-            is_reparse = bool(attrs & win32con.FILE_ATTRIBUTE_REPARSE_POINT)
-            if is_reparse:
-                logger.debug(f"Canary has REPARSE_POINT attribute ({attrs:X}). OneDrive alive.")
-                return True
-            return False
+            return decode_attributes(win32api.GetFileAttributes(str(self.canary_path)))
         except Exception as e:
             logger.debug(f"Error checking canary attributes: {e}")
-            return False
+            get_metrics().record_error("canary_check")
+            return PlaceholderState.UNKNOWN
 
     def _write_canary(self) -> bool:
         """Write timestamp to canary file."""
@@ -216,7 +296,7 @@ class OneDriveChecker:
             self.canary_path.parent.mkdir(parents=True, exist_ok=True)
             
             # Clear attributes to ensure we can write (remove Hidden/ReadOnly if set)
-            if self.canary_path.exists():
+            if HAS_WIN32 and self.canary_path.exists():
                 try:
                     win32api.SetFileAttributes(str(self.canary_path), win32con.FILE_ATTRIBUTE_NORMAL)
                 except Exception:
@@ -226,17 +306,21 @@ class OneDriveChecker:
                 f.write(f"Monitor Verification: {datetime.now().isoformat()}")
             
             # Try to hide it again
-            try:
-                win32api.SetFileAttributes(str(self.canary_path), win32con.FILE_ATTRIBUTE_HIDDEN)
-            except Exception:
-                pass
+            if HAS_WIN32:
+                try:
+                    win32api.SetFileAttributes(str(self.canary_path), win32con.FILE_ATTRIBUTE_HIDDEN)
+                except Exception:
+                    pass
                 
             self.last_canary_write_time = time.time()
             return True
         except Exception as e:
             logger.error(f"Failed to write canary file: {e}")
+            get_metrics().record_error("liveness_check")
             return False
 
+    @cycle_cached("liveness_check")
+    @instrumented("liveness_check")
     def active_liveness_check(self) -> tuple[OneDriveStatus, str]:
         validation_name = "liveness_check"
         logger.info("Ejecutando validación: liveness_check")
@@ -270,11 +354,12 @@ class OneDriveChecker:
              return OneDriveStatus.OK, "Inicializando (Canary Faltante)"
 
         age = current_time - mtime
+        self.last_canary_age = age
         
         # PROBE_INTERVAL: How often to force a re-check (turn valid cloud file into local)
-        PROBE_INTERVAL = 60 
+        PROBE_INTERVAL = self.LIVENESS_PROBE_INTERVAL
         # SYNC_TIMEOUT: How long to wait for sync before declaring PAUSED
-        SYNC_TIMEOUT = 60
+        SYNC_TIMEOUT = self.LIVENESS_SYNC_TIMEOUT
 
         if is_cloud:
             # It is synced. Status is healthy.
@@ -292,7 +377,19 @@ class OneDriveChecker:
             
             # EARLY DETECTION: Don't wait 60s if we can know NOW that it is paused.
             # Query PowerShell immediately if we are in the "Waiting" phase.
-            ps_status = self._get_shell_status_ps(self.canary_path)
+            # The native attribute bits already say "not uploaded yet", so within
+            # the grace period the localized COM column is only read when they are
+            # unavailable. Past it, the column tells a busy upload (Pendiente ->
+            # SYNCING) from a stall before PAUSED is declared.
+            attributes_known = (
+                self.placeholder_provider is not None
+                and self.last_canary_state is PlaceholderState.NOT_PLACEHOLDER
+            )
+            if attributes_known and age <= SYNC_TIMEOUT:
+                ps_status = None
+            else:
+                ps_status = self._get_shell_status_ps(self.canary_path)
+            self.last_shell_status = ps_status
             if ps_status:
                 ps_lower = ps_status.lower()
                 
@@ -348,31 +445,26 @@ class OneDriveChecker:
             # Still within grace period
             return OneDriveStatus.OK, f"Activo (Sincronizando... {age:.0f}s)"
 
+    @cycle_cached("auth_window_check")
+    @instrumented("auth_window_check")
     def check_auth_window(self) -> bool:
         """Check if a OneDrive authentication window is present."""
         try:
-            # Look for typical Sign In window titles
-            cmd = "Get-Process | Where-Object { $_.MainWindowTitle -match 'Sign in|Iniciar sesión|Microsoft OneDrive|Contraseña|Password' } | Select-Object -ExpandProperty MainWindowTitle"
-            
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", cmd],
-                capture_output=True,
-                text=True,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
-            
-            if result.returncode == 0:
-                titles = result.stdout.strip().split('\n')
-                # Filter out empty strings and check if we have any matches
-                msg = [t.strip() for t in titles if t.strip()]
-                if msg:
-                     logger.warning(f"Auth Window Detected: {msg}")
-                     return True
+            # Look for typical Sign In window titles (machine-wide, once per cycle)
+            msg = self.machine.auth_window_titles()
+            if msg:
+                 logger.warning(f"Auth Window Detected: {msg}")
+                 return True
             return False
+        except ProbeTimeoutError:
+            raise
         except Exception as e:
             logger.error(f"Error checking auth window: {e}")
+            get_metrics().record_error("auth_window_check")
             return False
 
+    @cycle_cached("tray_auth_check")
+    @instrumented("tray_auth_check")
     def check_tray_auth_required(self) -> bool:
         """Check if OneDrive requires authentication.
         
@@ -389,103 +481,37 @@ class OneDriveChecker:
             return False
             
         try:
-            # Method 1: Check SyncDiagnostics.log for auth issues
+            # Method 1: Check SyncDiagnostics.log for auth issues (last 50KB)
+            snapshot = self.get_sync_snapshot()
+            if snapshot is not None and snapshot.auth_indicator:
+                logger.warning(f"Tray Auth: Found '{snapshot.auth_indicator}' in SyncDiagnostics.log")
+                return True
             log_dir = self.log_path.parent
-            sync_diag_log = log_dir / "SyncDiagnostics.log"
-            
-            if sync_diag_log.exists():
-                try:
-                    # Read last 50KB of the log file
-                    with open(sync_diag_log, 'r', encoding='utf-8', errors='ignore') as f:
-                        f.seek(0, 2)  # Go to end
-                        file_size = f.tell()
-                        read_size = min(file_size, 50000)
-                        f.seek(max(0, file_size - read_size))
-                        content = f.read()
-                    
-                    # Look for auth-related errors in recent log content
-                    auth_indicators = [
-                        "SignIn",
-                        "AuthenticationRequired", 
-                        "CredentialsRequired",
-                        "NeedsPassword",
-                        "TokenExpired",
-                        "OAuth",
-                        "LoginRequired",
-                        "ReauthRequired"
-                    ]
-                    
-                    for indicator in auth_indicators:
-                        if indicator.lower() in content.lower():
-                            logger.warning(f"Tray Auth: Found '{indicator}' in SyncDiagnostics.log")
-                            return True
-                            
-                except Exception as e:
-                    logger.debug(f"Error reading SyncDiagnostics.log: {e}")
             
             # Method 2: Check for credential windows using simple PowerShell
-            # Use the configured target title for more precise matching
-            from src.shared.config import get_config
-            config = get_config()
-            target_title = config.target.title if hasattr(config.target, 'title') else 'OneDrive'
-            
-            ps_script = f"""
-$procs = Get-Process -Name OneDrive -ErrorAction SilentlyContinue
-foreach ($proc in $procs) {{
-    $title = $proc.MainWindowTitle
-    # Check for auth-related keywords in OneDrive windows
-    if ($title -and ($title -match 'Sign in|Iniciar ses|Contrase|Password|credential|credencial|vuelve a escribir')) {{
-        Write-Output "AUTH_WINDOW:$title"
-    }}
-    # Also check if the configured OneDrive title has auth keywords
-    if ($title -match '{target_title}' -and ($title -match 'Sign in|credential|credencial|vuelve')) {{
-        Write-Output "ONEDRIVE_AUTH:$title"
-    }}
-}}
-
-# Check for specific Microsoft account login windows (not general Microsoft apps)
-$loginProcs = Get-Process | Where-Object {{ 
-    $_.MainWindowTitle -match 'Sign in to your account|Iniciar sesi.n en su cuenta|cuenta de Microsoft|Microsoft account'
-}}
-foreach ($lp in $loginProcs) {{
-    Write-Output "LOGIN_WINDOW:$($lp.MainWindowTitle)"
-}}
-"""
-            
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
-            
-            if result.returncode == 0 and result.stdout.strip():
-                output = result.stdout.strip()
+            # (machine-wide scan shared by every account in the cycle)
+            output = self.machine.tray_auth_output()
+            if output:
                 if "AUTH_WINDOW:" in output or "LOGIN_WINDOW:" in output:
                     logger.warning(f"Tray Auth Required Detected: {output}")
                     return True
             
-            # Method 3: Check dat files for user signed out status
-            dat_path = log_dir.parent / "settings" / "Business1" / "global.dat"
-            if dat_path.exists():
-                try:
-                    with open(dat_path, 'rb') as f:
-                        content = f.read()
-                    # Look for SignedOut or similar markers in binary content
-                    if b'SignedOut' in content or b'RequireSignIn' in content:
-                        logger.warning("Tray Auth: Found auth required marker in global.dat")
-                        return True
-                except Exception:
-                    pass
-                    
+            # Method 3: Check settings files (global.dat, global.ini, ClientPolicy.ini)
+            # for user signed out status; unchanged files are not read again
+            settings_dir = log_dir.parent / "settings" / log_dir.name
+            hit = self.machine.settings_cache.find_any(settings_dir / name for name in SETTINGS_FILES)
+            if hit:
+                path, marker = hit
+                logger.warning(f"Tray Auth: Found auth required marker '{marker}' in {path.name}")
+                return True
+
             return False
             
-        except subprocess.TimeoutExpired:
-            logger.debug("Tray auth check timed out")
-            return False
+        except ProbeTimeoutError:
+            raise
         except Exception as e:
             logger.debug(f"Error checking tray auth: {e}")
+            get_metrics().record_error("tray_auth_check")
             return False
 
     def get_full_status(self) -> tuple[OneDriveStatus, bool, Optional[str]]:
@@ -496,15 +522,20 @@ foreach ($lp in $loginProcs) {{
         if not is_validation_enabled(validation_name):
             logger.info(f"Validation '{validation_name}' is disabled. Skipping.")
             return OneDriveStatus.OK, True, "Validación status_assignment deshabilitada"
-        # 0. Check if account is still configured (Registry Check)
-        # This detects if the user has logged out (Registry key removed)
-        if not self.verify_registry_account():
-            return OneDriveStatus.NOT_FOUND, False, "Configuración de Cuenta Faltante (Sesión Cerrada)"
-
-        process_running = self.check_process()
-
-        if not process_running:
-            return OneDriveStatus.NOT_RUNNING, False, None
+        self.begin_cycle()
+        # Phase 1: gate probes. Registry (logged out -> NOT_FOUND) and process
+        # (NOT_RUNNING) are cheap and decide whether the rest is worth running.
+        gate = self._run_probes({
+            "registry_check": self.verify_registry_account,
+            "process_check": self.check_process,
+        })
+        registry_ok = gate["registry_check"].value
+        process_running = gate["process_check"].value
+        if not registry_ok or not process_running or self.machine.stopping.is_set():
+            self._report_probe_timings(gate)
+            return resolve_status(registry_ok, process_running, False, (OneDriveStatus.UNKNOWN, None), False)
+        # Gates passed: both desktop window scans start now, in parallel with phase 2
+        self.machine.start_scans()
 
         # Process IS running, but is it OUR process?
         # If the target log file hasn't updated in > 5 minutes, assume our instance is dead/killed
@@ -521,16 +552,45 @@ foreach ($lp in $loginProcs) {{
         except Exception as e:
              logger.warning(f"Could not verify log age: {e}")
 
-        # Check for tray auth required (credential messages in system tray)
-        if self.check_tray_auth_required():
-            return OneDriveStatus.AUTH_REQUIRED, process_running, "Credenciales Requeridas (Icono de Bandeja)"
-
-        # Active Liveness Check is now the PRIMARY source of truth
-        status, msg = self.active_liveness_check()
-        
-        # Check for auth window - override any status if auth window is detected
-        # This catches cases where OneDrive shows auth window but status is SYNCING/other
-        if self.check_auth_window():
-            return OneDriveStatus.AUTH_REQUIRED, process_running, "Autenticación Requerida (Ventana Detectada)"
-        
-        return status, process_running, msg
+        # Phase 2: tray auth (credential messages in system tray), Active Liveness
+        # Check (PRIMARY source of truth) and auth window run concurrently.
+        # An auth window overrides any liveness status (e.g. SYNCING).
+        results = self._run_probes({
+            "tray_auth_check": self.check_tray_auth_required,
+            "liveness_check": self.active_liveness_check,
+            "auth_window_check": self.check_auth_window,
+        })
+        self._report_probe_timings({**gate, **results})
+
+        return resolve_status(
+            registry_ok,
+            process_running,
+            results["tray_auth_check"].value,
+            results["liveness_check"].value,
+            results["auth_window_check"].value,
+        )
+
+    def _run_probes(self, probes: dict) -> dict[str, ProbeResult]:
+        """Run probes concurrently on the checker's bounded pool, each with its deadline."""
+        deadlines = {**DEFAULT_PROBE_DEADLINES, **self.config.monitor.probe_deadlines}
+        profiler = get_profiler()
+        # Pool threads are invisible to cProfile: run probes inline while it profiles
+        executor = InlineExecutor() if profiler is not None and profiler.inline_probes else self.machine.probe_executor
+        results = run_probes(executor, probes, deadlines, PROBE_TIMEOUT_DEFAULTS, self.last_good_results)
+        for r in results.values():
+            # Missed the pool deadline while still running (a probe that raised
+            # ProbeTimeoutError itself was already counted by @instrumented)
+            if r.timed_out and r.error is None:
+                get_metrics().record_timeout(r.name)
+        return results
+
+    @property
+    def stale_probes(self) -> list[str]:
+        """Probes of the last cycle that fell back to an earlier result."""
+        return [r.name for r in self.last_probe_results.values() if r.stale]
+
+    def _report_probe_timings(self, results: dict[str, ProbeResult]) -> None:
+        self.last_probe_results = results
+        logger.debug(f"Tiempos de validación: {format_timings(results)}")
+        if self.cycle is not None:
+            logger.debug(f"Caché del ciclo {self.cycle.cycle_id}: {self.cycle.summary()}")
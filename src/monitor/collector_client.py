@@ -0,0 +1,123 @@
+"""Push status reports to the fleet collector.
+
+``CollectorPusher.push`` never blocks the monitor loop: reports go into a
+bounded buffer and a background thread posts whatever is pending as one
+batch. While the collector is unreachable the newest ``buffer_size``
+reports are kept and sent on the next successful attempt.
+"""
+
+import logging
+import socket
+import threading
+from collections import deque
+from typing import Optional
+
+import httpx
+
+from src.shared.config import CollectorConfig
+from src.shared.schemas import FleetIngest, StatusReport
+
+logger = logging.getLogger(__name__)
+
+
+class CollectorPusher:
+    """Background sender of StatusReports to ``POST /api/ingest``."""
+
+    def __init__(
+        self,
+        url: str,
+        host_name: Optional[str] = None,
+        timeout: float = 5.0,
+        buffer_size: int = 100,
+        client: Optional[httpx.Client] = None,
+    ) -> None:
+        """
+        Args:
+            url: Collector base URL, e.g. ``http://collector:2050``.
+            host_name: Name of this machine in the fleet (hostname by default).
+            timeout: Seconds to wait for the collector.
+            buffer_size: Reports kept while the collector is unreachable.
+            client: HTTP client (injectable for tests).
+        """
+        self.endpoint = url.rstrip("/") + "/api/ingest"
+        self.host_name = host_name or socket.gethostname()
+        self._client = client or httpx.Client(timeout=timeout)
+        self._pending: deque[StatusReport] = deque(maxlen=buffer_size)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.failures = 0
+        self._thread = threading.Thread(target=self._run, name="collector-push", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_config(cls, settings: CollectorConfig) -> Optional["CollectorPusher"]:
+        """Pusher for ``collector.url``, or None when pushing is not configured."""
+        if not settings.url:
+            return None
+        return cls(
+            settings.url,
+            host_name=settings.host_name,
+            timeout=settings.push_timeout_seconds,
+            buffer_size=settings.push_buffer_size,
+        )
+
+    def push(self, report: StatusReport) -> None:
+        """Queue a report for the collector (oldest dropped when the buffer is full)."""
+        with self._lock:
+            self._pending.append(report)
+        self._wake.set()
+
+    def flush(self) -> bool:
+        """Send everything pending now.
+
+        Returns:
+            True if the collector accepted the batch (or nothing was pending).
+        """
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        if not batch:
+            return True
+        payload = FleetIngest(host=self.host_name, reports=batch)
+        try:
+            response = self._client.post(self.endpoint, content=payload.model_dump_json(),
+                                         headers={"Content-Type": "application/json"})
+            if response.status_code == 503:
+                accepted = response.json().get("accepted", 0)
+                self._requeue(batch[accepted:])
+                self.sent += accepted
+                return False
+            response.raise_for_status()
+            self.sent += len(batch)
+            return True
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Colector no disponible ({self.endpoint}): {e}")
+            self._requeue(batch)
+            return False
+
+    def _requeue(self, batch: list[StatusReport]) -> None:
+        with self._lock:
+            # Reports pushed meanwhile are newer: keep them after the retried ones
+            newer = list(self._pending)
+            self._pending.clear()
+            self._pending.extend(batch)
+            self._pending.extend(newer)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self.flush()
+
+    def close(self) -> None:
+        """Send what is pending and stop the background thread."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+        self._client.close()
@@ -0,0 +1,115 @@
+"""Per-cycle memoization of probe observations.
+
+A single ``get_full_status`` cycle can ask the same question several times:
+``check_auth_window`` runs inside ``active_liveness_check`` (SYNCING and
+timeout branches) and again as its own probe, each one a full PowerShell
+``Get-Process``. A ``CycleContext`` lives for exactly one cycle and caches
+every observation made during it (process, auth windows, shell status, log
+snapshot, probe results), so any later caller gets the first answer.
+
+Concurrent callers asking for the same key while it is still being computed
+wait for that computation instead of starting their own.
+"""
+
+import functools
+import logging
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class CycleContext:
+    """Observation cache for one monitor cycle."""
+
+    def __init__(self, cycle_id: int = 0) -> None:
+        self.cycle_id = cycle_id
+        self.started_at = time.monotonic()
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self._entries: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing it on first use.
+
+        Args:
+            key: Observation key, e.g. ``"auth_window_check"`` or
+                ``("shell_status", path)``.
+            compute: Zero-argument callable producing the value.
+
+        Returns:
+            The value computed by the first caller in this cycle. If that
+            computation raised, every caller gets the same exception.
+        """
+        with self._lock:
+            future = self._entries.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._entries[key] = future
+                self.misses[_label(key)] += 1
+            else:
+                self.hits[_label(key)] += 1
+
+        if owner:
+            try:
+                future.set_result(compute())
+            except BaseException as e:
+                future.set_exception(e)
+        return future.result()
+
+    def seed(self, key: Hashable, value: Any) -> None:
+        """Store an observation made outside the context (first value wins)."""
+        with self._lock:
+            if key not in self._entries:
+                future = Future()
+                future.set_result(value)
+                self._entries[key] = future
+
+    def seed_future(self, key: Hashable, future: Future) -> None:
+        """Store an observation still being made outside the context.
+
+        Callers of ``key`` wait for ``future`` and get its result or exception.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = future
+
+    @property
+    def hit_count(self) -> int:
+        return sum(self.hits.values())
+
+    @property
+    def miss_count(self) -> int:
+        return sum(self.misses.values())
+
+    def summary(self) -> str:
+        """One-line summary of cache activity for the log."""
+        detail = ", ".join(f"{k}={v}" for k, v in sorted(self.hits.items()))
+        return f"{self.hit_count} aciertos / {self.miss_count} consultas" + (f" ({detail})" if detail else "")
+
+
+def _label(key: Hashable) -> str:
+    return key[0] if isinstance(key, tuple) else str(key)
+
+
+def cycle_cached(name: str) -> Callable:
+    """Memoize a checker method in its current ``CycleContext``.
+
+    The instance must have a ``cycle`` attribute; when it is None (no cycle
+    in progress) the method runs uncached. Positional arguments are part of
+    the key.
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args):
+            cycle = getattr(self, "cycle", None)
+            if cycle is None:
+                return method(self, *args)
+            return cycle.get((name, *args) if args else name, lambda: method(self, *args))
+        return wrapper
+    return decorator
@@ -0,0 +1,348 @@
+"""Filesystem change notifications for event-driven re-checks.
+
+The monitor loop polls every ``check_interval_seconds``. With
+``monitor.event_driven_enabled`` it also watches the canary file and the
+OneDrive logs through the OS change-notification API and wakes the loop as
+soon as one of them changes, so PAUSED and recoveries are detected within
+about a second instead of a full interval.
+
+Backends:
+    InotifyBackend              : Linux, inotify via ctypes (used by tests).
+    ReadDirectoryChangesBackend : Windows, overlapped ReadDirectoryChangesW.
+
+Events are debounced: a burst of writes (e.g. SyncDiagnostics.log being
+appended) produces a single wake-up once the directory has been quiet for
+``debounce_seconds``, or at the latest after ``MAX_DELAY_FACTOR`` times that.
+"""
+
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Wake at the latest after this many debounce periods of continuous events
+MAX_DELAY_FACTOR = 4
+
+# (directory, file name); name is None when the backend lost events (overflow)
+ChangeEvent = tuple[Optional[Path], Optional[str]]
+
+
+class ChangeBackend:
+    """OS-specific source of directory change events."""
+
+    def add_watch(self, directory: Path) -> None:
+        """Start watching the direct children of ``directory``."""
+        raise NotImplementedError
+
+    def read(self, timeout: float) -> list[ChangeEvent]:
+        """Block up to ``timeout`` seconds and return the events received."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release OS handles."""
+
+
+class InotifyBackend(ChangeBackend):
+    """Linux inotify through libc (no third-party dependency)."""
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+    def __init__(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._directories: dict[int, Path] = {}
+
+    def add_watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), self.WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self._directories[wd] = directory
+
+    def read(self, timeout: float) -> list[ChangeEvent]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events: list[ChangeEvent] = []
+        pos = 0
+        while pos + self.EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, pos)
+            pos += self.EVENT_HEADER.size
+            name = data[pos:pos + length].rstrip(b"\0").decode(errors="replace") or None
+            pos += length
+            if mask & self.IN_Q_OVERFLOW:
+                events.append((None, None))
+            else:
+                events.append((self._directories.get(wd), name))
+        return events
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class ReadDirectoryChangesBackend(ChangeBackend):
+    """Windows ReadDirectoryChangesW, one overlapped request per directory."""
+
+    FILE_LIST_DIRECTORY = 0x0001
+    BUFFER_SIZE = 8192
+
+    def __init__(self) -> None:
+        import win32con
+        import win32event  # noqa: F401  (fail early if pywin32 is missing)
+        import win32file  # noqa: F401
+
+        self._filter = (
+            win32con.FILE_NOTIFY_CHANGE_FILE_NAME
+            | win32con.FILE_NOTIFY_CHANGE_ATTRIBUTES  # reparse point / pinned state
+            | win32con.FILE_NOTIFY_CHANGE_SIZE
+            | win32con.FILE_NOTIFY_CHANGE_LAST_WRITE
+        )
+        self._watches: list[dict] = []
+
+    def add_watch(self, directory: Path) -> None:
+        import pywintypes
+        import win32con
+        import win32event
+        import win32file
+
+        handle = win32file.CreateFile(
+            str(directory),
+            self.FILE_LIST_DIRECTORY,
+            win32con.FILE_SHARE_READ | win32con.FILE_SHARE_WRITE | win32con.FILE_SHARE_DELETE,
+            None,
+            win32con.OPEN_EXISTING,
+            win32con.FILE_FLAG_BACKUP_SEMANTICS | win32con.FILE_FLAG_OVERLAPPED,
+            None,
+        )
+        overlapped = pywintypes.OVERLAPPED()
+        overlapped.hEvent = win32event.CreateEvent(None, True, False, None)
+        watch = {
+            "directory": directory,
+            "handle": handle,
+            "overlapped": overlapped,
+            "buffer": win32file.AllocateReadBuffer(self.BUFFER_SIZE),
+        }
+        self._issue(watch)
+        self._watches.append(watch)
+
+    def _issue(self, watch: dict) -> None:
+        import win32file
+
+        win32file.ReadDirectoryChangesW(
+            watch["handle"], watch["buffer"], False, self._filter, watch["overlapped"]
+        )
+
+    def read(self, timeout: float) -> list[ChangeEvent]:
+        import win32event
+        import win32file
+
+        if not self._watches:
+            time.sleep(timeout)
+            return []
+        handles = [w["overlapped"].hEvent for w in self._watches]
+        rc = win32event.WaitForMultipleObjects(handles, False, int(timeout * 1000))
+        if rc == win32event.WAIT_TIMEOUT:
+            return []
+
+        watch = self._watches[rc - win32event.WAIT_OBJECT_0]
+        size = win32file.GetOverlappedResult(watch["handle"], watch["overlapped"], True)
+        win32event.ResetEvent(watch["overlapped"].hEvent)
+        if size == 0:
+            # Buffer overflow: changes were lost, treat as "something changed"
+            events: list[ChangeEvent] = [(watch["directory"], None)]
+        else:
+            events = [(watch["directory"], name)
+                      for _, name in win32file.FILE_NOTIFY_INFORMATION(watch["buffer"], size)]
+        self._issue(watch)
+        return events
+
+    def close(self) -> None:
+        import win32file
+
+        for watch in self._watches:
+            try:
+                win32file.CancelIo(watch["handle"])
+                watch["handle"].Close()
+            except Exception:
+                pass
+        self._watches = []
+
+
+def create_backend() -> Optional[ChangeBackend]:
+    """Return the change-notification backend for this OS, or None."""
+    try:
+        if os.name == "nt":
+            return ReadDirectoryChangesBackend()
+        if sys.platform.startswith("linux"):
+            return InotifyBackend()
+    except Exception as e:
+        logger.warning(f"Notificaciones de sistema de archivos no disponibles: {e}")
+    return None
+
+
+class FileChangeWatcher:
+    """Wakes the monitor loop when watched files change (debounced)."""
+
+    def __init__(
+        self,
+        files: Iterable[Path],
+        debounce_seconds: float = 0.5,
+        backend: Optional[ChangeBackend] = None,
+    ) -> None:
+        """
+        Args:
+            files: Files to watch. Their parent directories are watched and
+                events are filtered down to these names.
+            debounce_seconds: Quiet period required before waking.
+            backend: Change source (defaults to ``create_backend()``).
+        """
+        self.debounce_seconds = debounce_seconds
+        self.targets: dict[Path, set[str]] = {}
+        for path in files:
+            path = Path(path)
+            self.targets.setdefault(path.parent, set()).add(path.name.lower())
+        self.backend = backend if backend is not None else create_backend()
+        self.events_seen = 0
+        self.wakeups = 0
+        self.last_changes: list[str] = []
+        self._wake = threading.Event()
+        # Called from the event thread on every wake-up (asyncio waiters)
+        self._listeners: list[Callable[[], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Arm the watches and start the event thread.
+
+        Returns:
+            True if at least one directory is being watched.
+        """
+        if self.backend is None:
+            return False
+        watched = 0
+        for directory in self.targets:
+            try:
+                self.backend.add_watch(directory)
+                watched += 1
+            except Exception as e:
+                logger.warning(f"No se puede observar {directory}: {e}")
+        if not watched:
+            return False
+        self._thread = threading.Thread(target=self._run, name="fs-watcher", daemon=True)
+        self._thread.start()
+        return True
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds, returning early on a change.
+
+        Returns:
+            True if woken by a file change, False on timeout.
+        """
+        woke = self._wake.wait(timeout)
+        if woke:
+            self._wake.clear()
+        return woke
+
+    async def wait_async(self, timeout: float) -> bool:
+        """``wait`` for the asyncio monitor loop (cancellable, no blocked thread).
+
+        Returns:
+            True if woken by a file change, False on timeout.
+        """
+        loop = asyncio.get_running_loop()
+        woke = asyncio.Event()
+        listener = lambda: loop.call_soon_threadsafe(woke.set)
+        self._listeners.append(listener)
+        try:
+            if self._wake.is_set():
+                woke.set()
+            try:
+                await asyncio.wait_for(woke.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+            self._wake.clear()
+            return True
+        finally:
+            self._listeners.remove(listener)
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        if self.backend is not None:
+            self.backend.close()
+
+    def _matches(self, event: ChangeEvent) -> bool:
+        directory, name = event
+        if directory is None or name is None:
+            return True  # overflow: cannot tell what changed
+        names = self.targets.get(directory)
+        return names is not None and name.lower() in names
+
+    def _run(self) -> None:
+        pending_since: Optional[float] = None
+        last_event = 0.0
+        changes: list[str] = []
+        while not self._stop.is_set():
+            try:
+                events = self.backend.read(self.debounce_seconds if pending_since is not None else 1.0)
+            except Exception as e:
+                logger.error(f"Error leyendo notificaciones de sistema de archivos: {e}")
+                return
+
+            now = time.monotonic()
+            relevant = [e for e in events if self._matches(e)]
+            if relevant:
+                self.events_seen += len(relevant)
+                changes.extend(str(name) for _, name in relevant if name)
+                if pending_since is None:
+                    pending_since = now
+                last_event = now
+
+            if pending_since is not None and (
+                now - last_event >= self.debounce_seconds
+                or now - pending_since >= self.debounce_seconds * MAX_DELAY_FACTOR
+            ):
+                self.last_changes = sorted(set(changes))
+                changes = []
+                pending_since = None
+                self.wakeups += 1
+                self._wake.set()
+                for listener in list(self._listeners):
+                    try:
+                        listener()
+                    except RuntimeError:
+                        pass  # Event loop already closed
@@ -0,0 +1,160 @@
+"""Incremental, rotation-aware tailer for OneDrive log files.
+
+Instead of re-reading a fixed window from the end of ``SyncDiagnostics.log``
+on every check, ``LogTailer`` remembers the byte offset and the identity of
+the file it is reading, and only reads bytes appended since the last poll.
+Every new chunk (complete lines only) is handed to all subscribers, so each
+byte is read and decoded once per cycle no matter how many checks use it.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# on_chunk(text, start_offset, end_offset) -- offsets are byte positions in the file
+ChunkCallback = Callable[[str, int, int], None]
+ResetCallback = Callable[[], None]
+
+# Bytes before the current offset re-checked on each read to detect a file
+# that was rewritten in place (same identity, size not smaller).
+FINGERPRINT_BYTES = 64
+
+
+class LogTailer:
+    """Follow a log file, reading only newly appended complete lines.
+
+    Truncation (file shrank below our offset) and rotation (a different file
+    now lives at the path) both reset subscribers and restart reading from the
+    new file.
+    """
+
+    def __init__(self, path: Path, backfill_bytes: int = 50000) -> None:
+        """Create a tailer.
+
+        Args:
+            path: Log file to follow.
+            backfill_bytes: On first open (or after rotation), how many bytes
+                from the end of the existing file to hand to subscribers.
+        """
+        self.path = path
+        self.backfill_bytes = backfill_bytes
+        self.offset = 0
+        self.identity: Optional[tuple[int, int]] = None
+        self.bytes_read = 0
+        self.rotations = 0
+
+        self._align = False
+        self._mtime_ns = 0
+        self._fingerprint = b""
+        self._subscribers: list[tuple[ChunkCallback, Optional[ResetCallback]]] = []
+
+    def subscribe(self, on_chunk: ChunkCallback, on_reset: Optional[ResetCallback] = None) -> None:
+        """Register a consumer for new log chunks.
+
+        Args:
+            on_chunk: Called with (text, start_offset, end_offset) for each new chunk.
+            on_reset: Called when the file was truncated, rotated or removed.
+        """
+        self._subscribers.append((on_chunk, on_reset))
+
+    def poll(self) -> str:
+        """Read any newly appended complete lines and dispatch them.
+
+        Returns:
+            The decoded new text ('' if nothing new).
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            if self.identity is not None:
+                logger.debug(f"LogTailer: {self.path.name} disappeared")
+                self._reset()
+            return ""
+
+        identity = (st.st_dev, st.st_ino)
+        if self.identity is None:
+            self._open(identity, st.st_size)
+        elif identity != self.identity:
+            logger.debug(f"LogTailer: {self.path.name} rotated")
+            self._restart(identity, st.st_size)
+        elif st.st_size < self.offset:
+            logger.debug(f"LogTailer: {self.path.name} truncated ({st.st_size} < {self.offset})")
+            self._restart(identity, st.st_size)
+        elif st.st_size == self.offset and st.st_mtime_ns == self._mtime_ns:
+            return ""
+        self._mtime_ns = st.st_mtime_ns
+
+        try:
+            with open(self.path, "rb") as f:
+                if self._fingerprint and not self._fingerprint_matches(f):
+                    # Same file, rewritten in place: what we read before is gone
+                    logger.debug(f"LogTailer: {self.path.name} rewritten in place")
+                    self._restart(identity, st.st_size)
+                if st.st_size <= self.offset:
+                    return ""
+                start = self.offset
+                if self._align:
+                    f.seek(start - 1)
+                    data = f.read(st.st_size - start + 1)
+                    if data[:1] == b"\n":
+                        data = data[1:]
+                    else:
+                        # Backfill landed mid-line: drop the partial first line
+                        newline = data.find(b"\n")
+                        if newline < 0:
+                            return ""
+                        data = data[newline + 1:]
+                        start += newline
+                else:
+                    f.seek(start)
+                    data = f.read(st.st_size - start)
+        except OSError as e:
+            logger.debug(f"LogTailer: error reading {self.path.name}: {e}")
+            return ""
+
+        # Keep an incomplete trailing line for the next poll
+        last_newline = data.rfind(b"\n")
+        if last_newline < 0:
+            self.offset = start
+            self._align = False
+            return ""
+        data = data[:last_newline + 1]
+        end = start + len(data)
+        self.offset = end
+        self._align = False
+        self._fingerprint = data[-FINGERPRINT_BYTES:]
+        self.bytes_read += len(data)
+
+        text = data.decode("utf-8", errors="ignore")
+        for on_chunk, _ in self._subscribers:
+            try:
+                on_chunk(text, start, end)
+            except Exception as e:
+                logger.debug(f"LogTailer: subscriber error: {e}")
+        return text
+
+    def _open(self, identity: tuple[int, int], size: int) -> None:
+        self.identity = identity
+        self.offset = max(0, size - self.backfill_bytes)
+        self._align = self.offset > 0
+        self._fingerprint = b""
+
+    def _restart(self, identity: tuple[int, int], size: int) -> None:
+        self.rotations += 1
+        self._reset()
+        self._open(identity, size)
+
+    def _fingerprint_matches(self, f) -> bool:
+        f.seek(self.offset - len(self._fingerprint))
+        return f.read(len(self._fingerprint)) == self._fingerprint
+
+    def _reset(self) -> None:
+        self.identity = None
+        self.offset = 0
+        self._fingerprint = b""
+        for _, on_reset in self._subscribers:
+            if on_reset is not None:
+                on_reset()
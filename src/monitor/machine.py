@@ -0,0 +1,244 @@
+"""Machine-wide observations shared by every monitored account.
+
+Some things a cycle looks at do not belong to one account: the process
+table, the OneDrive registry accounts, windows on the desktop and the
+PowerShell host used for Shell.Application queries. With several
+``targets`` configured, ``MachineObservations`` gathers each of them once
+per cycle (memoized in its own ``CycleContext``) and every
+``OneDriveChecker`` asks it instead of probing on its own. Per-account work
+(canary, SyncDiagnostics.log, liveness) stays in the checker.
+
+Under the asyncio monitor loop the two desktop window scans run there as
+async subprocesses: ``start_scans`` launches both at once, after the
+registry and process gates passed, and the probes wait for their results
+instead of each spawning PowerShell from a probe thread.
+"""
+
+import asyncio
+import logging
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+import psutil
+
+from src.monitor.cycle_context import CycleContext, cycle_cached
+from src.monitor.placeholder import PlaceholderProvider, create_provider
+from src.monitor.process_finder import OneDriveProcessLocator
+from src.monitor.registry_index import AccountEntry, AccountIndex, RegistryProvider, WindowsRegistryProvider
+from src.monitor.settings_scan import SettingsFileCache
+from src.monitor.shell_worker import ShellStatusWorker
+from src.monitor.watchdog import run_with_deadline, run_with_deadline_async
+from src.shared.config import get_config, is_validation_enabled
+
+logger = logging.getLogger(__name__)
+
+AUTH_WINDOW_SCRIPT = "Get-Process | Where-Object { $_.MainWindowTitle -match 'Sign in|Iniciar sesión|Microsoft OneDrive|Contraseña|Password' } | Select-Object -ExpandProperty MainWindowTitle"
+
+TRAY_AUTH_SCRIPT = """
+$procs = Get-Process -Name OneDrive -ErrorAction SilentlyContinue
+foreach ($proc in $procs) {
+    $title = $proc.MainWindowTitle
+    # Check for auth-related keywords in OneDrive windows
+    if ($title -and ($title -match 'Sign in|Iniciar ses|Contrase|Password|credential|credencial|vuelve a escribir')) {
+        Write-Output "AUTH_WINDOW:$title"
+    }
+}
+
+# Check for specific Microsoft account login windows (not general Microsoft apps)
+$loginProcs = Get-Process | Where-Object {
+    $_.MainWindowTitle -match 'Sign in to your account|Iniciar sesi.n en su cuenta|cuenta de Microsoft|Microsoft account'
+}
+foreach ($lp in $loginProcs) {
+    Write-Output "LOGIN_WINDOW:$($lp.MainWindowTitle)"
+}
+"""
+
+TRAY_AUTH_TIMEOUT_SECONDS = 5
+
+
+def powershell_command(script: str) -> list[str]:
+    return ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", script]
+
+
+def parse_auth_windows(result: subprocess.CompletedProcess) -> list[str]:
+    if result.returncode != 0:
+        return []
+    return [t.strip() for t in result.stdout.strip().split('\n') if t.strip()]
+
+
+def parse_tray_auth(result: subprocess.CompletedProcess) -> str:
+    return result.stdout.strip() if result.returncode == 0 else ""
+
+
+class MachineObservations:
+    """Process, registry, window and PowerShell-host observations for all accounts."""
+
+    def __init__(
+        self,
+        registry_provider: Optional[RegistryProvider] = None,
+        process_iter: Callable[..., Iterable[Any]] = psutil.process_iter,
+        get_process: Callable[[int], Any] = psutil.Process,
+        placeholder_provider: Optional[PlaceholderProvider] = None,
+        auth_window_source: Optional[Callable[[], list[str]]] = None,
+        tray_auth_source: Optional[Callable[[], str]] = None,
+    ) -> None:
+        """
+        Args:
+            registry_provider: Registry source (Windows registry by default).
+            process_iter: ``psutil.process_iter`` (injectable for tests).
+            get_process: ``psutil.Process`` (injectable for tests).
+            placeholder_provider: Canary attribute source (native provider of
+                this platform by default, unless ``placeholder_provider: shell``).
+            auth_window_source: Returns sign-in window titles (PowerShell by default).
+            tray_auth_source: Returns the tray credential-window scan output
+                (PowerShell by default).
+        """
+        self.config = get_config()
+        # email -> accounts map, rebuilt only when the Accounts key changes
+        self.account_index = AccountIndex(registry_provider or WindowsRegistryProvider())
+        # OneDrive.exe discovery pinned by PID, one locator per client kind
+        self._locators: dict[bool, OneDriveProcessLocator] = {}
+        self._process_iter = process_iter
+        self._get_process = get_process
+        # Canary placeholder state from attribute bits (None: legacy COM column)
+        if placeholder_provider is None and self.config.monitor.placeholder_provider == "native":
+            placeholder_provider = create_provider()
+        self.placeholder_provider = placeholder_provider
+        # Desktop window scans (PowerShell unless replaced, e.g. by the simulator)
+        self._auth_window_source = auth_window_source
+        self._tray_auth_source = tray_auth_source
+        # Sign-out markers of settings files, rescanned only when they change
+        self.settings_cache = SettingsFileCache()
+        # Long-lived PowerShell host for column 305 queries (started lazily)
+        self.shell_worker: Optional[ShellStatusWorker] = None
+        # Bounded pool for concurrent probes (created lazily)
+        self._probe_executor: Optional[ThreadPoolExecutor] = None
+        self.cycle: Optional[CycleContext] = None
+        self._cycle_count = 0
+        self._scans_cycle: Optional[CycleContext] = None
+        # Event loop of the asyncio driver (window scans run there as async subprocesses)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # Set on shutdown: cycles stop at the next account or probe phase
+        self.stopping = threading.Event()
+        self._lock = threading.Lock()
+
+    def begin_cycle(self) -> CycleContext:
+        """Start a new cycle: machine-wide observations are taken again once."""
+        self._cycle_count += 1
+        self.cycle = CycleContext(self._cycle_count)
+        return self.cycle
+
+    def start_scans(self) -> None:
+        """Start the PowerShell window scans of this cycle concurrently on ``loop``.
+
+        Called once the registry and process gates passed, so a cycle that
+        stops there spawns nothing; later calls in the same cycle do nothing.
+        Without an event loop, scans replaced by an injected source, and the
+        tray scan while ``tray_auth_check`` is disabled, are left to the
+        probes that read them.
+        """
+        cycle = self.cycle
+        if self.loop is None or cycle is None:
+            return
+        with self._lock:
+            if self._scans_cycle is cycle:
+                return
+            self._scans_cycle = cycle
+        if self._auth_window_source is None:
+            cycle.seed_future("auth_windows", asyncio.run_coroutine_threadsafe(self._scan_async(
+                AUTH_WINDOW_SCRIPT, self.config.monitor.probe_subprocess_timeout_seconds,
+                "auth_window_check", parse_auth_windows,
+            ), self.loop))
+        if self._tray_auth_source is None and is_validation_enabled("tray_auth_check"):
+            cycle.seed_future("tray_auth_windows", asyncio.run_coroutine_threadsafe(self._scan_async(
+                TRAY_AUTH_SCRIPT, TRAY_AUTH_TIMEOUT_SECONDS, "tray_auth_check", parse_tray_auth,
+            ), self.loop))
+
+    @staticmethod
+    async def _scan_async(script: str, timeout: float, name: str,
+                          parse: Callable[[subprocess.CompletedProcess], Any]) -> Any:
+        return parse(await run_with_deadline_async(powershell_command(script), timeout=timeout, name=name))
+
+    def locator(self, personal: bool) -> OneDriveProcessLocator:
+        """Process locator for the Personal or Business OneDrive client."""
+        with self._lock:
+            if personal not in self._locators:
+                self._locators[personal] = OneDriveProcessLocator(
+                    personal, process_iter=self._process_iter, get_process=self._get_process
+                )
+            return self._locators[personal]
+
+    @cycle_cached("onedrive_pid")
+    def find_onedrive(self, personal: bool) -> Optional[int]:
+        """PID of the OneDrive client serving Personal or Business accounts."""
+        return self.locator(personal).find()
+
+    @cycle_cached("registry_account")
+    def lookup_account(self, email: str, personal: bool) -> Optional[AccountEntry]:
+        """Registry entry for ``email`` as a Personal or Business account.
+
+        Raises:
+            OSError: If the registry cannot be read.
+        """
+        return self.account_index.lookup(email, "Personal" if personal else "Business")
+
+    @cycle_cached("auth_windows")
+    def auth_window_titles(self) -> list[str]:
+        """Titles of sign-in windows currently open on the desktop.
+
+        Raises:
+            ProbeTimeoutError: If PowerShell did not answer in time.
+        """
+        if self._auth_window_source is not None:
+            return self._auth_window_source()
+        result = run_with_deadline(
+            powershell_command(AUTH_WINDOW_SCRIPT),
+            timeout=self.config.monitor.probe_subprocess_timeout_seconds,
+            name="auth_window_check",
+        )
+        return parse_auth_windows(result)
+
+    @cycle_cached("tray_auth_windows")
+    def tray_auth_output(self) -> str:
+        """Output of the tray credential-window scan (AUTH_WINDOW:/LOGIN_WINDOW: lines).
+
+        Raises:
+            ProbeTimeoutError: If PowerShell did not answer in time.
+        """
+        if self._tray_auth_source is not None:
+            return self._tray_auth_source()
+        result = run_with_deadline(
+            powershell_command(TRAY_AUTH_SCRIPT),
+            timeout=TRAY_AUTH_TIMEOUT_SECONDS,
+            name="tray_auth_check",
+        )
+        return parse_tray_auth(result)
+
+    def get_shell_worker(self) -> ShellStatusWorker:
+        """The shared PowerShell host (one for all accounts)."""
+        with self._lock:
+            if self.shell_worker is None:
+                self.shell_worker = ShellStatusWorker(
+                    timeout=self.config.monitor.shell_worker_timeout_seconds
+                )
+            return self.shell_worker
+
+    @property
+    def probe_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._probe_executor is None:
+                self._probe_executor = ThreadPoolExecutor(
+                    max_workers=self.config.monitor.probe_workers,
+                    thread_name_prefix="probe",
+                )
+            return self._probe_executor
+
+    def close(self) -> None:
+        """Release background resources (PowerShell worker, registry watch, probe pool)."""
+        if self.shell_worker is not None:
+            self.shell_worker.close()
+        self.account_index.provider.close()
+        if self._probe_executor is not None:
+            self._probe_executor.shutdown(wait=False, cancel_futures=True)
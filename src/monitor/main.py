@@ -1,13 +1,15 @@
 """OneDrive Business Monitor - Main entry point."""
 
-import json
+import asyncio
+import io
 import logging
 import sys
-import tempfile
+import threading
 import time
 import os
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
 import contextlib
 
 # Fix module search path when running script directly
@@ -17,15 +19,27 @@ if str(project_root) not in sys.path:
 
 from src.monitor.alerter import Alerter
 from src.monitor.checker import OneDriveChecker
-from src.shared.config import get_config
+from src.monitor.collector_client import CollectorPusher
+from src.monitor.fs_watcher import FileChangeWatcher
+from src.monitor.machine import MachineObservations
+from src.monitor.metrics import get_metrics
+from src.monitor.profiler import CycleProfiler, set_profiler
+from src.monitor.recorder import ObservationRecorder, observe
+from src.monitor.scheduler import AdaptiveScheduler
+from src.monitor.watchdog import CycleWatchdog
+from src.shared.config import TargetConfig, get_config, status_path_for
 from src.shared.schemas import OneDriveStatus, StatusReport
+from src.shared.status_file import StatusPublisher
 import subprocess
 import shlex
 
 # Configure logging
 # Reemplazar el uso incorrecto de reconfigure con una solución alternativa
-sys.stdout = open(sys.stdout.fileno(), mode='w', encoding='utf-8', buffering=1)
-sys.stderr = open(sys.stderr.fileno(), mode='w', encoding='utf-8', buffering=1)
+# closefd=False: el descriptor sigue siendo de quien lo abrió (p.ej. pytest al
+# importar el módulo desde el simulador); sin descriptor real se deja como está
+with contextlib.suppress(AttributeError, OSError, ValueError, io.UnsupportedOperation):
+    sys.stdout = open(sys.stdout.fileno(), mode='w', encoding='utf-8', buffering=1, closefd=False)
+    sys.stderr = open(sys.stderr.fileno(), mode='w', encoding='utf-8', buffering=1, closefd=False)
 
 # Configure logging
 logging.basicConfig(
@@ -39,76 +53,253 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def write_status_atomic(report: StatusReport, path: Path) -> None:
-    """Write status report to file atomically.
+HEARTBEAT_INTERVAL = 300  # 5 minutes
+
+
+class AccountMonitor:
+    """Per-account state of the monitor loop: checker, remediator, status file and DB rows."""
+
+    def __init__(
+        self,
+        target: TargetConfig,
+        status_path: Path,
+        machine: MachineObservations,
+        pusher: Optional[CollectorPusher] = None,
+        recorder: Optional[ObservationRecorder] = None,
+    ) -> None:
+        from src.monitor.remediator import RemediationAction
+
+        config = get_config()
+        self.target = target
+        self.status_path = status_path
+        # status.json rewritten only when its content changes (heartbeat file for freshness)
+        self.publisher = StatusPublisher(
+            status_path,
+            fsync=config.monitor.status_fsync,
+            max_age_seconds=config.monitor.status_max_age_seconds,
+        )
+        self.checker = OneDriveChecker(target=target, machine=machine)
+        self.alerter = Alerter()
+        self.remediator = RemediationAction(account=target.email)
+        self.scheduler: Optional[AdaptiveScheduler] = None
+        # Fleet collector (shared by every account of this machine)
+        self.pusher = pusher
+        # Raw observation trace (shared by every account of this machine)
+        self.recorder = recorder
+        self.last_report: Optional[StatusReport] = None
+        self.check_count = 0
+        self.last_log_msg = ""
+        self.last_db_status: Optional[OneDriveStatus] = None
+        self.last_db_time = 0.0
+        self.out_of_sync_since_ts: Optional[datetime] = None
+
+    @property
+    def watched_files(self) -> list[Path]:
+        log_path = self.checker.log_path
+        return [self.checker.canary_path, log_path, log_path.parent / "SyncDiagnostics.log"]
+
+    def write_initial_status(self) -> None:
+        """Check once and write the first status.json of this account."""
+        status, process_running, detail = self.checker.get_full_status()
+        logger.info(f"[{self.target.email}] Estado inicial detectado: {status.value}")
+        self.last_report = StatusReport(
+            timestamp=datetime.now(),
+            account_email=self.target.email,
+            account_folder=self.target.folder,
+            status=status,
+            status_detail=detail,
+            process_running=process_running,
+            message=_get_status_message(status)
+        )
+        self.publisher.publish(self.last_report)
+
+    def run_cycle(self, watchdog: CycleWatchdog) -> None:
+        """One status check of this account: report, DB, alert, remediation."""
+        from src.shared.database import get_writer, log_remediation, log_status, get_outage_start_time
+
+        # Get current status
+        status, process_running, status_detail = self.checker.get_full_status()
+        if self.checker.machine.stopping.is_set():
+            # Shutting down: the DB writer and status outputs may already be closed
+            logger.info(f"[{self.target.email}] Ciclo interrumpido por cierre; resultado descartado.")
+            return
+        sync_snapshot = self.checker.get_sync_snapshot()
+
+        # Track Out-of-Sync Start Time
+        if status == OneDriveStatus.OK:
+            self.out_of_sync_since_ts = None
+        else:
+             if self.out_of_sync_since_ts is None:
+                 # Try to recover start time from DB history
+                 db_start = get_outage_start_time(self.target.email)
+                 if db_start:
+                     self.out_of_sync_since_ts = db_start
+                 else:
+                     self.out_of_sync_since_ts = datetime.now()
+
+        # Build report
+        report = StatusReport(
+            timestamp=datetime.now(),
+            account_email=self.target.email,
+            account_folder=self.target.folder,
+            status=status,
+            status_detail=status_detail,
+            process_running=process_running,
+            message=_get_status_message(status),
+            out_of_sync_since=self.out_of_sync_since_ts,
+            sync_diagnostics=sync_snapshot,
+            cycle_overrun_seconds=_round_or_none(watchdog.current_overrun()),
+            stale_probes=self.checker.stale_probes,
+            probe_metrics=get_metrics().snapshot(),
+            db_writer=writer.snapshot() if (writer := get_writer()) is not None else None,
+        )
+
+        # Log status (deduplicated)
+        status_emoji = _get_status_emoji(status)
+        current_log_msg = f"{status_emoji} Status: {status.value} | Detail: {status_detail}"
+
+        if current_log_msg != self.last_log_msg or self.check_count % 20 == 0:
+            logger.info(f"[{self.target.email}] {current_log_msg}")
+            self.last_log_msg = current_log_msg
+
+        self.check_count += 1
+
+        # --- Database Logging ---
+        current_time = time.time()
+        is_change = (status != self.last_db_status)
+
+        if is_change or (current_time - self.last_db_time > HEARTBEAT_INTERVAL):
+            # Ensure we capture detail if present, or just status value
+            db_msg = status_detail or status.value
+            log_status(status.value, db_msg, is_change, account=self.target.email)
+            self.last_db_time = current_time
+            self.last_db_status = status
+            if is_change:
+                 logger.debug("DB: Status change stored.")
+            else:
+                 logger.debug("DB: Heartbeat stored.")
+        # ------------------------
 
-    Uses write-to-temp-then-rename to avoid partial reads.
+        # Write to file (heartbeat only if nothing but the timestamp changed)
+        self.publisher.publish(report)
+        self.last_report = report
+        if self.pusher is not None:
+            self.pusher.push(report)
+        if self.recorder is not None:
+            self.recorder.record(observe(self.checker, status, status_detail, sync_snapshot))
 
-    Args:
-        report: The status report to write.
-        path: The target file path.
-    """
-    # Write to temp file first
-    temp_fd, temp_path = tempfile.mkstemp(suffix=".json", dir=path.parent)
-    try:
-        with open(temp_fd, "w", encoding="utf-8") as f:
-            json.dump(report.model_dump(mode="json"), f, indent=2, default=str)
+        # Send alert if needed
+        self.alerter.send_alert(report)
 
-        # Atomic rename (works on same filesystem)
-        Path(temp_path).replace(path)
-        logger.debug(f"Status written to {path}")
-    except Exception as e:
-        # Clean up temp file on error
-        with contextlib.suppress(FileNotFoundError):
-            Path(temp_path).unlink()
-        raise e
+        # --- Remediation (Auto-Healing) ---
+        if self.remediator.act(status, outage_start_time=self.out_of_sync_since_ts, sync_snapshot=sync_snapshot):
+            log_remediation(self.target.email)
+        # ----------------------------------
 
+        if self.scheduler is not None:
+            self.scheduler.observe(status)
 
-def run_monitor(shutdown_event=None) -> None:
-    """Run the OneDrive monitor loop. Si shutdown_event se pasa, permite cierre limpio."""
-    config = get_config()
-    checker = OneDriveChecker()
-    alerter = Alerter()
-    from src.monitor.remediator import RemediationAction
-    remediator = RemediationAction()
-
-    status_path = Path(config.monitor.status_file)
-    interval = config.monitor.check_interval_seconds
-
-    logger.info("=" * 60)
-    logger.info("Monitor OneDrive Empresarial Iniciando")
-    logger.info(f"Cuenta Objetivo: {config.target.email}")
-    logger.info(f"Carpeta Objetivo: {config.target.folder}")
-    logger.info(f"Intervalo de Verificación: {interval}s")
-    logger.info(f"Archivo de Estado: {status_path.absolute()}")
-    logger.info(f"Alertas Habilitadas: {config.alerting.enabled}")
-    # Mostrar el estado de cada validación
-    from src.shared.config import is_validation_enabled
-    logger.info("Validaciones activas:")
-    for v in [
-        "registry_check",
-        "process_check",
-        "log_check",
-        "canary_check",
-        "liveness_check",
-        "status_assignment",
-        "tray_auth_check"
-    ]:
-        logger.info(f"  {v}: {'Enabled' if is_validation_enabled(v) else 'Disabled'}")
-    logger.info("=" * 60)
-
-    # Verificar que la cuenta existe en el registro
-    if checker.verify_registry_account():
-        logger.info("Cuenta verificada en el Registro de Windows")
-    else:
-        logger.warning("Cuenta no encontrada en el registro - puede no estar configurada")
-
-    # Inicializar BD
-    from src.shared.database import init_db, log_status, get_outage_start_time
-    init_db()
-    
-    # Reiniciar OneDrive si está habilitado en configuración para evitar estados fantasma
-    if config.monitor.restart_on_startup:
+    def flag_overrun(self, elapsed: float) -> None:
+        """Mark the last written status.json as belonging to an overrunning cycle."""
+        if self.last_report is not None:
+            report = self.last_report.model_copy(update={"cycle_overrun_seconds": round(elapsed, 1)})
+            self.publisher.publish(report)
+
+    def close(self) -> None:
+        self.checker.close()
+
+
+# Seconds an in-flight cycle (or the teardown) may still take once shutdown
+# is requested; after that the asyncio loop stops waiting for it
+SHUTDOWN_GRACE_SECONDS = 0.5
+
+
+class MonitorLoop:
+    """Accounts and machine-wide resources of the monitor loop.
+
+    Shared by the threaded driver (``run_monitor``) and the asyncio one
+    (``run_monitor_async``); each cycle itself is synchronous.
+    """
+
+    def __init__(self) -> None:
+        config = get_config()
+        self.config = config
+        # Process table, registry, desktop windows and the PowerShell host are
+        # observed once per cycle and shared by every account
+        self.machine = MachineObservations()
+        # Optional push of every report to the fleet collector
+        self.pusher = CollectorPusher.from_config(config.collector)
+        # Optional trace of raw probe observations (see src.simulator.replay)
+        self.recorder = None
+        if config.monitor.record_observations:
+            self.recorder = ObservationRecorder(Path(config.monitor.record_observations))
+        default_status_path = Path(config.monitor.status_file)
+        self.monitors = [
+            AccountMonitor(target, status_path_for(target, i, default_status_path), self.machine, self.pusher, self.recorder)
+            for i, target in enumerate(config.targets)
+        ]
+        self.interval = config.monitor.check_interval_seconds
+        self.watchdog: Optional[CycleWatchdog] = None
+        self.watcher: Optional[FileChangeWatcher] = None
+        self.profiler: Optional[CycleProfiler] = None
+        self.cycle_number = 0
+
+        logger.info("=" * 60)
+        logger.info("Monitor OneDrive Empresarial Iniciando")
+        for account in self.monitors:
+            logger.info(f"Cuenta Objetivo: {account.target.email}")
+            logger.info(f"Carpeta Objetivo: {account.target.folder}")
+            logger.info(f"Archivo de Estado: {account.status_path.absolute()}")
+        logger.info(f"Intervalo de Verificación: {self.interval}s")
+        logger.info(f"Alertas Habilitadas: {config.alerting.enabled}")
+        if self.pusher is not None:
+            logger.info(f"Colector de flota: {config.collector.url} (equipo: {self.pusher.host_name})")
+        if self.recorder is not None:
+            logger.info(f"Grabando observaciones en: {self.recorder.path.absolute()}")
+        # Mostrar el estado de cada validación
+        from src.shared.config import is_validation_enabled
+        logger.info("Validaciones activas:")
+        for v in [
+            "registry_check",
+            "process_check",
+            "log_check",
+            "canary_check",
+            "liveness_check",
+            "status_assignment",
+            "tray_auth_check"
+        ]:
+            logger.info(f"  {v}: {'Enabled' if is_validation_enabled(v) else 'Disabled'}")
+        logger.info("=" * 60)
+
+        # Verificar que las cuentas existen en el registro
+        self.machine.begin_cycle()
+        for account in self.monitors:
+            if account.checker.verify_registry_account():
+                logger.info(f"Cuenta {account.target.email} verificada en el Registro de Windows")
+            else:
+                logger.warning(f"Cuenta {account.target.email} no encontrada en el registro - puede no estar configurada")
+
+        # Inicializar BD
+        from src.shared.database import init_db, start_writer
+        init_db(default_account=config.targets[0].email)
+        # Status rows are committed in batches by a background writer
+        start_writer(
+            batch_size=config.database.batch_size,
+            flush_interval=config.database.flush_interval_seconds,
+            max_queue=config.database.queue_size,
+            on_commit=lambda seconds, failed: get_metrics().observe("db_commit", seconds, error=failed),
+        )
+
+    def restart_onedrive_on_startup(self) -> float:
+        """Restart OneDrive.exe if ``restart_on_startup`` is set.
+
+        Returns:
+            Seconds to wait for OneDrive to initialize (0 if not restarted).
+        """
+        config = self.config
+        # Reiniciar OneDrive si está habilitado en configuración para evitar estados fantasma
+        if not config.monitor.restart_on_startup:
+            return 0
         logger.info("Restart on startup enabled: restarting OneDrive.exe to avoid ghost states...")
         kill_onedrive_processes()
 
@@ -141,113 +332,268 @@ def run_monitor(shutdown_event=None) -> None:
         # Wait configurable seconds for OneDrive to spin up
         wait_secs = config.monitor.restart_wait_seconds if hasattr(config.monitor, 'restart_wait_seconds') else 10
         logger.info(f"Waiting {wait_secs}s for OneDrive to initialize...")
-        time.sleep(wait_secs)
-
-    # Obtener estado inicial REAL antes de inicializar
-    logger.info("Obteniendo estado inicial...")
-    initial_status, initial_process_running, initial_detail = checker.get_full_status()
-    
-    # Escribir Estado Inicial
-    logger.info(f"Estado inicial detectado: {initial_status.value}")
-    initial_report = StatusReport(
-        timestamp=datetime.now(),
-        account_email=config.target.email,
-        account_folder=config.target.folder,
-        status=initial_status,
-        status_detail=initial_detail,
-        process_running=initial_process_running,
-        message=_get_status_message(initial_status)
-    )
-    write_status_atomic(initial_report, status_path)
-    
-    # NOTA: La notificación de inicio se envía después de que el estado persista
-    # Esto lo maneja el Remediator con is_first_run=True
-    logger.info("Esperando persistencia del estado inicial para enviar notificación...")
-    
-    check_count = 0
-    last_log_msg = ""
-    
-    last_db_status = None
-    last_db_time = 0.0
-    HEARTBEAT_INTERVAL = 300 # 5 minutes
-    
-
-    out_of_sync_since_ts = None
-
-    while True:
-        # Si se pasa shutdown_event y está seteado, salir del bucle
-        if shutdown_event is not None and shutdown_event.is_set():
-            logger.info("Monitor: Señal de cierre recibida, saliendo del bucle principal.")
-            break
-        try:
-            # Get current status
-            status, process_running, status_detail = checker.get_full_status()
-            
-            # Track Out-of-Sync Start Time
-            if status == OneDriveStatus.OK:
-                out_of_sync_since_ts = None
-            else:
-                 if out_of_sync_since_ts is None:
-                     # Try to recover start time from DB history
-                     db_start = get_outage_start_time()
-                     if db_start:
-                         out_of_sync_since_ts = db_start
-                     else:
-                         out_of_sync_since_ts = datetime.now()
-
-            # Build report
-            report = StatusReport(
-                timestamp=datetime.now(),
-                account_email=config.target.email,
-                account_folder=config.target.folder,
-                status=status,
-                status_detail=status_detail,
-                process_running=process_running,
-                message=_get_status_message(status),
-                out_of_sync_since=out_of_sync_since_ts
+        return wait_secs
+
+    def start(self) -> None:
+        """Write the initial status and start the watchdog, file watcher and profiler."""
+        config = self.config
+        # Obtener estado inicial REAL antes de inicializar
+        logger.info("Obteniendo estado inicial...")
+        self.machine.begin_cycle()
+        for account in self.monitors:
+            account.write_initial_status()
+
+        # NOTA: La notificación de inicio se envía después de que el estado persista
+        # Esto lo maneja el Remediator con is_first_run=True
+        logger.info("Esperando persistencia del estado inicial para enviar notificación...")
+
+        # Adaptive polling: slow down while stable, speed up on incidents
+        if config.monitor.adaptive_polling_enabled:
+            for account in self.monitors:
+                account.scheduler = AdaptiveScheduler.from_config(
+                    config.monitor.poll_bounds,
+                    persistence=account.remediator.PERSISTENCE_BY_STATUS,
+                    default_persistence=account.remediator.DEFAULT_PERSISTENCE,
+                    jitter=config.monitor.poll_jitter,
+                )
+            logger.info("Sondeo adaptativo activo (intervalo según estado).")
+
+        # Watchdog: flag a hung cycle in status.json while it is still stuck
+        def _flag_overrun(elapsed: float) -> None:
+            for account in self.monitors:
+                account.flag_overrun(elapsed)
+
+        self.watchdog = CycleWatchdog(config.monitor.cycle_budget_seconds, _flag_overrun)
+        self.watchdog.start()
+
+        # Event-driven mode: wake up as soon as any canary or OneDrive log changes
+        if config.monitor.event_driven_enabled:
+            watcher = FileChangeWatcher(
+                [path for account in self.monitors for path in account.watched_files],
+                debounce_seconds=config.monitor.event_debounce_seconds,
             )
+            if watcher.start():
+                logger.info(f"Modo por eventos activo: observando {', '.join(str(d) for d in watcher.targets)}")
+                self.watcher = watcher
+            else:
+                logger.warning("Modo por eventos no disponible; usando solo sondeo periódico.")
+
+        # On-demand profiling of the next cycles (config or dashboard request file)
+        self.profiler = CycleProfiler(
+            Path(config.monitor.profile_dir),
+            Path(config.monitor.profile_request_file),
+            mode=config.monitor.profile_mode,
+        )
+        self.profiler.request(config.monitor.profile_cycles)
+        set_profiler(self.profiler)
+
+    def run_cycle(self) -> None:
+        """Check every account once (stopping early once ``request_stop`` was called)."""
+        self.cycle_number += 1
+        self.profiler.poll_request()
+        with self.profiler.cycle(self.cycle_number):
+            self.watchdog.begin_cycle()
+            self.machine.begin_cycle()
+            for account in self.monitors:
+                if self.machine.stopping.is_set():
+                    break
+                try:
+                    account.run_cycle(self.watchdog)
+                except Exception as e:
+                    logger.error(f"Error during status check of {account.target.email}: {e}", exc_info=True)
+
+        overrun = self.watchdog.end_cycle()
+        if overrun is not None:
+            logger.warning(f"Ciclo de monitoreo tardó {overrun:.1f}s (presupuesto {self.watchdog.budget_seconds:.0f}s)")
+        if self.machine.cycle is not None and len(self.monitors) > 1:
+            logger.debug(f"Observaciones compartidas entre cuentas: {self.machine.cycle.summary()}")
+
+    def next_wait(self) -> float:
+        """Seconds until the next check; with several accounts the most urgent schedule wins."""
+        wait_seconds = min(
+            (account.scheduler.next_interval() for account in self.monitors if account.scheduler is not None),
+            default=self.interval,
+        )
+        logger.debug(f"Próxima verificación en {wait_seconds:.1f}s")
+        return wait_seconds
+
+    def log_wakeup(self) -> None:
+        logger.debug(f"Cambio detectado ({', '.join(self.watcher.last_changes) or 'desconocido'}). Re-verificando.")
+
+    def request_stop(self) -> None:
+        """Make a cycle in progress (possibly abandoned by the asyncio loop) stop
+        at its next account or probe phase, without writing its results."""
+        self.machine.stopping.set()
+
+    def close(self) -> None:
+        from src.shared.database import close_pools, stop_writer
+        self.request_stop()
+        # First: pending status rows must be committed before the process exits
+        stop_writer()
+        close_pools()
+        if self.watcher is not None:
+            self.watcher.close()
+        if self.watchdog is not None:
+            self.watchdog.close()
+        set_profiler(None)
+        for account in self.monitors:
+            account.close()
+        self.machine.close()
+        if self.pusher is not None:
+            self.pusher.close()
+        if self.recorder is not None:
+            self.recorder.close()
 
-            # Log status (deduplicated)
-            status_emoji = _get_status_emoji(status)
-            current_log_msg = f"{status_emoji} Status: {status.value} | Detail: {status_detail}"
-            
-            if current_log_msg != last_log_msg or check_count % 20 == 0:
-                logger.info(current_log_msg)
-                last_log_msg = current_log_msg
-            
-            check_count += 1
-
-            # --- Database Logging ---
-            current_time = time.time()
-            is_change = (status != last_db_status)
-            
-            if is_change or (current_time - last_db_time > HEARTBEAT_INTERVAL):
-                # Ensure we capture detail if present, or just status value
-                db_msg = status_detail or status.value
-                log_status(status.value, db_msg, is_change)
-                last_db_time = current_time
-                last_db_status = status
-                if is_change:
-                     logger.debug("DB: Status change stored.")
-                else:
-                     logger.debug("DB: Heartbeat stored.")
-            # ------------------------
-
-            # Write to file
-            write_status_atomic(report, status_path)
-
-            # Send alert if needed
-            alerter.send_alert(report)
-
-            # --- Remediation (Auto-Healing) ---
-            remediator.act(status, outage_start_time=out_of_sync_since_ts)
-            # ----------------------------------
-
-        except Exception as e:
-            logger.error(f"Error during status check: {e}", exc_info=True)
-
-        # Wait for next check
-        time.sleep(interval)
+
+def run_monitor(shutdown_event=None) -> None:
+    """Run the OneDrive monitor loop. Si shutdown_event se pasa, permite cierre limpio."""
+    monitor = MonitorLoop()
+    try:
+        wait_secs = monitor.restart_onedrive_on_startup()
+        if wait_secs:
+            time.sleep(wait_secs)
+        monitor.start()
+
+        while True:
+            # Si se pasa shutdown_event y está seteado, salir del bucle
+            if shutdown_event is not None and shutdown_event.is_set():
+                logger.info("Monitor: Señal de cierre recibida, saliendo del bucle principal.")
+                break
+            monitor.run_cycle()
+
+            # Wait for next check (or an earlier file change in event-driven mode)
+            wait_seconds = monitor.next_wait()
+            if monitor.watcher is not None:
+                if monitor.watcher.wait(wait_seconds):
+                    monitor.log_wakeup()
+            else:
+                time.sleep(wait_seconds)
+    finally:
+        monitor.close()
+
+
+def _in_daemon_thread(fn: Callable[..., Any], *args: Any) -> asyncio.Future:
+    """Run blocking ``fn`` in a daemon thread and return an awaitable for its result.
+
+    Unlike ``asyncio.to_thread`` the thread is never joined by the event
+    loop or the interpreter on exit, so a cycle wedged in a COM call cannot
+    hold up shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(result: Any, error: Optional[BaseException]) -> None:
+        if future.done():
+            return  # Abandoned by shutdown
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run() -> None:
+        result, error = None, None
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            error = e
+        with contextlib.suppress(RuntimeError):  # Event loop already closed
+            loop.call_soon_threadsafe(resolve, result, error)
+
+    threading.Thread(target=run, name="monitor-cycle", daemon=True).start()
+    return future
+
+
+async def _until_shutdown(
+    awaitable: Awaitable,
+    shutdown_event: asyncio.Event,
+    grace: float = 0.0,
+    on_shutdown: Optional[Callable[[], None]] = None,
+) -> bool:
+    """Await ``awaitable`` unless shutdown is requested first.
+
+    Args:
+        awaitable: Coroutine or future; cancelled if shutdown wins.
+        shutdown_event: Set to stop the monitor.
+        grace: Seconds it may still take after shutdown is requested.
+        on_shutdown: Called as soon as shutdown is requested while
+            ``awaitable`` is still running (before the grace period).
+
+    Returns:
+        True if it completed (its exception, if any, is raised), False if
+        it was abandoned because of shutdown.
+    """
+    task = asyncio.ensure_future(awaitable)
+    stop = asyncio.ensure_future(shutdown_event.wait())
+    try:
+        done, _ = await asyncio.wait({task, stop}, return_when=asyncio.FIRST_COMPLETED)
+        if task not in done and on_shutdown is not None:
+            on_shutdown()
+        if task not in done and grace > 0:
+            done, _ = await asyncio.wait({task}, timeout=grace)
+        if task in done:
+            task.result()
+            return True
+        task.cancel()
+        # Let a cancelled coroutine clean up (e.g. kill its PowerShell process)
+        await asyncio.wait({task}, timeout=SHUTDOWN_GRACE_SECONDS)
+        return False
+    finally:
+        stop.cancel()
+
+
+async def run_monitor_async(shutdown_event: Optional[asyncio.Event] = None) -> None:
+    """Run the OneDrive monitor loop as an asyncio task.
+
+    Waits between cycles are cancellable and end as soon as
+    ``shutdown_event`` is set; the machine-wide PowerShell scans run on this
+    loop as concurrent asyncio subprocesses; the rest of each cycle runs in a
+    daemon thread. On shutdown that cycle is told to stop at its next account
+    or probe phase without writing results, and is abandoned if it does not
+    finish within ``SHUTDOWN_GRACE_SECONDS``.
+
+    Args:
+        shutdown_event: Set to stop the monitor (never set if None).
+    """
+    if shutdown_event is None:
+        shutdown_event = asyncio.Event()
+    monitor_future = _in_daemon_thread(MonitorLoop)
+    if not await _until_shutdown(monitor_future, shutdown_event):
+        return
+    monitor: MonitorLoop = monitor_future.result()
+    try:
+        wait_secs = await _in_daemon_thread(monitor.restart_onedrive_on_startup)
+        if wait_secs and not await _until_shutdown(asyncio.sleep(wait_secs), shutdown_event):
+            return
+        if not await _until_shutdown(_in_daemon_thread(monitor.start), shutdown_event):
+            return
+
+        monitor.machine.loop = asyncio.get_running_loop()
+        while not shutdown_event.is_set():
+            cycle = _in_daemon_thread(monitor.run_cycle)
+            if not await _until_shutdown(cycle, shutdown_event, SHUTDOWN_GRACE_SECONDS, monitor.request_stop):
+                logger.warning("Monitor: ciclo en curso abandonado por cierre.")
+                break
+
+            # Wait for next check (or an earlier file change in event-driven mode)
+            wait_seconds = monitor.next_wait()
+            if monitor.watcher is not None:
+                woke = asyncio.ensure_future(monitor.watcher.wait_async(wait_seconds))
+                if await _until_shutdown(woke, shutdown_event) and woke.result():
+                    monitor.log_wakeup()
+            else:
+                await _until_shutdown(asyncio.sleep(wait_seconds), shutdown_event)
+        logger.info("Monitor: Señal de cierre recibida, saliendo del bucle principal.")
+    finally:
+        closing = _in_daemon_thread(monitor.close)
+        done, _ = await asyncio.wait({closing}, timeout=SHUTDOWN_GRACE_SECONDS)
+        if closing not in done:
+            logger.warning("Monitor: cierre de recursos en segundo plano (no bloquea la salida).")
+        elif closing.exception() is not None:
+            logger.error(f"Error al cerrar el monitor: {closing.exception()}")
+
+
+def _round_or_none(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
 
 
 def _get_status_message(status: OneDriveStatus) -> str:
@@ -0,0 +1,163 @@
+"""In-memory latency, error, timeout and spawn metrics per validation.
+
+Every validation of ``OneDriveChecker`` is wrapped with ``@instrumented``:
+each real execution (cache hits are not counted) lands in a fixed-bucket
+latency histogram together with its errors and timeouts; validations that
+catch their own failures and fall back to a default answer report them with
+``record_error``. External processes
+started by ``run_with_deadline`` and the Shell worker are counted as spawns
+under the probe that started them. The snapshot is written to status.json
+and served by the dashboard (``/api/metrics``), so a slower PowerShell or
+OneDrive build shows up as a shifted histogram instead of a hunch.
+"""
+
+import functools
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from src.shared.schemas import ProbeMetricsSnapshot
+
+# Upper bounds of the latency buckets in milliseconds (last bucket: +Inf)
+BUCKET_BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of latencies in milliseconds."""
+
+    def __init__(self, bounds: tuple[float, ...] = BUCKET_BOUNDS_MS) -> None:
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        for i, bound in enumerate(self.bounds):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding quantile ``q`` (max for +Inf)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return float(self.bounds[i]) if i < len(self.bounds) else self.max_ms
+        return self.max_ms
+
+    def labels(self) -> list[str]:
+        return [f"<={b}ms" for b in self.bounds] + [f">{self.bounds[-1]}ms"]
+
+
+class ProbeStats:
+    """Counters of one validation."""
+
+    def __init__(self) -> None:
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.timeouts = 0
+        self.spawns = 0
+
+
+class MetricsRegistry:
+    """Thread-safe collection of ``ProbeStats`` by validation name."""
+
+    def __init__(self) -> None:
+        self._stats: dict[str, ProbeStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, name: str) -> ProbeStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = ProbeStats()
+        return stats
+
+    def observe(self, name: str, seconds: float, error: bool = False, timeout: bool = False) -> None:
+        """Record one execution of validation ``name``."""
+        with self._lock:
+            stats = self._get(name)
+            stats.latency.observe(seconds * 1000)
+            stats.errors += error
+            stats.timeouts += timeout
+
+    def record_error(self, name: str) -> None:
+        """A validation failed but handled it (it returned a fallback answer)."""
+        with self._lock:
+            self._get(name).errors += 1
+
+    def record_timeout(self, name: str) -> None:
+        """A validation missed its cycle deadline (it may still finish later)."""
+        with self._lock:
+            self._get(name).timeouts += 1
+
+    def record_spawn(self, name: str) -> None:
+        """An external process was started on behalf of validation ``name``."""
+        with self._lock:
+            self._get(name).spawns += 1
+
+    def snapshot(self) -> dict[str, ProbeMetricsSnapshot]:
+        """Copy of every counter, ready for status.json."""
+        with self._lock:
+            return {
+                name: ProbeMetricsSnapshot(
+                    count=s.latency.count,
+                    errors=s.errors,
+                    timeouts=s.timeouts,
+                    spawns=s.spawns,
+                    mean_ms=round(s.latency.total_ms / s.latency.count, 2) if s.latency.count else None,
+                    p50_ms=s.latency.quantile(0.5),
+                    p95_ms=s.latency.quantile(0.95),
+                    max_ms=round(s.latency.max_ms, 2),
+                    buckets=dict(zip(s.latency.labels(), s.latency.buckets)),
+                )
+                for name, s in sorted(self._stats.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Process-wide metrics registry (shared by every account's checker)."""
+    return _registry
+
+
+def instrumented(name: str) -> Callable:
+    """Time every call of the decorated validation under ``name``.
+
+    Place it below ``@cycle_cached`` so cached answers are not counted.
+    A ``TimeoutError`` (e.g. ``ProbeTimeoutError``) counts as a timeout,
+    any other exception as an error; both are re-raised. Failures the
+    validation swallows itself must be reported with ``record_error``.
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            error = timeout = False
+            try:
+                return method(*args, **kwargs)
+            except TimeoutError:
+                timeout = True
+                raise
+            except Exception:
+                error = True
+                raise
+            finally:
+                _registry.observe(name, time.perf_counter() - start, error, timeout)
+        return wrapper
+    return decorator
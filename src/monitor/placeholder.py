@@ -0,0 +1,158 @@
+"""Cloud Files placeholder state from file attribute bits.
+
+OneDrive turns a synced file into a Cloud Files placeholder: a reparse point
+whose attribute bits say whether it is pinned, hydrated or online-only. The
+liveness check used to ask Shell.Application for the localized "Availability
+status" column (PowerShell + COM, hundreds of ms, Spanish/English keyword
+lists). The same answer is in ``st_file_attributes``: one ``stat`` call, no
+COM, no subprocess, no language.
+
+Providers:
+    StatAttributesProvider : Windows, ``os.stat(...).st_file_attributes``.
+    XattrAttributesProvider: Linux/tests, bits stored in a ``user.`` xattr
+                             so the same decoding can be exercised anywhere.
+"""
+
+import errno
+import logging
+import os
+import stat
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Standard attribute bits (also in the ``stat`` module on Windows)
+FILE_ATTRIBUTE_OFFLINE = 0x1000
+FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+# Cloud Files bits (see test_attrib_monitor.py)
+FILE_ATTRIBUTE_RECALL_ON_OPEN = 0x40000
+FILE_ATTRIBUTE_PINNED = 0x80000
+FILE_ATTRIBUTE_UNPINNED = 0x100000
+FILE_ATTRIBUTE_RECALL_ON_DATA_ACCESS = 0x400000
+
+# Extended attribute used by the Linux backend to emulate the bits
+XATTR_NAME = "user.onedrive_monitor.attributes"
+
+
+class PlaceholderState(str, Enum):
+    """Language-independent sync state of a file in the OneDrive folder."""
+
+    NOT_PLACEHOLDER = "NOT_PLACEHOLDER"  # Plain local file: OneDrive has not taken it yet
+    IN_SYNC = "IN_SYNC"  # Placeholder with local data ("Disponible en este dispositivo")
+    PINNED = "PINNED"  # Always kept on this device ("Siempre disponible")
+    CLOUD_ONLY = "CLOUD_ONLY"  # Dehydrated, data only online ("Disponible en línea")
+    MISSING = "MISSING"  # File does not exist
+    UNKNOWN = "UNKNOWN"  # Attributes could not be read
+
+    @property
+    def is_placeholder(self) -> bool:
+        """True once OneDrive has processed the file (any placeholder state)."""
+        return self in (PlaceholderState.IN_SYNC, PlaceholderState.PINNED, PlaceholderState.CLOUD_ONLY)
+
+
+def decode_attributes(attrs: int) -> PlaceholderState:
+    """Map Windows file attribute bits to a placeholder state."""
+    if attrs & (FILE_ATTRIBUTE_RECALL_ON_DATA_ACCESS | FILE_ATTRIBUTE_RECALL_ON_OPEN | FILE_ATTRIBUTE_OFFLINE):
+        return PlaceholderState.CLOUD_ONLY
+    if not attrs & FILE_ATTRIBUTE_REPARSE_POINT:
+        return PlaceholderState.NOT_PLACEHOLDER
+    if attrs & FILE_ATTRIBUTE_PINNED:
+        return PlaceholderState.PINNED
+    return PlaceholderState.IN_SYNC
+
+
+def describe_attributes(attrs: int) -> str:
+    """Human-readable attribute bits, e.g. ``0x80420 (REPARSE_POINT, PINNED)``."""
+    names = [
+        name for name, bit in (
+            ("OFFLINE", FILE_ATTRIBUTE_OFFLINE),
+            ("REPARSE_POINT", FILE_ATTRIBUTE_REPARSE_POINT),
+            ("RECALL_ON_OPEN", FILE_ATTRIBUTE_RECALL_ON_OPEN),
+            ("PINNED", FILE_ATTRIBUTE_PINNED),
+            ("UNPINNED", FILE_ATTRIBUTE_UNPINNED),
+            ("RECALL_ON_DATA_ACCESS", FILE_ATTRIBUTE_RECALL_ON_DATA_ACCESS),
+        ) if attrs & bit
+    ]
+    return f"0x{attrs:X} ({', '.join(names)})"
+
+
+class PlaceholderProvider:
+    """Reads the attribute bits of a file; ``state`` decodes them."""
+
+    name = "base"
+
+    def attributes(self, path: Path) -> int:
+        """Attribute bits of ``path``.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            OSError: If the attributes cannot be read.
+        """
+        raise NotImplementedError
+
+    def state(self, path: Path) -> PlaceholderState:
+        """Placeholder state of ``path`` (never raises)."""
+        try:
+            return decode_attributes(self.attributes(path))
+        except FileNotFoundError:
+            return PlaceholderState.MISSING
+        except OSError as e:
+            logger.debug(f"No se pudieron leer los atributos de {path}: {e}")
+            return PlaceholderState.UNKNOWN
+
+
+class StatAttributesProvider(PlaceholderProvider):
+    """Windows: ``st_file_attributes`` from a single stat call."""
+
+    name = "stat"
+
+    def attributes(self, path: Path) -> int:
+        # follow_symlinks=False: report the placeholder itself, never recall it
+        return os.stat(path, follow_symlinks=False).st_file_attributes
+
+
+class XattrAttributesProvider(PlaceholderProvider):
+    """Linux: attribute bits emulated with an extended attribute.
+
+    A file without the xattr is a plain local file (``NOT_PLACEHOLDER``).
+    """
+
+    name = "xattr"
+
+    def attributes(self, path: Path) -> int:
+        try:
+            return int(os.getxattr(path, XATTR_NAME).decode("ascii"), 0)
+        except OSError as e:
+            if not os.path.exists(path):
+                raise FileNotFoundError(str(path)) from e
+            if getattr(e, "errno", None) in _NO_XATTR_ERRNOS:
+                return 0
+            raise
+
+    @staticmethod
+    def set_attributes(path: Path, attrs: int) -> None:
+        """Emulate what OneDrive would do to ``path`` (tests and simulations)."""
+        os.setxattr(path, XATTR_NAME, hex(attrs).encode("ascii"))
+
+    @staticmethod
+    def clear_attributes(path: Path) -> None:
+        """Back to a plain local file (as after the monitor rewrites the canary)."""
+        try:
+            os.removexattr(path, XATTR_NAME)
+        except OSError:
+            pass
+
+
+# Attribute not set: ENODATA on Linux, ENOATTR on macOS
+_NO_XATTR_ERRNOS = {getattr(errno, "ENODATA", 61), getattr(errno, "ENOATTR", 93)}
+
+
+def create_provider() -> Optional[PlaceholderProvider]:
+    """Native provider for this platform, or None if attribute bits are unavailable."""
+    if os.name == "nt" and hasattr(stat, "FILE_ATTRIBUTE_REPARSE_POINT"):
+        return StatAttributesProvider()
+    if hasattr(os, "getxattr"):
+        return XattrAttributesProvider()
+    return None
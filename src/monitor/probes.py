@@ -0,0 +1,130 @@
+"""Concurrent probe execution and status resolution for OneDriveChecker.
+
+Each validation of a monitor cycle (registry, process, tray auth, liveness,
+auth window) is a *probe*. ``run_probes`` runs independent probes on a bounded
+thread pool, each with its own deadline, so a cycle costs roughly as much as
+its slowest probe instead of the sum of all of them. ``resolve_status``
+combines the results with the precedence rules of ``get_full_status``.
+"""
+
+import logging
+import time
+from concurrent.futures import Executor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, NamedTuple, Optional
+
+from src.shared.schemas import OneDriveStatus
+
+logger = logging.getLogger(__name__)
+
+# Default per-probe deadlines in seconds (overridable via monitor.probe_deadlines)
+DEFAULT_PROBE_DEADLINES = {
+    "registry_check": 5.0,
+    "process_check": 5.0,
+    "tray_auth_check": 15.0,
+    "liveness_check": 20.0,
+    "auth_window_check": 15.0,
+}
+
+
+class ProbeResult(NamedTuple):
+    """Outcome of one probe in a cycle."""
+
+    name: str
+    value: Any
+    elapsed: float  # seconds (deadline if timed out)
+    timed_out: bool = False
+    error: Optional[str] = None
+    stale: bool = False  # value is the last good result of an earlier cycle
+
+
+def run_probes(
+    executor: Executor,
+    probes: dict[str, Callable[[], Any]],
+    deadlines: dict[str, float],
+    defaults: dict[str, Any],
+    last_good: Optional[dict[str, Any]] = None,
+) -> dict[str, ProbeResult]:
+    """Run probes concurrently and collect their results.
+
+    Args:
+        executor: Pool the probes are submitted to.
+        probes: name -> zero-argument callable.
+        deadlines: name -> seconds allowed, measured from submission.
+        defaults: name -> value used if the probe times out or raises.
+        last_good: name -> last successful value. Updated in place; when a
+            probe times out or raises, its last good value is preferred over
+            the default and the result is marked stale.
+
+    Returns:
+        name -> ProbeResult, in the order of ``probes``.
+    """
+    submitted_at = time.monotonic()
+    futures = {name: executor.submit(_timed, fn) for name, fn in probes.items()}
+
+    results: dict[str, ProbeResult] = {}
+    for name, future in futures.items():
+        deadline = deadlines.get(name, DEFAULT_PROBE_DEADLINES.get(name, 30.0))
+        remaining = max(0.0, submitted_at + deadline - time.monotonic())
+        try:
+            value, elapsed = future.result(timeout=remaining)
+            results[name] = ProbeResult(name, value, elapsed)
+            if last_good is not None:
+                last_good[name] = value
+            continue
+        except (FutureTimeoutError, TimeoutError) as e:
+            # Deadline of the pool, or an external probe killed by its own deadline
+            timed_out, error = True, str(e) or None
+            elapsed = min(deadline, time.monotonic() - submitted_at)
+            logger.warning(f"Validación {name} excedió su plazo de {deadline:.0f}s.")
+        except Exception as e:
+            timed_out, error = False, str(e)
+            elapsed = time.monotonic() - submitted_at
+            logger.error(f"Error en validación {name}: {e}")
+
+        if last_good is not None and name in last_good:
+            logger.warning(f"Validación {name}: usando último resultado válido (obsoleto).")
+            results[name] = ProbeResult(name, last_good[name], elapsed, timed_out, error, stale=True)
+        else:
+            results[name] = ProbeResult(name, defaults.get(name), elapsed, timed_out, error)
+    return results
+
+
+def _timed(fn: Callable[[], Any]) -> tuple[Any, float]:
+    start = time.monotonic()
+    value = fn()
+    return value, time.monotonic() - start
+
+
+def resolve_status(
+    registry_ok: bool,
+    process_running: bool,
+    tray_auth_required: bool,
+    liveness: tuple[OneDriveStatus, Optional[str]],
+    auth_window: bool,
+) -> tuple[OneDriveStatus, bool, Optional[str]]:
+    """Combine probe results with the precedence rules of get_full_status.
+
+    Order: registry (NOT_FOUND) > process (NOT_RUNNING) > tray auth >
+    auth window (AUTH_REQUIRED) > liveness status.
+    """
+    if not registry_ok:
+        return OneDriveStatus.NOT_FOUND, False, "Configuración de Cuenta Faltante (Sesión Cerrada)"
+    if not process_running:
+        return OneDriveStatus.NOT_RUNNING, False, None
+    if tray_auth_required:
+        return OneDriveStatus.AUTH_REQUIRED, True, "Credenciales Requeridas (Icono de Bandeja)"
+    if auth_window:
+        return OneDriveStatus.AUTH_REQUIRED, True, "Autenticación Requerida (Ventana Detectada)"
+    status, msg = liveness
+    return status, True, msg
+
+
+def format_timings(results: dict[str, ProbeResult]) -> str:
+    """One-line summary of probe timings for the log."""
+    parts = []
+    for r in results.values():
+        suffix = " (timeout)" if r.timed_out else " (error)" if r.error else ""
+        if r.stale:
+            suffix += " (stale)"
+        parts.append(f"{r.name}={r.elapsed * 1000:.0f}ms{suffix}")
+    return ", ".join(parts)
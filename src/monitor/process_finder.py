@@ -0,0 +1,94 @@
+"""PID-pinned discovery of the monitored OneDrive.exe process.
+
+Scanning every process and reading its command line each cycle is one of the
+most expensive steps on shared VDI hosts. ``OneDriveProcessLocator`` remembers
+the PID and create_time of the matching OneDrive.exe and, on later cycles,
+only revalidates that one process. A full scan happens only when the pinned
+process is gone, and it filters by name before touching any command line.
+"""
+
+import logging
+from typing import Any, Callable, Iterable, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+ONEDRIVE_PROCESS_NAME = "onedrive.exe"
+
+_GONE = (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess)
+
+
+def cmdline_matches(cmdline: list[str], target_is_personal: bool) -> bool:
+    """Does this OneDrive.exe command line belong to the monitored client?
+
+    Business/Enterprise targets accept any instance not explicitly started as
+    ``/client=personal``; Personal targets require that switch.
+    """
+    if not cmdline:
+        return False
+    is_personal = "/client=personal" in " ".join(cmdline).lower()
+    return is_personal if target_is_personal else not is_personal
+
+
+class OneDriveProcessLocator:
+    """Find the OneDrive.exe instance for the monitored account, pinned by PID."""
+
+    def __init__(
+        self,
+        target_is_personal: bool,
+        process_iter: Callable[..., Iterable[Any]] = psutil.process_iter,
+        get_process: Callable[[int], Any] = psutil.Process,
+    ) -> None:
+        """Create the locator.
+
+        Args:
+            target_is_personal: Whether the monitored account is OneDrive Personal.
+            process_iter: ``psutil.process_iter`` (injectable for tests/benchmarks).
+            get_process: ``psutil.Process`` (injectable for tests/benchmarks).
+        """
+        self.target_is_personal = target_is_personal
+        self._process_iter = process_iter
+        self._get_process = get_process
+
+        self.pid: Optional[int] = None
+        self.create_time: Optional[float] = None
+        self.full_scans = 0
+        self.revalidations = 0
+
+    def find(self) -> Optional[int]:
+        """Return the PID of the matching OneDrive.exe, or None if not running."""
+        if self.pid is not None:
+            if self._revalidate():
+                self.revalidations += 1
+                return self.pid
+            logger.debug(f"Pinned OneDrive.exe PID {self.pid} is gone. Rescanning.")
+            self.pid = None
+            self.create_time = None
+
+        return self._scan()
+
+    def _revalidate(self) -> bool:
+        try:
+            proc = self._get_process(self.pid)
+            # create_time guards against the PID having been reused
+            return proc.is_running() and proc.create_time() == self.create_time
+        except _GONE:
+            return False
+
+    def _scan(self) -> Optional[int]:
+        self.full_scans += 1
+        for proc in self._process_iter(["name"]):
+            try:
+                name = proc.info.get("name")
+                if not name or name.lower() != ONEDRIVE_PROCESS_NAME:
+                    continue
+                if not cmdline_matches(proc.cmdline(), self.target_is_personal):
+                    continue
+                self.pid = proc.pid
+                self.create_time = proc.create_time()
+                logger.debug(f"OneDrive.exe pinned: PID {self.pid}")
+                return self.pid
+            except _GONE:
+                continue
+        return None
@@ -0,0 +1,239 @@
+"""On-demand profiling of live monitor cycles.
+
+When a customer reports that the monitor "uses CPU", the next N cycles of
+``run_monitor`` can be profiled without restarting it:
+
+* ``monitor.profile_cycles`` in config.yaml profiles the first N cycles, or
+* ``POST /api/profile?cycles=N`` on the dashboard drops a request file that
+  the monitor picks up before its next cycle.
+
+Two modes (``monitor.profile_mode``), one file per cycle in ``profile_dir``:
+
+* ``sampling`` (default): a background thread samples the stacks of every
+  thread (loop and probe pool) and writes a speedscope JSON profile
+  (https://www.speedscope.app).
+* ``cprofile``: deterministic cProfile of the loop thread, written as a
+  pstats ``.prof`` file. cProfile cannot follow the probe pool threads (and
+  only one can be active per process since Python 3.12), so probes run
+  inline in the loop thread while a cycle is profiled.
+
+The profiler stops on its own after N cycles. While idle nothing is
+sampled or wrapped; the only cost is one ``exists()`` on the request file
+per cycle.
+"""
+
+import contextlib
+import cProfile
+import json
+import logging
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Executor, Future
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("sampling", "cprofile")
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+class InlineExecutor(Executor):
+    """Runs submitted callables immediately in the calling thread."""
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class StackSampler:
+    """Samples the Python stacks of all threads at a fixed interval."""
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.samples: Counter = Counter()  # (thread name, stack) -> count
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started_at = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples[(names.get(ident, str(ident)), tuple(stack))] += 1
+
+    def to_speedscope(self, name: str) -> dict[str, Any]:
+        """Speedscope "sampled" profiles, one per thread."""
+        frames: list[dict[str, Any]] = []
+        index: dict[tuple, int] = {}
+        by_thread: dict[str, tuple[list[list[int]], list[float]]] = {}
+        for (thread, stack), count in sorted(self.samples.items()):
+            ids = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                ids.append(index[frame])
+            samples, weights = by_thread.setdefault(thread, ([], []))
+            samples.append(ids)
+            weights.append(count * self.interval)
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "onedrive-monitor",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": round(self.elapsed, 6),
+                    "samples": samples,
+                    "weights": weights,
+                }
+                for thread, (samples, weights) in by_thread.items()
+            ],
+        }
+
+
+class CycleProfiler:
+    """Profiles the next N monitor cycles, one file per cycle."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        request_path: Optional[Path] = None,
+        mode: str = "sampling",
+        sample_interval: float = 0.005,
+    ) -> None:
+        """
+        Args:
+            output_dir: Directory the profiles are written to.
+            request_path: File whose appearance requests profiling
+                (``{"cycles": N}``); removed once picked up.
+            mode: ``"sampling"`` (speedscope JSON) or ``"cprofile"`` (pstats).
+            sample_interval: Seconds between stack samples in sampling mode.
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"profile mode must be one of {PROFILE_MODES}, got {mode!r}")
+        self.output_dir = output_dir
+        self.request_path = request_path
+        self.mode = mode
+        self.sample_interval = sample_interval
+        self.remaining = 0
+        self.active = False
+        self.written: list[Path] = []
+
+    @property
+    def inline_probes(self) -> bool:
+        """Probes must run in the loop thread (cProfile cycle in progress)."""
+        return self.active and self.mode == "cprofile"
+
+    def request(self, cycles: int) -> None:
+        """Profile the next ``cycles`` cycles."""
+        if cycles > 0:
+            self.remaining = max(self.remaining, cycles)
+            logger.info(f"Perfilador ({self.mode}): se perfilarán los próximos {self.remaining} ciclos en {self.output_dir}")
+
+    def poll_request(self) -> None:
+        """Pick up a profiling request file left by the dashboard."""
+        if self.request_path is None or not self.request_path.exists():
+            return
+        try:
+            data = json.loads(self.request_path.read_text(encoding="utf-8") or "{}")
+            self.request(int(data.get("cycles", 1)))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Perfilador: solicitud inválida en {self.request_path}: {e}")
+        finally:
+            with contextlib.suppress(OSError):
+                self.request_path.unlink()
+
+    @contextlib.contextmanager
+    def cycle(self, label: Any) -> Iterator[None]:
+        """Profile the enclosed cycle if a profile was requested."""
+        if self.remaining <= 0:
+            yield
+            return
+
+        profile: Optional[cProfile.Profile] = None
+        sampler: Optional[StackSampler] = None
+        if self.mode == "cprofile":
+            profile = cProfile.Profile()
+        else:
+            sampler = StackSampler(self.sample_interval)
+        self.active = True
+        if profile is not None:
+            profile.enable()
+        else:
+            sampler.start()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            else:
+                sampler.stop()
+            self.active = False
+            self.remaining -= 1
+            try:
+                path = self._dump(profile, sampler, label)
+                logger.info(f"Perfilador: ciclo {label} guardado en {path}"
+                            + ("" if self.remaining else " (perfilado finalizado)"))
+            except Exception as e:
+                logger.error(f"Perfilador: no se pudo guardar el perfil del ciclo {label}: {e}")
+
+    def _dump(self, profile: Optional[cProfile.Profile], sampler: Optional[StackSampler], label: Any) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"cycle_{datetime.now():%Y%m%d_%H%M%S}_{label}"
+        if profile is not None:
+            path = self.output_dir / f"{stem}.prof"
+            pstats.Stats(profile).dump_stats(path)
+        else:
+            path = self.output_dir / f"{stem}.speedscope.json"
+            path.write_text(json.dumps(sampler.to_speedscope(stem)), encoding="utf-8")
+        self.written.append(path)
+        return path
+
+
+_profiler: Optional[CycleProfiler] = None
+
+
+def get_profiler() -> Optional[CycleProfiler]:
+    """The monitor's profiler (None until ``set_profiler`` is called)."""
+    return _profiler
+
+
+def set_profiler(profiler: Optional[CycleProfiler]) -> None:
+    global _profiler
+    _profiler = profiler
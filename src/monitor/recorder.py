@@ -0,0 +1,211 @@
+"""Compact trace of the raw probe observations of every monitor cycle.
+
+With ``monitor.record_observations`` set, ``run_monitor`` appends one JSON
+line per account and cycle: what the probes saw (process present, registry
+match, Shell status string, canary age and placeholder state, tray auth,
+auth window, liveness verdict, SyncDiagnostics.log counters) and the status
+that was resolved from it. A ``.gz`` path is gzip-compressed.
+
+``src.simulator.replay`` feeds such a trace back into the remediator and
+the notification rules on a virtual clock, so a customer's incident can be
+reproduced in seconds.
+
+Keys are shortened (see ``FIELD_KEYS``) and ``None`` values are omitted;
+a healthy cycle takes about 120 bytes before compression.
+"""
+
+import gzip
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterator, NamedTuple, Optional
+
+from src.shared.schemas import OneDriveStatus, SyncDiagnosticsSnapshot
+
+if TYPE_CHECKING:
+    from src.monitor.checker import OneDriveChecker
+
+logger = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+
+
+class Observation(NamedTuple):
+    """Raw observations of one account in one cycle."""
+
+    t: float  # Epoch seconds at the end of the cycle
+    account: str
+    status: OneDriveStatus  # Status resolved by the monitor
+    detail: Optional[str] = None
+    process: Optional[bool] = None  # process_check (None: probe did not run)
+    registry: Optional[bool] = None  # registry_check
+    tray_auth: Optional[bool] = None  # tray_auth_check
+    auth_window: Optional[bool] = None  # auth_window_check
+    liveness: Optional[OneDriveStatus] = None  # liveness_check verdict
+    liveness_detail: Optional[str] = None
+    canary_age: Optional[float] = None  # Seconds since the canary was written
+    canary_state: Optional[str] = None  # PlaceholderState of the canary
+    shell: Optional[str] = None  # Shell.Application availability string
+    sync: Optional[dict[str, Any]] = None  # SyncDiagnosticsSnapshot fields (no ``extra``)
+
+    def sync_snapshot(self) -> Optional[SyncDiagnosticsSnapshot]:
+        return SyncDiagnosticsSnapshot(**self.sync) if self.sync is not None else None
+
+
+# Observation field -> key in the trace file
+FIELD_KEYS = {
+    "t": "t",
+    "account": "a",
+    "status": "s",
+    "detail": "d",
+    "process": "p",
+    "registry": "r",
+    "tray_auth": "ta",
+    "auth_window": "aw",
+    "liveness": "l",
+    "liveness_detail": "ld",
+    "canary_age": "ca",
+    "canary_state": "cs",
+    "shell": "sh",
+    "sync": "sy",
+}
+_FIELDS_BY_KEY = {key: field for field, key in FIELD_KEYS.items()}
+
+
+def observe(checker: "OneDriveChecker", status: OneDriveStatus, detail: Optional[str],
+            sync_snapshot: Optional[SyncDiagnosticsSnapshot], now: Optional[float] = None) -> Observation:
+    """Collect the raw observations the checker made in its last cycle."""
+    probes = {name: r.value for name, r in checker.last_probe_results.items()}
+    liveness = probes.get("liveness_check")
+    return Observation(
+        t=round(time.time() if now is None else now, 3),
+        account=checker.target.email,
+        status=OneDriveStatus(status),
+        detail=detail,
+        process=probes.get("process_check"),
+        registry=probes.get("registry_check"),
+        tray_auth=probes.get("tray_auth_check"),
+        auth_window=probes.get("auth_window_check"),
+        liveness=OneDriveStatus(liveness[0]) if liveness else None,
+        liveness_detail=liveness[1] if liveness else None,
+        canary_age=round(checker.last_canary_age, 1) if checker.last_canary_age is not None else None,
+        canary_state=checker.last_canary_state.value if "liveness_check" in probes else None,
+        shell=checker.last_shell_status,
+        sync=sync_snapshot.model_dump(exclude={"extra"}, exclude_none=True) if sync_snapshot is not None else None,
+    )
+
+
+def encode(observation: Observation) -> str:
+    """One compact JSON line (no trailing newline)."""
+    data = {}
+    for field, value in observation._asdict().items():
+        if value is None:
+            continue
+        if isinstance(value, OneDriveStatus):
+            value = value.value
+        data[FIELD_KEYS[field]] = value
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def decode(line: str) -> Observation:
+    data = json.loads(line)
+    fields = {_FIELDS_BY_KEY[key]: value for key, value in data.items() if key in _FIELDS_BY_KEY}
+    fields["status"] = OneDriveStatus(fields["status"])
+    if fields.get("liveness") is not None:
+        fields["liveness"] = OneDriveStatus(fields["liveness"])
+    return Observation(**fields)
+
+
+def _open(path: Path, mode: str) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class ObservationRecorder:
+    """Appends observations to a trace file (shared by every account).
+
+    Lines are flushed every ``flush_every`` records or ``flush_interval``
+    seconds, and on ``close()``: a gzip flush ends a deflate block, so
+    flushing every line would throw away most of the compression. A killed
+    monitor loses at most the unflushed tail (``read_trace`` keeps the rest).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        flush_every: int = 100,
+        flush_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            path: Trace file (gzip-compressed if it ends in ``.gz``).
+            flush_every: Records written between flushes at most.
+            flush_interval: Seconds between flushes at most.
+            clock: Monotonic time source (injectable for tests).
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._file = _open(self.path, "a")
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.flushes = 0
+        self._unflushed = 0
+        self._flushed_at = clock()
+        self._file.write(json.dumps({"v": TRACE_VERSION, "started": round(time.time(), 3)}) + "\n")
+
+    def record(self, observation: Observation) -> None:
+        line = encode(observation)
+        with self._lock:
+            self._file.write(line + "\n")
+            self.recorded += 1
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every or self._clock() - self._flushed_at >= self.flush_interval:
+                self._flush()
+
+    def flush(self) -> None:
+        """Write the buffered lines to the file now."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._file.flush()
+        self.flushes += 1
+        self._unflushed = 0
+        self._flushed_at = self._clock()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._flush()
+                self._file.close()
+
+
+def read_trace(path: Path, account: Optional[str] = None) -> Iterator[Observation]:
+    """Observations of a trace file in recorded order (header lines skipped).
+
+    Args:
+        path: Trace written by ``ObservationRecorder`` (plain or ``.gz``).
+        account: Only this account's observations (all if None).
+    """
+    with _open(Path(path), "r") as f:
+        try:
+            for line in f:
+                if not line.strip() or line.startswith('{"v"'):
+                    continue
+                try:
+                    observation = decode(line)
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Línea de traza inválida ignorada: {e}")
+                    continue
+                if account is None or observation.account.lower() == account.lower():
+                    yield observation
+        except EOFError:
+            # gzip trace of a monitor that was killed: keep what was flushed
+            logger.warning(f"Traza {path} truncada; se usan las observaciones leídas")
@@ -0,0 +1,234 @@
+"""Cached index of OneDrive accounts configured in the registry.
+
+``verify_registry_account`` used to walk every
+``HKCU\\Software\\Microsoft\\OneDrive\\Accounts`` subkey and query its values
+on each cycle. ``AccountIndex`` keeps an email -> accounts map and rebuilds it
+only when the provider reports that the Accounts key changed. One email can be
+configured both as a Business and as a Personal account, so every subkey is
+kept and lookups filter by kind.
+
+Providers:
+    WindowsRegistryProvider  : real registry. Uses RegNotifyChangeKeyValue on
+                               the Accounts key (whole subtree); falls back to
+                               comparing key last-write times if notifications
+                               cannot be armed.
+    InMemoryRegistryProvider : in-memory fake for tests and simulation.
+"""
+
+import logging
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+ACCOUNTS_PATH = r"Software\Microsoft\OneDrive\Accounts"
+
+# RegNotifyChangeKeyValue filter flags (winnt.h)
+REG_NOTIFY_CHANGE_NAME = 0x00000001
+REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+REG_NOTIFY_THREAD_AGNOSTIC = 0x10000000  # Windows 8+: arming thread may exit
+
+
+class AccountEntry(NamedTuple):
+    """One OneDrive account found under the Accounts key."""
+
+    subkey: str  # e.g. 'Business1', 'Personal'
+    user_folder: str
+    values: dict[str, str]
+
+
+class RegistryProvider:
+    """Source of OneDrive account registry data."""
+
+    def read_accounts(self) -> dict[str, dict[str, str]]:
+        """Return {subkey name: {value name: value}} for every account subkey.
+
+        Raises:
+            OSError: If the Accounts key cannot be read.
+        """
+        raise NotImplementedError
+
+    def has_changed(self) -> bool:
+        """True if the accounts may have changed since the last read_accounts()."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release any OS handles."""
+
+
+class InMemoryRegistryProvider(RegistryProvider):
+    """Registry fake: accounts live in a dict, every mutation bumps a version."""
+
+    def __init__(self, accounts: Optional[dict[str, dict[str, str]]] = None) -> None:
+        self.accounts: dict[str, dict[str, str]] = {k: dict(v) for k, v in (accounts or {}).items()}
+        self.version = 0
+        self.read_count = 0
+        self._read_version = -1
+
+    def set_account(self, subkey: str, values: dict[str, str]) -> None:
+        self.accounts[subkey] = dict(values)
+        self.version += 1
+
+    def remove_account(self, subkey: str) -> None:
+        self.accounts.pop(subkey, None)
+        self.version += 1
+
+    def read_accounts(self) -> dict[str, dict[str, str]]:
+        self.read_count += 1
+        self._read_version = self.version
+        return {k: dict(v) for k, v in self.accounts.items()}
+
+    def has_changed(self) -> bool:
+        return self.version != self._read_version
+
+
+class WindowsRegistryProvider(RegistryProvider):
+    """Reads HKCU\\...\\OneDrive\\Accounts, watching it for changes."""
+
+    def __init__(self, accounts_path: str = ACCOUNTS_PATH) -> None:
+        self.accounts_path = accounts_path
+        self._notify_key = None
+        self._notify_event = None
+        self._stamp: Optional[tuple] = None
+        self._loaded = False
+
+    def read_accounts(self) -> dict[str, dict[str, str]]:
+        import winreg
+
+        # Arm the notification before reading so no change can slip in between
+        self._arm_notification()
+
+        accounts: dict[str, dict[str, str]] = {}
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.accounts_path) as accounts_key:
+            i = 0
+            while True:
+                try:
+                    subkey_name = winreg.EnumKey(accounts_key, i)
+                except OSError:
+                    break
+                i += 1
+                values: dict[str, str] = {}
+                try:
+                    with winreg.OpenKey(accounts_key, subkey_name) as subkey:
+                        j = 0
+                        while True:
+                            try:
+                                name, data, _ = winreg.EnumValue(subkey, j)
+                            except OSError:
+                                break
+                            values[name] = str(data)
+                            j += 1
+                except OSError:
+                    continue
+                accounts[subkey_name] = values
+
+        if self._notify_event is None:
+            self._stamp = self._last_write_stamp()
+        self._loaded = True
+        return accounts
+
+    def has_changed(self) -> bool:
+        if not self._loaded:
+            return True
+        if self._notify_event is not None:
+            import win32event
+
+            return win32event.WaitForSingleObject(self._notify_event, 0) == win32event.WAIT_OBJECT_0
+        try:
+            return self._last_write_stamp() != self._stamp
+        except OSError:
+            return True
+
+    def close(self) -> None:
+        if self._notify_key is not None:
+            try:
+                self._notify_key.Close()
+            except Exception:
+                pass
+        self._notify_key = None
+        self._notify_event = None
+
+    def _arm_notification(self) -> None:
+        """(Re)arm RegNotifyChangeKeyValue on the Accounts subtree."""
+        try:
+            import win32api
+            import win32con
+            import win32event
+
+            if self._notify_key is None:
+                self._notify_key = win32api.RegOpenKeyEx(
+                    win32con.HKEY_CURRENT_USER, self.accounts_path, 0,
+                    win32con.KEY_NOTIFY | win32con.KEY_READ,
+                )
+                self._notify_event = win32event.CreateEvent(None, False, False, None)
+            win32api.RegNotifyChangeKeyValue(
+                self._notify_key,
+                True,  # watch subtree
+                REG_NOTIFY_CHANGE_NAME | REG_NOTIFY_CHANGE_LAST_SET | REG_NOTIFY_THREAD_AGNOSTIC,
+                self._notify_event,
+                True,  # asynchronous
+            )
+        except Exception as e:
+            logger.debug(f"Registry change notification unavailable ({e}); using last-write times")
+            self.close()
+
+    def _last_write_stamp(self) -> tuple:
+        """Last-write times of the Accounts key and each account subkey."""
+        import winreg
+
+        stamps = []
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, self.accounts_path) as accounts_key:
+            info = winreg.QueryInfoKey(accounts_key)
+            stamps.append(info[2])
+            for i in range(info[0]):
+                with winreg.OpenKey(accounts_key, winreg.EnumKey(accounts_key, i)) as subkey:
+                    stamps.append(winreg.QueryInfoKey(subkey)[2])
+        return tuple(stamps)
+
+
+class AccountIndex:
+    """email -> AccountEntry list map, rebuilt only when the registry changes."""
+
+    def __init__(self, provider: RegistryProvider) -> None:
+        self.provider = provider
+        self.rebuilds = 0
+        self._by_email: dict[str, list[AccountEntry]] = {}
+        self._valid = False
+
+    def lookup(self, email: str, kind: Optional[str] = None) -> Optional[AccountEntry]:
+        """Find the account configured for ``email`` (case-insensitive).
+
+        Args:
+            email: Account email.
+            kind: ``'Business'`` or ``'Personal'`` to only match subkeys of
+                that kind; None matches the first account with that email.
+
+        Raises:
+            OSError: If the registry cannot be read.
+        """
+        if not self._valid or self.provider.has_changed():
+            self._rebuild()
+        for entry in self._by_email.get(email.lower(), ()):
+            if kind is None or entry.subkey.startswith(kind):
+                return entry
+        return None
+
+    def accounts(self) -> list[AccountEntry]:
+        """All indexed accounts."""
+        if not self._valid or self.provider.has_changed():
+            self._rebuild()
+        return [entry for entries in self._by_email.values() for entry in entries]
+
+    def _rebuild(self) -> None:
+        # Stay invalid until a read succeeds, so a failed read is retried next time
+        self._valid = False
+        by_email: dict[str, list[AccountEntry]] = {}
+        for subkey, values in sorted(self.provider.read_accounts().items()):
+            email = values.get("UserEmail")
+            folder = values.get("UserFolder")
+            if not email or folder is None:
+                continue
+            by_email.setdefault(email.lower(), []).append(AccountEntry(subkey, folder, values))
+        self._by_email = by_email
+        self._valid = True
+        self.rebuilds += 1
+        logger.debug(f"Registry account index rebuilt: {sum(map(len, by_email.values()))} account(s)")
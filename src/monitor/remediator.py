@@ -17,19 +17,37 @@ import time
 import os
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 
-from src.shared.schemas import OneDriveStatus
+from src.monitor.sync_diagnostics import only_canary_pending
+from src.shared.schemas import OneDriveStatus, SyncDiagnosticsSnapshot
 
 from src.shared.notifier import Notifier
 
 logger = logging.getLogger(__name__)
 
 class RemediationAction:
-    def __init__(self):
+    def __init__(
+        self,
+        account: Optional[str] = None,
+        notifier: Optional[Notifier] = None,
+        restart_onedrive: Optional[Callable[[], None]] = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        """
+        Args:
+            account: Email of the monitored account (notification subject).
+            notifier: Notification sender (``Notifier(account)`` by default).
+            restart_onedrive: Replaces taskkill + OneDrive.exe relaunch (simulator);
+                limits, cooldown and counters still apply.
+            clock: Current time for persistence, cooldown and hourly limits
+                (a virtual clock when replaying a trace).
+        """
+        self._restart_onedrive = restart_onedrive
+        self._clock = clock
         self.cooldown_ends: Optional[datetime] = None
         self.restart_attempts: int = 0
-        self.last_restart_hour: int = datetime.now().hour
+        self.last_restart_hour: int = self._clock().hour
         self.COOLDOWN_SECONDS = 60
         self.MAX_RESTARTS_PER_HOUR = 3
         
@@ -48,15 +66,23 @@ class RemediationAction:
         self.DEFAULT_PERSISTENCE = 30  # Default for unlisted states
 
         # Notification Logic
-        self.notifier = Notifier()
+        self.notifier = notifier if notifier is not None else Notifier(account)
         self.last_remediation_time: Optional[datetime] = None
         self.notification_sent_for_incident: bool = False
         self.is_first_run: bool = True  # Para enviar OK al inicio vs RESOLVED después de incidente
         self.pre_syncing_status: Optional[OneDriveStatus] = None  # Estado antes de entrar a SYNCING
 
-    def act(self, status: OneDriveStatus, outage_start_time: Optional[datetime] = None) -> bool:
-        """Attempt to fix the current status if critical. Returns True if action taken."""
-        now = datetime.now()
+    def act(self, status: OneDriveStatus, outage_start_time: Optional[datetime] = None,
+            sync_snapshot: Optional[SyncDiagnosticsSnapshot] = None) -> bool:
+        """Attempt to fix the current status if critical. Returns True if action taken.
+
+        Args:
+            status: Status observed in this cycle.
+            outage_start_time: When the current outage started (from DB history).
+            sync_snapshot: Latest SyncDiagnostics.log snapshot, used to suppress
+                SYNCING notifications when only the canary is uploading.
+        """
+        now = self._clock()
 
         # DEBUG: log current persistence tracking state for diagnosis
         logger.debug(f"ACT: now={now.isoformat()} | last_status={self.last_status} | status_first_seen={self.status_first_seen} | notification_sent={self.notification_sent_for_incident} | is_first_run={self.is_first_run}")
@@ -116,9 +142,7 @@ class RemediationAction:
                         self.is_first_run = False
                     elif tipo == "SYNCING":
                         # Check if only canary is syncing - suppress notification if so
-                        from src.monitor.checker import OneDriveChecker
-                        checker = OneDriveChecker()
-                        if checker.is_only_canary_syncing():
+                        if only_canary_pending(sync_snapshot):
                             logger.info("SYNCING: Suppressed notification - only canary file is syncing")
                         else:
                             self.notifier.send_status_notification(
@@ -264,7 +288,7 @@ class RemediationAction:
         return False
 
     def _in_cooldown(self) -> bool:
-        if self.cooldown_ends and datetime.now() < self.cooldown_ends:
+        if self.cooldown_ends and self._clock() < self.cooldown_ends:
             return True
         return False
     
@@ -275,7 +299,7 @@ class RemediationAction:
         self.notification_sent_for_incident = False
         
         # Reset hourly counter if hour changed
-        current_hour = datetime.now().hour
+        current_hour = self._clock().hour
         if current_hour != self.last_restart_hour:
             self.restart_attempts = 0
             self.last_restart_hour = current_hour
@@ -288,7 +312,17 @@ class RemediationAction:
             return False
 
         logger.warning(f"REMEDIATION: Force Restart triggered due to {reason_status.value}...")
-        
+
+        if self._restart_onedrive is not None:
+            try:
+                self._restart_onedrive()
+            except Exception as e:
+                logger.error(f"REMEDIATION: Failed to restart OneDrive: {e}")
+                return False
+            logger.info("REMEDIATION: Restarted OneDrive (hook)")
+            self._record_restart()
+            return True
+
         # 1. Kill Process (Force)
         try:
              subprocess.run(["taskkill", "/F", "/IM", "OneDrive.exe"], 
@@ -321,11 +355,14 @@ class RemediationAction:
             subprocess.Popen([str(target_exe), "/background"], shell=False)
             logger.info(f"REMEDIATION: Restarted {target_exe}")
             
-            self.restart_attempts += 1
-            self.cooldown_ends = datetime.now() + timedelta(seconds=self.COOLDOWN_SECONDS)
-            self.last_remediation_time = datetime.now()
+            self._record_restart()
             return True
         except Exception as e:
             logger.error(f"REMEDIATION: Failed to start process: {e}")
             self.notifier.notify("Error de Remediación", f"Error al iniciar OneDrive: {e}", "ERROR")
             return False
+
+    def _record_restart(self) -> None:
+        self.restart_attempts += 1
+        self.cooldown_ends = self._clock() + timedelta(seconds=self.COOLDOWN_SECONDS)
+        self.last_remediation_time = self._clock()
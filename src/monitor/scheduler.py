@@ -0,0 +1,111 @@
+"""State-adaptive polling interval for the monitor loop.
+
+Instead of a constant ``check_interval_seconds``, ``AdaptiveScheduler`` picks
+the next delay from the observed status:
+
+* After a state change the interval drops to that status's lower bound.
+* While the status stays the same, the interval grows geometrically
+  (``GROWTH_FACTOR`` per cycle) up to the status's upper bound, with random
+  jitter so fleets of monitors do not spawn PowerShell in lockstep.
+* Until a status has persisted for its ``RemediationAction.PERSISTENCE_BY_STATUS``
+  threshold, the next check is never scheduled past the moment it becomes
+  confirmed, so notifications and remediation are not delayed.
+"""
+
+import logging
+import random
+import time
+from typing import Optional
+
+from src.shared.schemas import OneDriveStatus
+
+logger = logging.getLogger(__name__)
+
+# (min, max) seconds between checks per status (overridable via monitor.poll_bounds)
+DEFAULT_POLL_BOUNDS: dict[OneDriveStatus, tuple[float, float]] = {
+    OneDriveStatus.OK: (15.0, 120.0),
+    OneDriveStatus.SYNCING: (5.0, 30.0),
+    OneDriveStatus.PAUSED: (5.0, 30.0),
+    OneDriveStatus.AUTH_REQUIRED: (5.0, 30.0),
+    OneDriveStatus.ERROR: (5.0, 30.0),
+    OneDriveStatus.NOT_RUNNING: (2.0, 15.0),
+    OneDriveStatus.NOT_FOUND: (5.0, 30.0),
+    OneDriveStatus.UNKNOWN: (5.0, 30.0),
+}
+GROWTH_FACTOR = 1.5
+# Check this long after the persistence threshold so time_in_state >= required
+CONFIRMATION_MARGIN_SECONDS = 0.5
+MIN_INTERVAL_SECONDS = 1.0
+
+
+class AdaptiveScheduler:
+    """Chooses the delay before the next status check."""
+
+    def __init__(
+        self,
+        bounds: Optional[dict[OneDriveStatus, tuple[float, float]]] = None,
+        persistence: Optional[dict[OneDriveStatus, float]] = None,
+        default_persistence: float = 30.0,
+        jitter: float = 0.1,
+        rng: Optional[random.Random] = None,
+        clock=time.monotonic,
+    ) -> None:
+        """
+        Args:
+            bounds: Per-status (min, max) overrides of DEFAULT_POLL_BOUNDS.
+            persistence: Seconds a status must persist before it is confirmed
+                (``RemediationAction.PERSISTENCE_BY_STATUS``).
+            default_persistence: Threshold for statuses not in ``persistence``.
+            jitter: Relative jitter applied to relaxed intervals (0.1 = +/-10%).
+            rng: Random source (seeded in tests).
+            clock: Monotonic time source.
+        """
+        self.bounds = {**DEFAULT_POLL_BOUNDS, **(bounds or {})}
+        self.persistence = persistence or {}
+        self.default_persistence = default_persistence
+        self.jitter = jitter
+        self.rng = rng or random.Random()
+        self.clock = clock
+        self.status: Optional[OneDriveStatus] = None
+        self.status_since = 0.0
+        self.stable_cycles = 0
+
+    @classmethod
+    def from_config(cls, poll_bounds: dict[str, list[float]], **kwargs) -> "AdaptiveScheduler":
+        """Build from ``monitor.poll_bounds`` ({"OK": [15, 120], ...})."""
+        bounds = {}
+        for name, (low, high) in poll_bounds.items():
+            try:
+                bounds[OneDriveStatus(name.upper())] = (float(low), float(high))
+            except ValueError:
+                logger.warning(f"poll_bounds: estado desconocido '{name}', ignorado")
+        return cls(bounds=bounds, **kwargs)
+
+    def observe(self, status: OneDriveStatus) -> None:
+        """Record the status observed by the cycle that just finished."""
+        if status != self.status:
+            self.status = status
+            self.status_since = self.clock()
+            self.stable_cycles = 0
+        else:
+            self.stable_cycles += 1
+
+    def next_interval(self) -> float:
+        """Seconds to wait before the next check."""
+        if self.status is None:
+            return DEFAULT_POLL_BOUNDS[OneDriveStatus.OK][0]
+        low, high = self.bounds.get(self.status, DEFAULT_POLL_BOUNDS[OneDriveStatus.UNKNOWN])
+
+        interval = min(high, low * GROWTH_FACTOR ** self.stable_cycles)
+        if interval > low and self.jitter:
+            interval *= 1 + self.rng.uniform(-self.jitter, self.jitter)
+            interval = max(low, min(high, interval))
+
+        # Do not sleep past the moment the status becomes confirmed
+        required = self.persistence.get(self.status, self.default_persistence)
+        time_in_state = self.clock() - self.status_since
+        if time_in_state < required:
+            until_confirmed = required - time_in_state + CONFIRMATION_MARGIN_SECONDS
+            interval = min(interval, until_confirmed)
+
+        return max(MIN_INTERVAL_SECONDS, interval)
@@ -0,0 +1,89 @@
+"""mtime-gated marker scan of OneDrive settings files.
+
+``check_tray_auth_required`` looks for sign-out markers in the account's
+settings files (``global.dat``, ``global.ini``, ``ClientPolicy.ini``). They
+rarely change, yet were read whole on every cycle. ``SettingsFileCache``
+stats each file and only rescans it when its mtime or size changed; a rescan
+searches a read-only ``mmap`` of the file instead of copying it into memory.
+One cache is shared by every account and probe thread of the machine.
+"""
+
+import logging
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# Settings files of an account folder (settings/Business1, settings/Personal...)
+SETTINGS_FILES = ("global.dat", "global.ini", "ClientPolicy.ini")
+
+# Markers of a signed-out account in the settings files
+AUTH_MARKERS = ("SignedOut", "RequireSignIn")
+
+
+class ScanEntry(NamedTuple):
+    """Cached result of one file scan, valid while mtime and size are unchanged."""
+
+    mtime_ns: int
+    size: int
+    marker: Optional[str]
+
+
+def _encodings(marker: str) -> list[bytes]:
+    # .dat files are binary with ASCII strings; .ini files are often UTF-16 LE
+    return [marker.encode("ascii"), marker.encode("utf-16-le")]
+
+
+class SettingsFileCache:
+    """Marker search in settings files, invalidated by mtime and size."""
+
+    def __init__(self, markers: Iterable[str] = AUTH_MARKERS) -> None:
+        self._patterns = [(m, p) for m in markers for p in _encodings(m)]
+        self._entries: dict[Path, ScanEntry] = {}
+        self._lock = threading.Lock()
+        self.scans = 0
+        self.skips = 0
+
+    def find(self, path: Path) -> Optional[str]:
+        """First marker found in ``path`` (None if absent or the file is missing)."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._entries.pop(path, None)
+            return None
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                self.skips += 1
+                return entry.marker
+
+        marker = self._scan(path, st.st_size)
+        with self._lock:
+            self._entries[path] = ScanEntry(st.st_mtime_ns, st.st_size, marker)
+            self.scans += 1
+        return marker
+
+    def find_any(self, paths: Iterable[Path]) -> Optional[tuple[Path, str]]:
+        """First ``(path, marker)`` hit among ``paths``."""
+        for path in paths:
+            marker = self.find(path)
+            if marker:
+                return path, marker
+        return None
+
+    def _scan(self, path: Path, size: int) -> Optional[str]:
+        if size == 0:
+            return None  # mmap cannot map an empty file
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                for marker, pattern in self._patterns:
+                    if view.find(pattern) != -1:
+                        return marker
+        except (OSError, ValueError) as e:
+            logger.debug(f"No se pudo examinar {path}: {e}")
+        return None
@@ -0,0 +1,281 @@
+"""Persistent PowerShell worker for Shell.Application detail queries.
+
+Spawning ``powershell -NoProfile`` for every liveness cycle costs hundreds of
+milliseconds of CPU. This module keeps a single long-lived PowerShell host
+alive that holds the ``Shell.Application`` COM object and caches one folder
+``Namespace`` per directory, answering requests over a line-delimited
+stdin/stdout protocol.
+
+Protocol (one line per message, UTF-8, tab separated):
+
+    request:  <id>\\t<folder>\\t<file name>
+    response: <id>\\tOK\\t<column value>
+              <id>\\tNONE\\t
+              <id>\\tERR\\t<error message>
+
+The worker is restarted automatically if it exits or stops answering.
+``src.monitor.shell_worker_stub`` speaks the same protocol so the client can
+be exercised on Linux.
+"""
+
+import base64
+import itertools
+import logging
+import os
+import queue
+import subprocess
+import threading
+from pathlib import Path
+from typing import Optional
+
+from src.monitor.metrics import get_metrics
+from src.monitor.watchdog import kill_process_tree
+
+logger = logging.getLogger(__name__)
+
+# Column 305 = 'Availability status' ("Estado de disponibilidad")
+SHELL_STATUS_COLUMN = 305
+
+# Recycle the PowerShell host after this many requests so a leaking COM
+# object can never grow without bound.
+DEFAULT_MAX_REQUESTS = 1000
+
+WORKER_SCRIPT = r"""
+$ErrorActionPreference = 'Stop'
+[Console]::InputEncoding = [System.Text.Encoding]::UTF8
+[Console]::OutputEncoding = [System.Text.Encoding]::UTF8
+$shell = New-Object -ComObject Shell.Application
+$folders = @{}
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    $parts = $line.Split("`t")
+    if ($parts.Length -lt 3) { continue }
+    $id = $parts[0]
+    try {
+        $folder = $folders[$parts[1]]
+        if ($folder -eq $null) {
+            $folder = $shell.Namespace($parts[1])
+            if ($folder -ne $null) { $folders[$parts[1]] = $folder }
+        }
+        $value = $null
+        if ($folder -ne $null) {
+            $item = $folder.ParseName($parts[2])
+            if ($item) { $value = $folder.GetDetailsOf($item, __COLUMN__) }
+        }
+        if ($value) {
+            [Console]::Out.WriteLine("$id`tOK`t" + ($value -replace "[`r`n`t]", " "))
+        } else {
+            [Console]::Out.WriteLine("$id`tNONE`t")
+        }
+    } catch {
+        $folders.Remove($parts[1])
+        [Console]::Out.WriteLine("$id`tERR`t" + ($_.Exception.Message -replace "[`r`n`t]", " "))
+    }
+    [Console]::Out.Flush()
+}
+""".replace("__COLUMN__", str(SHELL_STATUS_COLUMN))
+
+
+def default_worker_command() -> list[str]:
+    """Command line used to launch the PowerShell worker host.
+
+    The script is passed with ``-EncodedCommand`` so its quotes and backticks
+    survive Windows command-line quoting untouched.
+    """
+    encoded = base64.b64encode(WORKER_SCRIPT.encode("utf-16-le")).decode("ascii")
+    return [
+        "powershell",
+        "-NoLogo",
+        "-NoProfile",
+        "-NonInteractive",
+        "-ExecutionPolicy",
+        "Bypass",
+        "-EncodedCommand",
+        encoded,
+    ]
+
+
+class ShellStatusWorker:
+    """Client for a long-lived Shell.Application worker process.
+
+    Thread-safe: concurrent callers are serialized, one request in flight at a
+    time. Any failure (crash, timeout, broken pipe) tears the worker down and
+    the next request starts a fresh one.
+    """
+
+    def __init__(
+        self,
+        command: Optional[list[str]] = None,
+        timeout: float = 10.0,
+        max_requests: int = DEFAULT_MAX_REQUESTS,
+    ) -> None:
+        """Create the worker client (the process is started lazily).
+
+        Args:
+            command: Worker command line. Defaults to the PowerShell host.
+            timeout: Seconds to wait for a single response.
+            max_requests: Requests served before the host is recycled.
+        """
+        self.command = command or default_worker_command()
+        self.timeout = timeout
+        self.max_requests = max_requests
+        self.restart_count = 0
+        self.request_count = 0
+
+        self._proc: Optional[subprocess.Popen] = None
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._served = 0
+        self._started = False
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self) -> Optional[int]:
+        """PID of the running worker, or None if it is not running."""
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc.pid
+        return None
+
+    def query(self, file_path: Path) -> Optional[str]:
+        """Return the Shell availability status of ``file_path``.
+
+        Args:
+            file_path: Valid path to a file in OneDrive.
+
+        Returns:
+            Status string (e.g. 'Disponible en este dispositivo') or None.
+        """
+        with self._lock:
+            self.request_count += 1
+            if not self._ensure_running():
+                get_metrics().record_error("shell_status")
+                return None
+
+            request_id = str(next(self._ids))
+            try:
+                self._proc.stdin.write(f"{request_id}\t{file_path.parent}\t{file_path.name}\n")
+                self._proc.stdin.flush()
+            except (OSError, ValueError) as e:
+                logger.warning(f"Shell worker: write failed ({e}). Restarting.")
+                get_metrics().record_error("shell_status")
+                self._stop()
+                return None
+
+            response = self._read_response(request_id)
+            if response is None:
+                self._stop()
+                return None
+
+            self._served += 1
+            if self._served >= self.max_requests:
+                logger.debug(f"Shell worker: recycling after {self._served} requests")
+                self._stop()
+
+            _, kind, value = response
+            if kind == "OK":
+                return value or None
+            if kind == "ERR":
+                logger.debug(f"Shell worker error for {file_path.name}: {value}")
+                get_metrics().record_error("shell_status")
+            return None
+
+    def close(self) -> None:
+        """Stop the worker process."""
+        with self._lock:
+            self._stop()
+
+    def _ensure_running(self) -> bool:
+        if self._proc is not None and self._proc.poll() is None:
+            return True
+
+        if self._proc is not None:
+            logger.warning(f"Shell worker exited with code {self._proc.returncode}. Restarting.")
+            self._stop()
+        if self._started:
+            self.restart_count += 1
+
+        try:
+            self._proc = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+            )
+        except Exception as e:
+            logger.error(f"Shell worker: failed to start: {e}")
+            self._proc = None
+            return False
+
+        get_metrics().record_spawn("shell_status")
+        self._started = True
+        self._responses = queue.Queue()
+        self._served = 0
+        threading.Thread(
+            target=self._reader,
+            args=(self._proc, self._responses),
+            name="shell-worker-reader",
+            daemon=True,
+        ).start()
+        logger.debug(f"Shell worker started (PID {self._proc.pid})")
+        return True
+
+    @staticmethod
+    def _reader(proc: subprocess.Popen, responses: "queue.Queue[Optional[str]]") -> None:
+        """Pump worker stdout into the response queue (None marks EOF)."""
+        try:
+            for line in proc.stdout:
+                responses.put(line.rstrip("\r\n"))
+        except (OSError, ValueError):
+            pass
+        responses.put(None)
+
+    def _read_response(self, request_id: str) -> Optional[tuple[str, str, str]]:
+        while True:
+            try:
+                line = self._responses.get(timeout=self.timeout)
+            except queue.Empty:
+                logger.warning(f"Shell worker: no response after {self.timeout}s. Restarting.")
+                get_metrics().record_timeout("shell_status")
+                return None
+            if line is None:
+                logger.warning("Shell worker: process closed its output. Restarting.")
+                get_metrics().record_error("shell_status")
+                return None
+
+            parts = line.split("\t", 2)
+            if len(parts) < 2:
+                continue
+            if parts[0] != request_id:
+                # Late answer to a request that already timed out
+                continue
+            return parts[0], parts[1], parts[2] if len(parts) > 2 else ""
+
+    def _stop(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            if proc.stdin:
+                proc.stdin.close()
+        except (OSError, ValueError):
+            pass
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            # A wedged COM call can leave child processes behind: kill the tree
+            kill_process_tree(proc.pid)
+            try:
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                pass
+        try:
+            if proc.stdout:
+                proc.stdout.close()
+        except (OSError, ValueError):
+            pass
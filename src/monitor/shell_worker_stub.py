@@ -0,0 +1,55 @@
+"""Stand-in for the PowerShell Shell.Application worker (Linux/testing).
+
+Speaks the same line protocol as ``src.monitor.shell_worker``. Statuses are
+read from a JSON file mapping file names to column values, re-read on every
+request so tests can change them while the worker is running:
+
+    python -m src.monitor.shell_worker_stub statuses.json
+
+Reserved file names drive failure modes:
+    __crash__ : exit immediately with code 3 (no response)
+    __hang__  : never answer
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+
+def _load_statuses(path: Path) -> dict[str, str]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def main(argv: list[str]) -> int:
+    statuses_path = Path(argv[1]) if len(argv) > 1 else None
+    sys.stdin.reconfigure(encoding="utf-8")
+    sys.stdout.reconfigure(encoding="utf-8")
+
+    for line in sys.stdin:
+        parts = line.rstrip("\r\n").split("\t")
+        if len(parts) < 3:
+            continue
+        request_id, _folder, name = parts[0], parts[1], parts[2]
+
+        if name == "__crash__":
+            return 3
+        if name == "__hang__":
+            while True:
+                time.sleep(60)
+
+        statuses = _load_statuses(statuses_path) if statuses_path else {}
+        value = statuses.get(name)
+        if value:
+            sys.stdout.write(f"{request_id}\tOK\t{value}\n")
+        else:
+            sys.stdout.write(f"{request_id}\tNONE\t\n")
+        sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,143 @@
+"""Single-pass parser for OneDrive's SyncDiagnostics.log.
+
+SyncDiagnostics.log is a sequence of diagnostic blocks made of ``Key = Value``
+lines. ``SyncDiagnosticsParser`` consumes the chunks produced by
+``LogTailer`` and keeps the most recent block as a typed
+``SyncDiagnosticsSnapshot``, so the checker, the remediator and the dashboard
+all read structured fields instead of rescanning raw text.
+
+A new block starts when a key that is already present in the current block
+appears again.
+"""
+
+import logging
+import re
+from typing import Optional
+
+from src.shared.schemas import SyncDiagnosticsSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Auth-related markers searched in SyncDiagnostics.log
+AUTH_LOG_INDICATORS = [
+    "SignIn",
+    "AuthenticationRequired",
+    "CredentialsRequired",
+    "NeedsPassword",
+    "TokenExpired",
+    "OAuth",
+    "LoginRequired",
+    "ReauthRequired",
+]
+# One precompiled matcher for every auth indicator (case-insensitive)
+AUTH_INDICATOR_RE = re.compile("|".join(re.escape(i) for i in AUTH_LOG_INDICATORS), re.IGNORECASE)
+_CANONICAL_INDICATORS = {i.lower(): i for i in AUTH_LOG_INDICATORS}
+
+KEY_VALUE_RE = re.compile(r"^\s*([A-Za-z][\w.]*)\s*=\s*(.*?)\s*$")
+
+# Log keys mapped to typed snapshot fields
+INT_FIELDS = {
+    "SyncProgressState": "sync_progress_state",
+    "FilesToUpload": "files_to_upload",
+    "FilesToDownload": "files_to_download",
+    "BytesToUpload": "bytes_to_upload",
+    "BytesToDownload": "bytes_to_download",
+}
+STR_FIELDS = {
+    "UtcNow": "utc_now",
+}
+
+# How far back (bytes from the end of the log) an auth indicator stays valid
+AUTH_LOG_WINDOW_BYTES = 50000
+
+
+def _to_int(value: str) -> Optional[int]:
+    try:
+        return int(value.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def build_snapshot(block: dict[str, str], blocks_parsed: int = 0,
+                   auth_indicator: Optional[str] = None) -> SyncDiagnosticsSnapshot:
+    """Turn the raw key/value pairs of one block into a typed snapshot."""
+    fields: dict = {"blocks_parsed": blocks_parsed, "auth_indicator": auth_indicator}
+    extra = {}
+    for key, value in block.items():
+        if key in INT_FIELDS:
+            fields[INT_FIELDS[key]] = _to_int(value)
+        elif key in STR_FIELDS:
+            fields[STR_FIELDS[key]] = value
+        else:
+            extra[key] = value
+    fields["extra"] = extra
+    return SyncDiagnosticsSnapshot(**fields)
+
+
+def only_canary_pending(snapshot: Optional[SyncDiagnosticsSnapshot]) -> bool:
+    """True if at most one file (the canary) is waiting to upload.
+
+    Returns False when the log is not available, so notifications are never
+    suppressed on missing data.
+    """
+    if snapshot is None:
+        return False
+    return (snapshot.files_to_upload or 0) <= 1
+
+
+class SyncDiagnosticsParser:
+    """Incremental SyncDiagnostics.log parser fed by ``LogTailer``."""
+
+    def __init__(self, auth_window_bytes: int = AUTH_LOG_WINDOW_BYTES) -> None:
+        self.auth_window_bytes = auth_window_bytes
+        self.blocks_parsed = 0
+        self._current: dict[str, str] = {}
+        self._last_complete: dict[str, str] = {}
+        self._auth_hit: Optional[tuple[str, int]] = None  # (indicator, byte offset)
+
+    def feed(self, text: str, start: int, end: int) -> None:
+        """Consume a chunk of complete log lines (``LogTailer`` callback)."""
+        offset = start
+        for line in text.splitlines(keepends=True):
+            match = AUTH_INDICATOR_RE.search(line)
+            if match:
+                indicator = _CANONICAL_INDICATORS.get(match.group(0).lower(), match.group(0))
+                self._auth_hit = (indicator, offset)
+
+            kv = KEY_VALUE_RE.match(line)
+            if kv:
+                key, value = kv.group(1), kv.group(2)
+                if key in self._current:
+                    self._complete_block()
+                self._current[key] = value
+            # Byte offsets only matter for the auth window; ASCII lines are the norm
+            offset += len(line) if line.isascii() else len(line.encode("utf-8"))
+
+    def reset(self) -> None:
+        """Forget all state (``LogTailer`` reset callback: truncation/rotation)."""
+        self.blocks_parsed = 0
+        self._current = {}
+        self._last_complete = {}
+        self._auth_hit = None
+
+    def snapshot(self, log_offset: int) -> SyncDiagnosticsSnapshot:
+        """Typed view of the most recent block.
+
+        Args:
+            log_offset: Current end offset of the log (``LogTailer.offset``),
+                used to expire auth indicators older than the window.
+        """
+        # A block may still be half-written: fall back to the previous one per key
+        block = {**self._last_complete, **self._current}
+        auth_indicator = None
+        if self._auth_hit is not None:
+            indicator, hit_offset = self._auth_hit
+            if log_offset - hit_offset <= self.auth_window_bytes:
+                auth_indicator = indicator
+        blocks = self.blocks_parsed + (1 if self._current else 0)
+        return build_snapshot(block, blocks, auth_indicator)
+
+    def _complete_block(self) -> None:
+        self._last_complete = self._current
+        self._current = {}
+        self.blocks_parsed += 1
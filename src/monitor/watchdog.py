@@ -0,0 +1,216 @@
+"""Deadline enforcement for external probes and monitor cycles.
+
+A wedged COM call or PowerShell host used to block ``subprocess.run``
+forever and freeze the whole monitor loop (status.json heartbeat, DB writes,
+notifications). This module provides:
+
+* ``run_with_deadline``: runs an external probe and, if it exceeds its
+  deadline, kills the whole process tree and raises ``ProbeTimeoutError``.
+* ``run_with_deadline_async``: the same for the asyncio monitor loop; the
+  process tree is also killed when the awaiting task is cancelled.
+* ``CycleWatchdog``: a background thread that notices when a monitor cycle
+  runs past its budget and reports the overrun while the cycle is still
+  stuck, so status.json can flag it.
+"""
+
+import asyncio
+import locale
+import logging
+import os
+import subprocess
+import threading
+import time
+from typing import Callable, Optional
+
+import psutil
+
+from src.monitor.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class ProbeTimeoutError(TimeoutError):
+    """An external probe exceeded its deadline and was killed."""
+
+
+def kill_process_tree(pid: int, timeout: float = 2.0) -> int:
+    """Kill a process and all its descendants.
+
+    Args:
+        pid: Root process id.
+        timeout: Seconds to wait for the processes to exit.
+
+    Returns:
+        Number of processes killed.
+    """
+    try:
+        root = psutil.Process(pid)
+        procs = root.children(recursive=True) + [root]
+    except psutil.NoSuchProcess:
+        return 0
+    for proc in procs:
+        try:
+            proc.kill()
+        except psutil.NoSuchProcess:
+            pass
+    _, alive = psutil.wait_procs(procs, timeout=timeout)
+    if alive:
+        logger.warning(f"Procesos que no terminaron tras kill: {[p.pid for p in alive]}")
+    return len(procs) - len(alive)
+
+
+def run_with_deadline(args: list[str], timeout: float, name: str = "probe") -> subprocess.CompletedProcess:
+    """Run an external probe with text output and a hard deadline.
+
+    Args:
+        args: Command line.
+        timeout: Seconds allowed before the process tree is killed.
+        name: Probe name used in logs and the error message.
+
+    Returns:
+        The completed process (stdout/stderr as text).
+
+    Raises:
+        ProbeTimeoutError: If the deadline was exceeded.
+    """
+    proc = subprocess.Popen(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+    )
+    get_metrics().record_spawn(name)
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        killed = kill_process_tree(proc.pid)
+        try:
+            proc.communicate(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+        logger.warning(f"Watchdog: {name} excedió {timeout:.0f}s. Árbol de procesos terminado ({killed} procesos).")
+        raise ProbeTimeoutError(f"{name} exceeded {timeout:.0f}s")
+    return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+
+
+async def run_with_deadline_async(args: list[str], timeout: float, name: str = "probe") -> subprocess.CompletedProcess:
+    """Awaitable ``run_with_deadline`` built on ``asyncio.create_subprocess_exec``.
+
+    Args:
+        args: Command line.
+        timeout: Seconds allowed before the process tree is killed.
+        name: Probe name used in logs and the error message.
+
+    Returns:
+        The completed process (stdout/stderr decoded as text).
+
+    Raises:
+        ProbeTimeoutError: If the deadline was exceeded.
+        OSError: If the executable could not be started.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0,
+    )
+    get_metrics().record_spawn(name)
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        killed = await asyncio.to_thread(kill_process_tree, proc.pid)
+        logger.warning(f"Watchdog: {name} excedió {timeout:.0f}s. Árbol de procesos terminado ({killed} procesos).")
+        raise ProbeTimeoutError(f"{name} exceeded {timeout:.0f}s")
+    except asyncio.CancelledError:
+        # Shutdown: do not leave PowerShell hosts behind
+        kill_process_tree(proc.pid, timeout=0.2)
+        raise
+    # Same decoding as ``text=True`` in the synchronous variant
+    encoding = locale.getpreferredencoding(False)
+    return subprocess.CompletedProcess(
+        args,
+        proc.returncode,
+        stdout.decode(encoding, errors="replace"),
+        stderr.decode(encoding, errors="replace"),
+    )
+
+
+class CycleWatchdog:
+    """Flags monitor cycles that run past their time budget."""
+
+    def __init__(
+        self,
+        budget_seconds: float,
+        on_overrun: Callable[[float], None],
+        poll_seconds: float = 1.0,
+        clock=time.monotonic,
+    ) -> None:
+        """
+        Args:
+            budget_seconds: Expected maximum duration of one cycle.
+            on_overrun: Called once per overrunning cycle, from the watchdog
+                thread, with the seconds elapsed so far.
+            poll_seconds: How often the watchdog thread checks.
+            clock: Monotonic time source.
+        """
+        self.budget_seconds = budget_seconds
+        self.on_overrun = on_overrun
+        self.poll_seconds = poll_seconds
+        self.clock = clock
+        self.overruns = 0
+        self._cycle_started: Optional[float] = None
+        self._flagged = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="cycle-watchdog", daemon=True)
+        self._thread.start()
+
+    def begin_cycle(self) -> None:
+        with self._lock:
+            self._cycle_started = self.clock()
+            self._flagged = False
+
+    def end_cycle(self) -> Optional[float]:
+        """Mark the cycle finished.
+
+        Returns:
+            The cycle duration if it overran its budget, else None.
+        """
+        with self._lock:
+            overrun = self._overrun_locked()
+            self._cycle_started = None
+            return overrun
+
+    def current_overrun(self) -> Optional[float]:
+        """Seconds elapsed in the current cycle if past budget, else None."""
+        with self._lock:
+            return self._overrun_locked()
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def _overrun_locked(self) -> Optional[float]:
+        if self._cycle_started is None:
+            return None
+        elapsed = self.clock() - self._cycle_started
+        return elapsed if elapsed > self.budget_seconds else None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            with self._lock:
+                overrun = self._overrun_locked()
+                if overrun is None or self._flagged:
+                    continue
+                self._flagged = True
+                self.overruns += 1
+            logger.warning(f"Watchdog: ciclo de monitoreo lleva {overrun:.0f}s (presupuesto {self.budget_seconds:.0f}s)")
+            try:
+                self.on_overrun(overrun)
+            except Exception as e:
+                logger.error(f"Watchdog: error reportando sobrecarga de ciclo: {e}")
@@ -1,10 +1,11 @@
 """Configuration loader for OneDrive Monitor."""
 
+import re
 from pathlib import Path
 from typing import Any, Optional
 
 import yaml
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 import logging
 
 # Initialize logger
@@ -16,6 +17,13 @@ class TargetConfig(BaseModel):
 
     email: str
     folder: str
+    # Tray icon title, e.g. "OneDrive - Contoso"
+    title: Optional[str] = None
+    # SyncDiagnostics.log of this account (defaults to monitor.log_path)
+    log_path: Optional[str] = None
+    # status.json of this account (defaults to monitor.status_file, suffixed
+    # with the account for every target after the first)
+    status_file: Optional[str] = None
 
 
 class MonitorConfig(BaseModel):
@@ -23,6 +31,11 @@ class MonitorConfig(BaseModel):
 
     check_interval_seconds: int = 60
     status_file: str = "./status.json"
+    # fsync of status publication: "always", "changes" (status.json rewrites) or "never"
+    status_fsync: str = "changes"
+    # Rewrite an unchanged status.json after this many seconds so its probe
+    # metrics stay current (0 = only on changes; freshness is in the heartbeat)
+    status_max_age_seconds: float = 300
     active_check_enabled: bool = True
     active_check_interval_seconds: int = 30
     active_check_timeout_seconds: int = 20
@@ -34,6 +47,42 @@ class MonitorConfig(BaseModel):
     restart_wait_seconds: int = 10
     # How long SYNCING state must persist before triggering forced restart (0 = disabled)
     syncing_restart_timeout_seconds: int = 300
+    # Keep one PowerShell host alive for Shell.Application status queries
+    shell_worker_enabled: bool = True
+    # Seconds to wait for a Shell status answer before restarting the worker
+    shell_worker_timeout_seconds: int = 10
+    # Canary sync state source: "native" (file attribute bits, no COM) or
+    # "shell" (Shell.Application availability column via PowerShell)
+    placeholder_provider: str = "native"
+    # Threads used to run independent probes of a cycle concurrently
+    probe_workers: int = 4
+    # Per-probe deadline overrides in seconds, e.g. {"liveness_check": 20}
+    probe_deadlines: dict[str, float] = {}
+    # Hard deadline for one-shot PowerShell probes (process tree killed after it)
+    probe_subprocess_timeout_seconds: float = 10.0
+    # A cycle running longer than this is flagged as overrun in status.json
+    cycle_budget_seconds: float = 60.0
+    # Wake the loop immediately when the canary or OneDrive logs change
+    event_driven_enabled: bool = False
+    # Quiet period before a burst of file changes triggers a re-check
+    event_debounce_seconds: float = 0.5
+    # Poll slowly while stable and fast after incidents (bounds per status)
+    adaptive_polling_enabled: bool = False
+    # Per-status [min, max] seconds between checks, e.g. {"OK": [15, 120]}
+    poll_bounds: dict[str, list[float]] = {}
+    # Relative random jitter applied to relaxed intervals
+    poll_jitter: float = 0.1
+    # Profile the first N cycles (0 = off; see POST /api/profile)
+    profile_cycles: int = 0
+    # "sampling" (all threads, speedscope JSON) or "cprofile" (loop thread, pstats)
+    profile_mode: str = "sampling"
+    # Directory of the per-cycle profile files
+    profile_dir: str = "./profiles"
+    # Request file written by the dashboard to profile the next cycles
+    profile_request_file: str = "./profile_request.json"
+    # Append raw probe observations of every cycle to this trace file
+    # (None = off; ".gz" compresses). Replay: onedrive_monitor replay --trace
+    record_observations: Optional[str] = None
 
 
 class SmtpConfig(BaseModel):
@@ -67,6 +116,47 @@ class DashboardConfig(BaseModel):
     port: int = 8000
 
 
+class CollectorConfig(BaseModel):
+    """Fleet collector settings (agent push and collector service)."""
+
+    # Agent: push every status report to this collector, e.g. "http://collector:2050"
+    url: Optional[str] = None
+    # Agent: host name reported to the collector (defaults to the machine name)
+    host_name: Optional[str] = None
+    # Agent: seconds to wait for the collector before keeping reports for later
+    push_timeout_seconds: float = 5.0
+    # Agent: reports kept in memory while the collector is unreachable
+    push_buffer_size: int = 100
+    # Collector: listen address
+    host: str = "0.0.0.0"
+    port: int = 2050
+    # Collector: SQLite database with the fleet state
+    db_path: str = "fleet.db"
+    # Collector: reports written per transaction and max wait to fill a batch
+    batch_size: int = 500
+    flush_interval_seconds: float = 0.5
+    # Collector: agents silent for longer than this are counted as stale
+    stale_after_seconds: float = 300.0
+
+
+class DatabaseConfig(BaseModel):
+    """Status history database settings."""
+
+    # Write-behind writer: rows per transaction at most and max wait to fill a batch
+    batch_size: int = 100
+    flush_interval_seconds: float = 1.0
+    # Rows held in memory before new ones are dropped (writer stalled)
+    queue_size: int = 10_000
+    # Pooled read-only connections (dashboard and monitor queries)
+    read_pool_size: int = 4
+    # Per-connection PRAGMAs: lock wait, memory-mapped I/O and page cache
+    busy_timeout_ms: int = 5000
+    mmap_size_mb: int = 64
+    cache_size_mb: int = 8
+    # Rollups: a longer gap between two history rows means the monitor was not
+    # running, so only this much of it is counted in the previous status
+    rollup_max_gap_seconds: float = 900
+
 
 class EmailConfig(BaseModel):
     enabled: bool = False
@@ -112,13 +202,29 @@ class ValidationsConfig(BaseModel):
 class AppConfig(BaseModel):
     """Root application configuration."""
 
-    target: TargetConfig
+    # Single account (legacy) or first entry of ``targets``
+    target: Optional[TargetConfig] = None
+    # Accounts monitored by one monitor process
+    targets: list[TargetConfig] = []
     monitor: MonitorConfig = MonitorConfig()
     alerting: AlertingConfig = AlertingConfig()
     notifications: NotificationConfig = NotificationConfig()
     dashboard: DashboardConfig = DashboardConfig()
+    collector: CollectorConfig = CollectorConfig()
+    database: DatabaseConfig = DatabaseConfig()
     validations: ValidationsConfig = ValidationsConfig()
 
+    @model_validator(mode="after")
+    def _normalize_targets(self) -> "AppConfig":
+        """Accept either ``target`` or ``targets``; expose both."""
+        if not self.targets:
+            if self.target is None:
+                raise ValueError("config requires 'target' or 'targets'")
+            self.targets = [self.target]
+        elif self.target is None:
+            self.target = self.targets[0]
+        return self
+
 
 
 def load_config(config_path: Optional[Path] = None) -> AppConfig:
@@ -139,6 +245,26 @@ def load_config(config_path: Optional[Path] = None) -> AppConfig:
     return AppConfig(**data)
 
 
+def status_path_for(target: TargetConfig, index: int, default: Path) -> Path:
+    """status.json of an account.
+
+    Args:
+        target: The account.
+        index: Position of the account in ``targets``.
+        default: ``monitor.status_file``.
+
+    Returns:
+        ``target.status_file`` if set, ``default`` for the first account, and
+        ``default`` suffixed with the account email for the others.
+    """
+    if target.status_file:
+        return Path(target.status_file)
+    if index == 0:
+        return default
+    slug = re.sub(r"[^a-z0-9]+", "_", target.email.lower()).strip("_")
+    return default.with_name(f"{default.stem}_{slug}{default.suffix}")
+
+
 # Singleton config instance
 _config: Optional[AppConfig] = None
 
@@ -150,6 +276,12 @@ def get_config() -> AppConfig:
         _config = load_config()
     return _config
 
+
+def set_config(config: Optional[AppConfig]) -> None:
+    """Replace the configuration singleton (None: reload config.yaml on next use)."""
+    global _config
+    _config = config
+
 # Add a method to check if a validation is enabled
 def is_validation_enabled(validation_name: str) -> bool:
     """Check if a specific validation is enabled in the configuration.
@@ -1,74 +1,18 @@
-def get_monthly_incident_count(year: int = None, month: int = None) -> int:
-    """Cuenta el número de incidentes agrupados en el mes.
-    
-    Un incidente es un grupo de estados de error consecutivos entre OK y OK.
-    Por ejemplo: OK → ERROR → ERROR → SYNC → OK = 1 incidente (no 3)
-    
-    Solo estados de error cuentan para iniciar/continuar un incidente:
-    NOT_RUNNING, ERROR, PAUSED, AUTH_REQUIRED, NOT_FOUND, SYNCING
-    """
-    from datetime import datetime
-    if year is None or month is None:
-        now = datetime.now()
-        year = now.year
-        month = now.month
-    
-    # Estados que representan un problema (incidente activo)
-    incident_states = {"NOT_RUNNING", "ERROR", "PAUSED", "AUTH_REQUIRED", "NOT_FOUND", "SYNCING"}
-    
-    conn = sqlite3.connect(get_db_path())
-    cursor = conn.cursor()
-    
-    # Crear la tabla si no existe
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS status_history (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-        status TEXT NOT NULL,
-        message TEXT,
-        is_change BOOLEAN DEFAULT 0
-    )
-    ''')
-    conn.commit()
-    
-    try:
-        # Obtener todos los registros del mes ordenados cronológicamente
-        cursor.execute('''
-            SELECT status FROM status_history
-            WHERE strftime('%Y', timestamp) = ?
-            AND strftime('%m', timestamp) = ?
-            ORDER BY id ASC
-        ''', (str(year), f'{month:02d}'))
-        
-        rows = cursor.fetchall()
-        
-        # Contar transiciones OK → Error (inicio de incidente)
-        incident_count = 0
-        in_incident = False
-        
-        for row in rows:
-            status = row[0]
-            
-            if status in incident_states:
-                # Entramos o continuamos en un incidente
-                if not in_incident:
-                    incident_count += 1  # Nuevo incidente
-                    in_incident = True
-            elif status == "OK":
-                # Salimos del incidente
-                in_incident = False
-        
-        return incident_count
-        
-    except Exception:
-        return 0
-    finally:
-        conn.close()
+import contextlib
+import logging
+import queue
 import sqlite3
 import os
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterator, NamedTuple, Optional, Union
+
+from src.shared.config import DatabaseConfig, get_config
+from src.shared.schemas import STATUS_SEVERITY, DbWriterSnapshot
+
+logger = logging.getLogger(__name__)
 
 DB_NAME = "onedrive_monitor.db"
 
@@ -77,129 +21,1010 @@ def get_db_path() -> str:
     # Assuming this run from root
     return DB_NAME
 
-def init_db():
-    """Initialize the database table."""
-    conn = sqlite3.connect(get_db_path())
-    cursor = conn.cursor()
-    
-    cursor.execute('''
+
+def configure_connection(conn: sqlite3.Connection, settings: DatabaseConfig, read_only: bool = False) -> None:
+    """Apply the per-connection PRAGMAs (lock wait, memory map, page cache)."""
+    conn.execute(f"PRAGMA busy_timeout={int(settings.busy_timeout_ms)}")
+    conn.execute(f"PRAGMA mmap_size={int(settings.mmap_size_mb) * 1024 * 1024}")
+    conn.execute(f"PRAGMA cache_size={-int(settings.cache_size_mb) * 1024}")  # Negative: KiB
+    if read_only:
+        conn.execute("PRAGMA query_only=1")
+
+
+class ConnectionPool:
+    """Reusable SQLite connections of one database, configured once.
+
+    Connections stay open between queries, so SQLite's per-connection
+    prepared statement cache is actually reused. Each connection is used by
+    one thread at a time (``connection()`` checks it out).
+    """
+
+    def __init__(self, db_path: str, settings: DatabaseConfig, read_only: bool = True) -> None:
+        """
+        Args:
+            db_path: SQLite database file.
+            settings: Pool size and PRAGMA values.
+            read_only: Open with ``mode=ro`` (the dashboard never writes).
+        """
+        self.db_path = db_path
+        self.settings = settings
+        self.read_only = read_only
+        self.size = max(1, settings.read_pool_size)
+        self.created = 0
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        if self.read_only:
+            uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        else:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        configure_connection(conn, self.settings, self.read_only)
+        return conn
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection (waits up to ``busy_timeout_ms`` when all are busy)."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = self.created < self.size
+                if grow:
+                    self.created += 1
+            if grow:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._lock:
+                        self.created -= 1
+                    raise
+            else:
+                conn = self._idle.get(timeout=self.settings.busy_timeout_ms / 1000)
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+# Prepared statements kept per pooled connection
+STATEMENT_CACHE_SIZE = 64
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _read_pool() -> ConnectionPool:
+    path = get_db_path()
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = ConnectionPool(path, get_config().database, read_only=True)
+        return pool
+
+
+def close_pools() -> None:
+    """Close every pooled read connection (e.g. before the database file is removed)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _query(sql: str, params: Union[tuple, dict] = ()) -> list[sqlite3.Row]:
+    """Rows of a read query on a pooled read-only connection ([] if there is no database yet)."""
+    if not os.path.exists(get_db_path()):
+        return []
+    with _read_pool().connection() as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def _migration_base_schema(conn: sqlite3.Connection, default_account: Optional[str]) -> None:
+    """status_history table with the account column."""
+    conn.execute('''
     CREATE TABLE IF NOT EXISTS status_history (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
         status TEXT NOT NULL,
         message TEXT,
-        is_change BOOLEAN DEFAULT 0
+        is_change BOOLEAN DEFAULT 0,
+        account TEXT
     )
     ''')
-    
-    conn.commit()
-    conn.close()
 
-def log_status(status: str, message: str, is_change: bool = False):
-    """Log a status entry to the database."""
+    # Databases created before multi-account support lack the account column
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(status_history)")}
+    if "account" not in columns:
+        conn.execute("ALTER TABLE status_history ADD COLUMN account TEXT")
+        if default_account:
+            conn.execute("UPDATE status_history SET account = ? WHERE account IS NULL", (default_account,))
+
+
+def _migration_history_indexes(conn: sqlite3.Connection, default_account: Optional[str]) -> None:
+    """Indexes for time-range scans and the last row of a status."""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_status_history_timestamp ON status_history (timestamp)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_status_history_status ON status_history (status, id)")
+
+
+def _migration_incidents(conn: sqlite3.Connection, default_account: Optional[str]) -> None:
+    """incidents table, backfilled from status_history."""
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS incidents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        account TEXT,
+        started_at TEXT NOT NULL,
+        ended_at TEXT,
+        first_status TEXT NOT NULL,
+        worst_status TEXT NOT NULL,
+        last_status TEXT NOT NULL,
+        transitions INTEGER NOT NULL DEFAULT 0,
+        duration_seconds REAL,
+        remediation_attempts INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_incidents_started ON incidents (started_at)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_incidents_duration ON incidents (duration_seconds)")
+    # Open incidents (NULL sorts first) and the ones still running at a month start
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_incidents_ended ON incidents (ended_at)")
+    _rebuild_incidents(conn)
+
+
+def _migration_rollups(conn: sqlite3.Connection, default_account: Optional[str]) -> None:
+    """minute/hour/day rollup tables."""
+    # Frozen: a status added to OneDriveStatus later gets its column from a
+    # new migration (ALTER TABLE ... ADD COLUMN) and an entry in ROLLUP_STATUSES
+    statuses = ("OK", "SYNCING", "PAUSED", "AUTH_REQUIRED", "ERROR", "NOT_RUNNING", "NOT_FOUND", "UNKNOWN")
+    status_columns = "".join(f"        {status.lower()}_seconds REAL NOT NULL DEFAULT 0,\n" for status in statuses)
+    for table in ("rollup_minute", "rollup_hour", "rollup_day"):
+        conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {table} (
+            bucket TEXT NOT NULL,
+            account TEXT NOT NULL DEFAULT '',
+{status_columns}            transitions INTEGER NOT NULL DEFAULT 0,
+            worst_status TEXT NOT NULL,
+            worst_severity INTEGER NOT NULL,
+            PRIMARY KEY (bucket, account)
+        )
+        ''')
+
+
+# Schema migrations in order; PRAGMA user_version holds how many were applied.
+# Never edit or reorder an applied migration, append a new one instead.
+MIGRATIONS: list[Callable[[sqlite3.Connection, Optional[str]], None]] = [
+    _migration_base_schema,
+    _migration_history_indexes,
+    _migration_incidents,
+    _migration_rollups,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+# Migrations that change the rollup columns: the rollups are recomputed from
+# the history once the pending migrations are applied, with this version's columns
+ROLLUP_MIGRATIONS = {_migration_rollups}
+
+
+def migrate(conn: sqlite3.Connection, default_account: Optional[str] = None) -> int:
+    """Apply the pending migrations, each in its own transaction.
+
+    Args:
+        conn: Connection to the database.
+        default_account: Passed to the migrations (legacy rows' account).
+
+    Returns:
+        The schema version after migrating.
+    """
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version > SCHEMA_VERSION:
+        logger.warning(f"DB: esquema v{version} más nuevo que esta versión del monitor (v{SCHEMA_VERSION})")
+        return version
+    pending = MIGRATIONS[version:]
+    for number, migration in enumerate(pending, start=version + 1):
+        conn.execute("BEGIN")
+        try:
+            migration(conn, default_account)
+            conn.execute(f"PRAGMA user_version={number}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logger.info(f"DB: migración {number} aplicada ({migration.__doc__})")
+        version = number
+    if any(migration in ROLLUP_MIGRATIONS for migration in pending):
+        with conn:
+            _rebuild_rollups(conn)
+        logger.info("DB: agregaciones recalculadas desde el historial")
+    return version
+
+
+def init_db(default_account: Optional[str] = None):
+    """Initialize the database and bring its schema up to date.
+
+    Args:
+        default_account: Account assigned to rows written before the
+            ``account`` column existed (single-account history).
+    """
+    conn = sqlite3.connect(get_db_path())
+    # Persistent: readers (dashboard) and the writer no longer block each other
+    conn.execute("PRAGMA journal_mode=WAL")
+    try:
+        migrate(conn, default_account)
+    finally:
+        conn.close()
+
+# One status_history row: (timestamp, status, message, is_change, account)
+StatusRow = tuple[datetime, str, str, bool, Optional[str]]
+
+
+class RemediationEvent(NamedTuple):
+    """Restart triggered by the remediator, counted on the open incident."""
+
+    timestamp: datetime
+    account: Optional[str]
+
+
+# What the writer persists, in order
+HistoryItem = Union[StatusRow, RemediationEvent]
+
+
+def _describe_item(item: HistoryItem) -> str:
+    """Item type, account and time of a writer item, for log messages."""
+    if isinstance(item, RemediationEvent):
+        return f"intento de remediación ({item.account}, {item.timestamp})"
+    timestamp, status, _, _, account = item
+    return f"estado {status} ({account}, {timestamp})"
+
+
+def _insert_rows(conn: sqlite3.Connection, rows: list[HistoryItem]) -> None:
+    status_rows = [row for row in rows if not isinstance(row, RemediationEvent)]
+    # Each account's last row before this batch: its status lasted until the first new row
+    previous = {account: _last_status_row(conn, account) for account in {row[4] for row in status_rows}}
+    conn.executemany('''
+    INSERT INTO status_history (timestamp, status, message, is_change, account)
+    VALUES (?, ?, ?, ?, ?)
+    ''', status_rows)
+    # Same transaction: incidents and rollups never disagree with the history
+    _track_incidents(conn, rows)
+    _track_rollups(conn, status_rows, previous)
+
+
+def _write_now(item: HistoryItem) -> None:
     try:
         conn = sqlite3.connect(get_db_path())
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        INSERT INTO status_history (timestamp, status, message, is_change)
-        VALUES (?, ?, ?, ?)
-        ''', (datetime.now(), status, message, is_change))
-        
-        conn.commit()
+        with conn:
+            _insert_rows(conn, [item])
         conn.close()
     except Exception as e:
-        print(f"DB Error: {e}")
+        logger.error(f"DB Error: {e}")
 
-def get_recent_history(limit: int = 50) -> List[Dict[str, Any]]:
-    """Get the most recent N history entries."""
-    conn = sqlite3.connect(get_db_path())
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-    SELECT id, timestamp, status, message, is_change
+
+def log_status(status: str, message: str, is_change: bool = False, account: Optional[str] = None):
+    """Log a status entry to the database.
+
+    Queued for the background writer when one is running (see
+    ``start_writer``), written synchronously otherwise.
+    """
+    row = (datetime.now(), status, message, is_change, account)
+    if _writer is not None:
+        _writer.enqueue(row)
+        return
+    _write_now(row)
+
+
+def log_remediation(account: Optional[str] = None) -> None:
+    """Count a remediation attempt (OneDrive restart) on the account's open incident."""
+    event = RemediationEvent(datetime.now(), account)
+    if _writer is not None:
+        _writer.enqueue(event)
+        return
+    _write_now(event)
+
+
+# Statuses that open or extend an incident; OK closes it, UNKNOWN changes nothing
+INCIDENT_STATES = frozenset({"NOT_RUNNING", "ERROR", "PAUSED", "AUTH_REQUIRED", "NOT_FOUND", "SYNCING"})
+
+OPEN_INCIDENT_SQL = '''
+    SELECT id, started_at, worst_status, last_status, transitions, remediation_attempts
+    FROM incidents
+    WHERE account IS ? AND ended_at IS NULL
+    ORDER BY id DESC
+    LIMIT 1
+'''
+INSERT_INCIDENT_SQL = '''
+    INSERT INTO incidents (account, started_at, first_status, worst_status, last_status)
+    VALUES (?, ?, ?, ?, ?)
+'''
+UPDATE_INCIDENT_SQL = '''
+    UPDATE incidents
+    SET ended_at = ?, duration_seconds = ?, worst_status = ?, last_status = ?, transitions = ?, remediation_attempts = ?
+    WHERE id = ?
+'''
+
+# status_history rows folded per statement while rebuilding the incidents
+BACKFILL_CHUNK_ROWS = 5000
+
+
+class _OpenIncident:
+    """In-memory copy of an account's open incident while a batch is folded in."""
+
+    __slots__ = ("id", "started_at", "worst_status", "last_status", "transitions", "remediation_attempts", "dirty")
+
+    def __init__(self, id: int, started_at: str, worst_status: str, last_status: str,
+                 transitions: int = 0, remediation_attempts: int = 0) -> None:
+        self.id = id
+        self.started_at = started_at
+        self.worst_status = worst_status
+        self.last_status = last_status
+        self.transitions = transitions
+        self.remediation_attempts = remediation_attempts
+        self.dirty = False
+
+    def observe(self, status: str) -> None:
+        if status == self.last_status:
+            return
+        self.transitions += 1
+        self.last_status = status
+        if STATUS_SEVERITY.get(status, 1) > STATUS_SEVERITY.get(self.worst_status, 1):
+            self.worst_status = status
+        self.dirty = True
+
+    def save(self, conn: sqlite3.Connection, ended_at: Optional[datetime] = None) -> None:
+        duration = (ended_at - _parse_db_datetime(self.started_at)).total_seconds() if ended_at else None
+        conn.execute(UPDATE_INCIDENT_SQL, (
+            str(ended_at) if ended_at else None, duration, self.worst_status, self.last_status,
+            self.transitions, self.remediation_attempts, self.id,
+        ))
+
+
+def _track_incidents(conn: sqlite3.Connection, items: list[HistoryItem]) -> None:
+    """Fold status rows and remediation events into the incidents table.
+
+    The open incident of each account is read once per batch and written
+    back at the end, so a batch costs a few statements whatever its size.
+    ``transitions`` counts the status changes after the first status, the
+    recovery to OK included.
+    """
+    open_incidents: dict[Optional[str], Optional[_OpenIncident]] = {}
+
+    def current(account: Optional[str]) -> Optional[_OpenIncident]:
+        if account not in open_incidents:
+            row = conn.execute(OPEN_INCIDENT_SQL, (account,)).fetchone()
+            open_incidents[account] = _OpenIncident(*row) if row else None
+        return open_incidents[account]
+
+    for item in items:
+        if isinstance(item, RemediationEvent):
+            incident = current(item.account)
+            if incident is not None:
+                incident.remediation_attempts += 1
+                incident.dirty = True
+            continue
+
+        timestamp, status, _, _, account = item
+        if status in INCIDENT_STATES:
+            incident = current(account)
+            if incident is None:
+                started_at = str(_parse_db_datetime(timestamp))
+                cursor = conn.execute(INSERT_INCIDENT_SQL, (account, started_at, status, status, status))
+                open_incidents[account] = _OpenIncident(cursor.lastrowid, started_at, status, status)
+            else:
+                incident.observe(status)
+        elif status == "OK":
+            incident = current(account)
+            if incident is not None:
+                incident.observe(status)
+                incident.save(conn, ended_at=_parse_db_datetime(timestamp))
+                open_incidents[account] = None
+
+    for incident in open_incidents.values():
+        if incident is not None and incident.dirty:
+            incident.save(conn)
+
+
+def _rebuild_incidents(conn: sqlite3.Connection) -> int:
+    """Recompute the incidents table from status_history; returns how many there are."""
+    conn.execute("DELETE FROM incidents")
+    cursor = conn.execute("SELECT timestamp, status, message, is_change, account FROM status_history ORDER BY id")
+    while rows := cursor.fetchmany(BACKFILL_CHUNK_ROWS):
+        _track_incidents(conn, rows)
+    return conn.execute("SELECT COUNT(*) FROM incidents").fetchone()[0]
+
+
+# Rollup resolutions, finest first, and their tables
+ROLLUP_STEPS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+ROLLUP_TABLES = {resolution: f"rollup_{resolution}" for resolution in ROLLUP_STEPS}
+# Statuses with a seconds column, in column order (others count as UNKNOWN).
+# Appending one needs a migration adding its column to the three tables.
+ROLLUP_STATUSES = ["OK", "SYNCING", "PAUSED", "AUTH_REQUIRED", "ERROR", "NOT_RUNNING", "NOT_FOUND", "UNKNOWN"]
+ROLLUP_COLUMNS = [f"{status.lower()}_seconds" for status in ROLLUP_STATUSES]
+
+LAST_STATUS_ROW_SQL = "SELECT timestamp, status FROM status_history WHERE account IS ? ORDER BY id DESC LIMIT 1"
+
+
+def _upsert_rollup_sql(table: str) -> str:
+    columns = ", ".join(ROLLUP_COLUMNS)
+    added = ", ".join(f"{column} = {column} + excluded.{column}" for column in ROLLUP_COLUMNS)
+    return f'''
+    INSERT INTO {table} (bucket, account, {columns}, transitions, worst_status, worst_severity)
+    VALUES (?, ?, {", ".join("?" for _ in ROLLUP_COLUMNS)}, ?, ?, ?)
+    ON CONFLICT (bucket, account) DO UPDATE SET
+        {added},
+        transitions = transitions + excluded.transitions,
+        worst_status = CASE WHEN excluded.worst_severity > worst_severity THEN excluded.worst_status ELSE worst_status END,
+        worst_severity = MAX(worst_severity, excluded.worst_severity)
+    '''
+
+
+def _bucket_start(resolution: str, moment: datetime) -> datetime:
+    if resolution == "minute":
+        return moment.replace(second=0, microsecond=0)
+    if resolution == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _last_status_row(conn: sqlite3.Connection, account: Optional[str]) -> Optional[tuple[datetime, str]]:
+    row = conn.execute(LAST_STATUS_ROW_SQL, (account,)).fetchone()
+    return (_parse_db_datetime(row[0]), row[1]) if row else None
+
+
+class _RollupBatch:
+    """Rollup cells touched by one batch, summed in memory and upserted at once.
+
+    Intervals are split into minute cells only; the hour and day cells are
+    summed from those when the batch is saved.
+    """
+
+    def __init__(self) -> None:
+        # (minute, account) -> [seconds per status..., transitions, worst severity]
+        self.cells: dict[tuple[datetime, str], list] = {}
+
+    def _cell(self, cells: dict, key: tuple[datetime, str]) -> list:
+        cell = cells.get(key)
+        if cell is None:
+            cell = cells[key] = [0.0] * len(ROLLUP_COLUMNS) + [0, -1]
+        return cell
+
+    def add_interval(self, account: str, status: str, start: datetime, end: datetime) -> None:
+        """Count ``[start, end)`` as spent in ``status``, split at minute edges."""
+        index = ROLLUP_STATUSES.index(status) if status in ROLLUP_STATUSES else ROLLUP_STATUSES.index("UNKNOWN")
+        severity = STATUS_SEVERITY.get(status, 1)
+        step = ROLLUP_STEPS["minute"]
+        bucket = _bucket_start("minute", start)
+        while bucket < end:
+            cell = self._cell(self.cells, (bucket, account))
+            cell[index] += (min(end, bucket + step) - max(start, bucket)).total_seconds()
+            cell[-1] = max(cell[-1], severity)
+            bucket += step
+
+    def add_transition(self, account: str, status: str, at: datetime) -> None:
+        cell = self._cell(self.cells, (_bucket_start("minute", at), account))
+        cell[-2] += 1
+        cell[-1] = max(cell[-1], STATUS_SEVERITY.get(status, 1))
+
+    def save(self, conn: sqlite3.Connection) -> None:
+        worst = {severity: status for status, severity in STATUS_SEVERITY.items()}
+        for resolution, table in ROLLUP_TABLES.items():
+            if resolution == "minute":
+                cells = self.cells
+            else:
+                cells = {}
+                for (minute, account), minute_cell in self.cells.items():
+                    cell = self._cell(cells, (_bucket_start(resolution, minute), account))
+                    for i, value in enumerate(minute_cell[:-1]):
+                        cell[i] += value
+                    cell[-1] = max(cell[-1], minute_cell[-1])
+            rows = [
+                (str(bucket), account, *cell[:-1], worst.get(cell[-1], "UNKNOWN"), cell[-1])
+                for (bucket, account), cell in cells.items()
+            ]
+            if rows:
+                conn.executemany(_upsert_rollup_sql(table), rows)
+
+
+def _track_rollups(
+    conn: sqlite3.Connection,
+    rows: list[StatusRow],
+    previous: dict[Optional[str], Optional[tuple[datetime, str]]],
+) -> None:
+    """Fold status rows into the minute/hour/day rollups.
+
+    A row's status lasts until the account's next row, so each row closes
+    the interval of the one before it (``previous`` holds the last row of
+    each account and is updated in place). Gaps longer than
+    ``database.rollup_max_gap_seconds`` only count up to that limit.
+    """
+    max_gap = timedelta(seconds=get_config().database.rollup_max_gap_seconds)
+    batch = _RollupBatch()
+    for timestamp, status, _, _, account in rows:
+        at = _parse_db_datetime(timestamp)
+        last = previous.get(account)
+        if last is not None:
+            last_at, last_status = last
+            if at > last_at:
+                batch.add_interval(account or "", last_status, last_at, min(at, last_at + max_gap))
+            if status != last_status:
+                batch.add_transition(account or "", status, at)
+        previous[account] = (at, status)
+    batch.save(conn)
+
+
+def _rebuild_rollups(conn: sqlite3.Connection) -> None:
+    """Recompute the rollup tables from status_history."""
+    for table in ROLLUP_TABLES.values():
+        conn.execute(f"DELETE FROM {table}")
+    previous: dict[Optional[str], Optional[tuple[datetime, str]]] = {}
+    cursor = conn.execute("SELECT timestamp, status, message, is_change, account FROM status_history ORDER BY id")
+    while rows := cursor.fetchmany(BACKFILL_CHUNK_ROWS):
+        _track_rollups(conn, rows, previous)
+
+
+def backfill_rollups() -> None:
+    """Rebuild the rollup tables of the database from its status history."""
+    init_db()
+    conn = sqlite3.connect(get_db_path(), timeout=30)
+    try:
+        with conn:
+            _rebuild_rollups(conn)
+    finally:
+        conn.close()
+
+
+def backfill_incidents() -> int:
+    """Rebuild the incidents table of the database from its status history.
+
+    Migration 3 already does this once; run it again after importing or
+    editing history. status_history does not record restarts, so rebuilt
+    incidents have 0 remediation attempts.
+
+    Returns:
+        Number of incidents in the rebuilt table.
+    """
+    init_db()
+    conn = sqlite3.connect(get_db_path(), timeout=30)
+    try:
+        with conn:
+            return _rebuild_incidents(conn)
+    finally:
+        conn.close()
+
+
+class StatusWriter:
+    """Write-behind writer of status rows.
+
+    ``enqueue`` only appends to a bounded in-memory queue. A single thread
+    owns one long-lived connection in WAL mode and writes the rows in
+    transactions of up to ``batch_size`` rows, or whatever arrived within
+    ``flush_interval`` seconds, so the fsync of each commit happens off the
+    monitor cycle.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_queue: int = 10_000,
+        on_commit: Optional[Callable[[float, bool], None]] = None,
+    ) -> None:
+        """
+        Args:
+            db_path: SQLite database file (``get_db_path()`` by default).
+            batch_size: Rows written per transaction at most.
+            flush_interval: Seconds the writer waits to fill a batch.
+            max_queue: Rows held in memory before new ones are dropped.
+            on_commit: Called with the seconds each transaction took and
+                whether it failed (e.g. to feed a latency histogram).
+        """
+        self.db_path = db_path or get_db_path()
+        self.settings = get_config().database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_commit = on_commit
+        self.rows_written = 0
+        self.batches_written = 0
+        self.rows_dropped = 0
+        self.errors = 0
+        self.max_queue_depth = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+
+    def enqueue(self, row: HistoryItem) -> bool:
+        """Queue a row (or remediation event) for the writer.
+
+        Returns:
+            False if the queue was full and the row was dropped.
+        """
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.rows_dropped += 1
+            logger.warning(f"DB: cola de escritura llena, {_describe_item(row)} descartado")
+            return False
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+        return True
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until everything queued so far is committed.
+
+        Returns:
+            True if the writer confirmed the flush within ``timeout``.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Write what is pending and stop the writer thread."""
+        self._stop.set()
+        with contextlib.suppress(queue.Full):
+            self._queue.put_nowait(threading.Event())  # Wake an idle writer
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            if self._thread.is_alive():
+                logger.warning(f"DB: el escritor no terminó en {timeout:.0f}s; {self.pending} filas pendientes")
+
+    def snapshot(self) -> DbWriterSnapshot:
+        return DbWriterSnapshot(
+            queue_depth=self.pending,
+            max_queue_depth=self.max_queue_depth,
+            rows_written=self.rows_written,
+            batches_written=self.batches_written,
+            rows_dropped=self.rows_dropped,
+            errors=self.errors,
+        )
+
+    def _run(self) -> None:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        configure_connection(conn, self.settings)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # WAL makes NORMAL durable across application crashes; only an OS
+        # crash can lose the last commits
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            while True:
+                stopping = self._stop.is_set()
+                batch, flushes = self._drain(block=not stopping)
+                if batch:
+                    self._write_batch(conn, batch)
+                for done in flushes:
+                    done.set()
+                if stopping and not batch and not flushes:
+                    return
+        finally:
+            conn.close()
+
+    def _drain(self, block: bool) -> tuple[list[HistoryItem], list[threading.Event]]:
+        batch: list[HistoryItem] = []
+        flushes: list[threading.Event] = []
+        try:
+            # Wake up regularly while idle to notice close()
+            item = self._queue.get(timeout=0.5) if block else self._queue.get_nowait()
+        except queue.Empty:
+            return batch, flushes
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            if isinstance(item, threading.Event):
+                flushes.append(item)
+                break  # Commit what came before the flush request now
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                break
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=timeout) if block and timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+        return batch, flushes
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: list[HistoryItem]) -> None:
+        start = time.perf_counter()
+        failed = False
+        try:
+            with conn:
+                _insert_rows(conn, batch)
+            self.rows_written += len(batch)
+            self.batches_written += 1
+        except Exception as e:
+            failed = True
+            self.errors += 1
+            logger.error(f"DB Error: lote de {len(batch)} filas no guardado: {e}")
+        if self.on_commit is not None:
+            self.on_commit(time.perf_counter() - start, failed)
+
+
+_writer: Optional[StatusWriter] = None
+
+
+def get_writer() -> Optional[StatusWriter]:
+    """The running background writer, if any."""
+    return _writer
+
+
+def start_writer(**kwargs: Any) -> StatusWriter:
+    """Route ``log_status`` through a new background writer (see ``StatusWriter``)."""
+    global _writer
+    stop_writer()
+    writer = StatusWriter(**kwargs)
+    writer.start()
+    _writer = writer
+    return writer
+
+
+def stop_writer() -> None:
+    """Flush and stop the background writer; ``log_status`` writes synchronously again."""
+    global _writer
+    writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
+
+RECENT_HISTORY_SQL = '''
+    SELECT id, timestamp, status, message, is_change, account
     FROM status_history
+    WHERE ? IS NULL OR account = ?
     ORDER BY id DESC
     LIMIT ?
-    ''', (limit,))
-    
-    rows = cursor.fetchall()
-    conn.close()
-    
-    return [dict(row) for row in rows]
+'''
 
-def get_chart_data(limit: int = 288) -> List[Dict[str, Any]]:
-    """Get data for the chart (approx 24h at 5min intervals = 288 points).
-    Order by timestamp ASC for the chart.
-    """
-    conn = sqlite3.connect(get_db_path())
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-    
-    # We want chronological order for the chart
-    cursor.execute('''
+CHART_DATA_SQL = '''
     SELECT timestamp, status, message
     FROM (
         SELECT timestamp, status, message
         FROM status_history
+        WHERE ? IS NULL OR account = ?
         ORDER BY id DESC
         LIMIT ?
     )
     ORDER BY timestamp ASC
-    ''', (limit,))
+'''
+
+# Timestamps are stored as "YYYY-MM-DD HH:MM:SS[.ffffff]", so text order is
+# time order. A month's incidents are the ones that started in it (a range on
+# idx_incidents_started) plus the ones still running when it began (a range
+# on idx_incidents_ended, NULL = still open)
+MONTH_INCIDENTS_SQL = '''
+    SELECT
+        (SELECT COUNT(*) FROM incidents
+         WHERE started_at >= :start AND started_at < :end AND (:account IS NULL OR account = :account))
+      + (SELECT COUNT(*) FROM incidents
+         WHERE ended_at > :start AND started_at < :start AND (:account IS NULL OR account = :account))
+      + (SELECT COUNT(*) FROM incidents
+         WHERE ended_at IS NULL AND started_at < :start AND (:account IS NULL OR account = :account))
+'''
+MTTR_SQL = '''
+    SELECT AVG(duration_seconds) FROM incidents
+    WHERE ended_at IS NOT NULL AND (? IS NULL OR started_at >= ?) AND (? IS NULL OR account = ?)
+'''
+# idx_incidents_duration read backwards: the first closed incident is the longest
+LONGEST_INCIDENT_SQL = '''
+    SELECT * FROM incidents
+    WHERE duration_seconds IS NOT NULL AND (? IS NULL OR started_at >= ?) AND (? IS NULL OR account = ?)
+    ORDER BY duration_seconds DESC
+    LIMIT 1
+'''
+LATEST_OPEN_INCIDENT_SQL = '''
+    SELECT * FROM incidents
+    WHERE ended_at IS NULL AND (? IS NULL OR account = ?)
+    ORDER BY id DESC
+    LIMIT 1
+'''
+
+# idx_status_history_status (status, id) answers this with one index seek
+LAST_OK_SQL = "SELECT id, timestamp FROM status_history WHERE status = 'OK' AND (? IS NULL OR account = ?) ORDER BY id DESC LIMIT 1"
+# Rows after the last OK by rowid range (ids grow with time)
+FIRST_AFTER_SQL = "SELECT timestamp FROM status_history WHERE id > ? AND (? IS NULL OR account = ?) ORDER BY id ASC LIMIT 1"
+FIRST_ROW_SQL = "SELECT timestamp FROM status_history WHERE ? IS NULL OR account = ? ORDER BY id ASC LIMIT 1"
+
+
+# Most points a chart series may have: the finest resolution under it is used
+CHART_MAX_POINTS = 1500
+
+
+def _rollup_series_sql(table: str) -> str:
+    sums = ", ".join(f"SUM({column}) AS {column}" for column in ROLLUP_COLUMNS)
+    # (bucket, account) primary key: the range is one index search
+    return f'''
+    SELECT bucket, {sums}, SUM(transitions) AS transitions, MAX(worst_severity) AS worst_severity
+    FROM {table}
+    WHERE bucket >= ? AND bucket < ? AND (? IS NULL OR account = ?)
+    GROUP BY bucket
+    ORDER BY bucket
+    '''
+
+
+def chart_resolution(span: timedelta) -> str:
+    """Finest rollup resolution that covers ``span`` in at most ``CHART_MAX_POINTS`` buckets."""
+    for resolution, step in ROLLUP_STEPS.items():
+        if span / step <= CHART_MAX_POINTS:
+            return resolution
+    return "day"
+
+
+def get_chart_series(
+    hours: float = 24,
+    account: Optional[str] = None,
+    end: Optional[datetime] = None,
+) -> List[Dict[str, Any]]:
+    """Chart points of the last ``hours`` from the rollup tables.
+
+    Each point is one bucket of the resolution picked by ``chart_resolution``
+    (minute up to a day, hour up to two months, day beyond): its worst
+    status, transitions and seconds per status. Buckets without history are
+    left out. The status of the latest row is counted once the next one is
+    written (at most a heartbeat later).
+
+    Args:
+        hours: Length of the range ending at ``end``.
+        account: Only this account (all accounts summed if None).
+        end: End of the range (now by default).
+    """
+    end = end or datetime.now()
+    start = end - timedelta(hours=hours)
+    resolution = chart_resolution(end - start)
+    worst = {severity: status for status, severity in STATUS_SEVERITY.items()}
+    rows = _query(
+        _rollup_series_sql(ROLLUP_TABLES[resolution]),
+        (str(_bucket_start(resolution, start)), str(end), account, account),
+    )
+    return [
+        {
+            "timestamp": row["bucket"],
+            "status": worst.get(row["worst_severity"], "UNKNOWN"),
+            "resolution": resolution,
+            "transitions": row["transitions"],
+            "seconds": {
+                status: row[column] for status, column in zip(ROLLUP_STATUSES, ROLLUP_COLUMNS) if row[column]
+            },
+        }
+        for row in rows
+    ]
+
+
+def get_recent_history(limit: int = 50, account: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Get the most recent N history entries (optionally of one account)."""
+    return [dict(row) for row in _query(RECENT_HISTORY_SQL, (account, account, limit))]
+
+def get_chart_data(limit: int = 288, account: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Get data for the chart (approx 24h at 5min intervals = 288 points).
+    Order by timestamp ASC for the chart.
+    """
+    # We want chronological order for the chart
+    return [dict(row) for row in _query(CHART_DATA_SQL, (account, account, limit))]
+
+def _month_bounds(year: int, month: int) -> tuple[str, str]:
+    """[start, end) of a month as timestamp column prefixes."""
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return f"{year:04d}-{month:02d}-01", f"{next_year:04d}-{next_month:02d}-01"
+
+def get_monthly_incident_count(year: int = None, month: int = None, account: Optional[str] = None) -> int:
+    """Cuenta el número de incidentes del mes.
     
-    rows = cursor.fetchall()
-    conn.close()
+    Un incidente es un grupo de estados de error consecutivos entre OK y OK.
+    Por ejemplo: OK → ERROR → ERROR → SYNC → OK = 1 incidente (no 3)
+    
+    Solo estados de error cuentan para iniciar/continuar un incidente
+    (``INCIDENT_STATES``). Un incidente que sigue abierto al comenzar el mes
+    también cuenta. Se leen de la tabla incidents, mantenida al escribir el
+    historial.
+    """
+    if year is None or month is None:
+        now = datetime.now()
+        year = now.year
+        month = now.month
     
-    return [dict(row) for row in rows]
+    try:
+        start, end = _month_bounds(year, month)
+        rows = _query(MONTH_INCIDENTS_SQL, {"start": start, "end": end, "account": account})
+        return rows[0][0] if rows else 0
+    except Exception:
+        return 0
+
+def get_mttr(since: Optional[datetime] = None, account: Optional[str] = None) -> Optional[float]:
+    """Mean time to recovery in seconds of the incidents closed so far.
 
-def get_outage_start_time() -> Optional[datetime]:
+    Args:
+        since: Only incidents that started at or after this time.
+        account: Only incidents of this account (all accounts if None).
+
+    Returns:
+        None if no incident has been closed.
+    """
+    try:
+        since_text = str(since) if since is not None else None
+        rows = _query(MTTR_SQL, (since_text, since_text, account, account))
+        return rows[0][0] if rows else None
+    except Exception as e:
+        logger.error(f"DB Error calculating MTTR: {e}")
+        return None
+
+def get_longest_incident(since: Optional[datetime] = None, account: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The closed incident with the longest duration (see ``get_mttr`` for the arguments)."""
+    try:
+        since_text = str(since) if since is not None else None
+        rows = _query(LONGEST_INCIDENT_SQL, (since_text, since_text, account, account))
+        return dict(rows[0]) if rows else None
+    except Exception as e:
+        logger.error(f"DB Error reading the longest incident: {e}")
+        return None
+
+def get_open_incident(account: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """The incident still in progress (the latest one if several accounts have one)."""
+    try:
+        rows = _query(LATEST_OPEN_INCIDENT_SQL, (account, account))
+        return dict(rows[0]) if rows else None
+    except Exception as e:
+        logger.error(f"DB Error reading the open incident: {e}")
+        return None
+
+def get_outage_start_time(account: Optional[str] = None) -> Optional[datetime]:
     """Calculate the start time of the current outage based on DB history.
+
+    Args:
+        account: Only consider rows of this account (all rows if None).
     
     Returns:
         Datetime of the first non-OK status after the last OK status.
         If system has never been OK, returns the first recorded timestamp.
         Returns None if the system was recently OK (no outage found in DB terms).
     """
-    conn = sqlite3.connect(get_db_path())
-    cursor = conn.cursor()
-    
     try:
-        # 1. Find last OK timestamp
-        cursor.execute("SELECT timestamp FROM status_history WHERE status = 'OK' ORDER BY id DESC LIMIT 1")
-        last_ok_row = cursor.fetchone()
+        # 1. Find last OK row
+        last_ok_rows = _query(LAST_OK_SQL, (account, account))
         
-        last_ok_ts = None
-        if last_ok_row:
-             # SQLite stores as string usually if not parsed. Default adapter might return string.
-             # We should ensure we handle parsing.
-             # But let's assume standard ISO string or datetime if parsed.
-             # Safety: Use the string in the next query directly?
-             last_ok_ts = last_ok_row[0]
-
-        if last_ok_ts:
+        if last_ok_rows:
             # 2. Find first bad record AFTER last OK
-            cursor.execute("SELECT timestamp FROM status_history WHERE timestamp > ? ORDER BY id ASC LIMIT 1", (last_ok_ts,))
-            first_bad_row = cursor.fetchone()
-            if first_bad_row:
-                 return _parse_db_datetime(first_bad_row[0])
+            last_ok_id = last_ok_rows[0]["id"]
+            first_bad_rows = _query(FIRST_AFTER_SQL, (last_ok_id, account, account))
+            if first_bad_rows:
+                 return _parse_db_datetime(first_bad_rows[0][0])
             else:
                  # No bad records after OK? Then we are not aware of an outage in DB history yet.
                  return None
         else:
             # 3. No OK ever found. Return the very first record.
-            cursor.execute("SELECT timestamp FROM status_history ORDER BY id ASC LIMIT 1")
-            first_row = cursor.fetchone()
-            if first_row:
-                return _parse_db_datetime(first_row[0])
+            first_rows = _query(FIRST_ROW_SQL, (account, account))
+            if first_rows:
+                return _parse_db_datetime(first_rows[0][0])
             return None
             
     except Exception as e:
-        print(f"DB Error calculating outage start: {e}")
+        logger.error(f"DB Error calculating outage start: {e}")
         return None
-    finally:
-        conn.close()
 
 def _parse_db_datetime(ts_val: Any) -> datetime:
     """Helper to parse datetime from DB."""
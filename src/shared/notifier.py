@@ -64,9 +64,9 @@ logger = logging.getLogger(__name__)
 class Notifier:
     """Handles sending notifications through multiple channels."""
     
-    def __init__(self):
+    def __init__(self, account: Optional[str] = None):
         self.config = get_config().notifications
-        self._account = get_config().target.email
+        self._account = account or get_config().target.email
         self._last_notification_time: Optional[datetime] = None
 
     def _in_cooldown(self) -> bool:
@@ -20,6 +20,58 @@ class OneDriveStatus(str, Enum):
     UNKNOWN = "UNKNOWN"  # Unknown/unrecognized status
 
 
+# Worst first: ranks hosts in the fleet view and the statuses of an incident
+STATUS_SEVERITY = {
+    OneDriveStatus.AUTH_REQUIRED.value: 7,
+    OneDriveStatus.NOT_RUNNING.value: 6,
+    OneDriveStatus.ERROR.value: 5,
+    OneDriveStatus.NOT_FOUND.value: 4,
+    OneDriveStatus.PAUSED.value: 3,
+    OneDriveStatus.SYNCING.value: 2,
+    OneDriveStatus.UNKNOWN.value: 1,
+    OneDriveStatus.OK.value: 0,
+}
+
+
+class SyncDiagnosticsSnapshot(BaseModel):
+    """Latest block parsed from OneDrive's SyncDiagnostics.log."""
+
+    utc_now: Optional[str] = None  # UtcNow
+    sync_progress_state: Optional[int] = None  # SyncProgressState
+    files_to_upload: Optional[int] = None  # FilesToUpload
+    files_to_download: Optional[int] = None  # FilesToDownload
+    bytes_to_upload: Optional[int] = None  # BytesToUpload
+    bytes_to_download: Optional[int] = None  # BytesToDownload
+    auth_indicator: Optional[str] = None  # Auth marker seen in the recent log window
+    blocks_parsed: int = 0
+    extra: dict[str, str] = {}  # Any other Key = Value pairs of the block
+
+
+class ProbeMetricsSnapshot(BaseModel):
+    """Latency histogram and counters of one validation since monitor start."""
+
+    count: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    spawns: int = 0  # External processes started (PowerShell one-shots, Shell worker)
+    mean_ms: Optional[float] = None
+    p50_ms: Optional[float] = None  # Upper bound of the bucket holding the median
+    p95_ms: Optional[float] = None
+    max_ms: float = 0.0
+    buckets: dict[str, int] = {}
+
+
+class DbWriterSnapshot(BaseModel):
+    """Counters of the write-behind status history writer."""
+
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    rows_written: int = 0
+    batches_written: int = 0
+    rows_dropped: int = 0  # Queue full
+    errors: int = 0  # Failed batches (their rows are lost)
+
+
 class StatusReport(BaseModel):
     """Status report written to status.json."""
 
@@ -31,6 +83,23 @@ class StatusReport(BaseModel):
     process_running: bool
     message: Optional[str] = None
     out_of_sync_since: Optional[datetime] = None
+    sync_diagnostics: Optional[SyncDiagnosticsSnapshot] = None
+    # Elapsed seconds of a cycle that ran past monitor.cycle_budget_seconds
+    cycle_overrun_seconds: Optional[float] = None
+    # Probes that timed out or failed and reused an earlier result
+    stale_probes: list[str] = []
+    # Per-validation latency/error/timeout/spawn metrics of this process
+    probe_metrics: dict[str, ProbeMetricsSnapshot] = {}
+    # Status history writer queue and counters (commit latency: probe_metrics["db_commit"])
+    db_writer: Optional[DbWriterSnapshot] = None
 
     class Config:
         use_enum_values = True
+
+
+
+class FleetIngest(BaseModel):
+    """Batch of status reports pushed by one agent to the fleet collector."""
+
+    host: str
+    reports: list[StatusReport]
@@ -0,0 +1,203 @@
+"""Change-aware publication of status.json.
+
+The monitor used to rewrite status.json on every cycle (temp file, indented
+JSON, rename) even when only ``timestamp`` had moved, which churned the
+directory every few seconds and woke antivirus scanners and OneDrive itself.
+
+``StatusPublisher`` hashes the report without its volatile fields
+(``VOLATILE_FIELDS``, the per-block SyncDiagnostics counters and, for OK
+and SYNCING, the counter in parentheses of ``status_detail``) and only replaces
+status.json when that hash changes, or when the file is older than
+``max_age_seconds`` so the details and metrics in it stay reasonably current. Freshness lives in a small heartbeat record next
+to it (``status.heartbeat.json`` for ``status.json``), overwritten in place
+every cycle without creating or renaming files. ``read_status`` merges both
+for the dashboard.
+
+fsync policies (``monitor.status_fsync``):
+    always  : status.json rewrites and heartbeats are flushed to disk.
+    changes : only status.json rewrites are flushed (default).
+    never   : rely on the OS cache.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from src.shared.schemas import OneDriveStatus, StatusReport
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("always", "changes", "never")
+
+# Left out of the change hash: they move every cycle
+VOLATILE_FIELDS = {"timestamp", "probe_metrics", "db_writer"}
+# SyncDiagnostics.log values that change with every block OneDrive writes
+VOLATILE_SYNC_FIELDS = {"utc_now", "blocks_parsed", "extra"}
+# Statuses whose detail carries a per-cycle counter (canary age, probe phase);
+# any other detail names a cause and is hashed in full
+COUNTER_DETAIL_STATUSES = {OneDriveStatus.OK.value, OneDriveStatus.SYNCING.value}
+
+# The heartbeat is padded to this size so an in-place overwrite never
+# leaves a longer previous record behind
+HEARTBEAT_RECORD_SIZE = 128
+
+
+def heartbeat_path_for(status_path: Path) -> Path:
+    """Heartbeat record of a status file (``status.json`` -> ``status.heartbeat.json``)."""
+    return status_path.with_name(f"{status_path.stem}.heartbeat{status_path.suffix or '.json'}")
+
+
+def encode_report(report: StatusReport) -> bytes:
+    """Compact UTF-8 JSON of a report."""
+    return json.dumps(
+        report.model_dump(mode="json"), separators=(",", ":"), ensure_ascii=False, default=str
+    ).encode("utf-8")
+
+
+def detail_kind(status: str, detail: Optional[str]) -> Optional[str]:
+    """Status detail without its per-cycle counter.
+
+    For OK and SYNCING, "Activo (Sincronizado hace 12s)" and "Activo
+    (Sondeando...)" are both "Activo": the canary age and probe phase move
+    every cycle. Other details, e.g. "Pausado/Error (Error de sincronización)",
+    are returned whole.
+    """
+    if status not in COUNTER_DETAIL_STATUSES or not detail:
+        return detail
+    return detail.split(" (", 1)[0]
+
+
+def content_hash(report: StatusReport) -> str:
+    """Hash of the report without its volatile fields."""
+    exclude: dict[str, Any] = {field: True for field in VOLATILE_FIELDS}
+    exclude["sync_diagnostics"] = VOLATILE_SYNC_FIELDS
+    data = report.model_dump(mode="json", exclude=exclude)
+    data["status_detail"] = detail_kind(data["status"], data.get("status_detail"))
+    body = json.dumps(data, separators=(",", ":"), sort_keys=True, default=str)
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def write_atomic(data: bytes, path: Path, fsync: bool = False) -> None:
+    """Write ``data`` to ``path`` through a temp file and a rename.
+
+    Args:
+        data: File content.
+        path: Target file.
+        fsync: Flush the temp file to disk before the rename.
+    """
+    temp_fd, temp_path = tempfile.mkstemp(suffix=".json", dir=path.parent)
+    try:
+        with open(temp_fd, "wb") as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        # Atomic rename (works on same filesystem)
+        Path(temp_path).replace(path)
+    except Exception:
+        # Clean up temp file on error
+        with contextlib.suppress(FileNotFoundError):
+            Path(temp_path).unlink()
+        raise
+
+
+class StatusPublisher:
+    """Publishes the reports of one account to status.json and its heartbeat."""
+
+    def __init__(self, path: Path, fsync: str = "changes", max_age_seconds: float = 300) -> None:
+        """
+        Args:
+            path: status.json of the account.
+            fsync: One of ``FSYNC_POLICIES``.
+            max_age_seconds: Rewrite an unchanged status.json after this long
+                (0 = only on changes).
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"status_fsync debe ser uno de {FSYNC_POLICIES}: {fsync!r}")
+        self.path = Path(path)
+        self.heartbeat_path = heartbeat_path_for(self.path)
+        self.fsync = fsync
+        self.max_age_seconds = max_age_seconds
+        self.writes = 0
+        self.skipped = 0
+        self._hash: Optional[str] = None
+        self._written_at = 0.0
+        self._report_timestamp: Optional[str] = None
+        # The watchdog thread publishes overrun flags concurrently with the cycle
+        self._lock = threading.Lock()
+
+    def publish(self, report: StatusReport) -> bool:
+        """Publish one report.
+
+        Returns:
+            True if status.json was rewritten, False if only the heartbeat was.
+        """
+        digest = content_hash(report)
+        now = time.monotonic()
+        with self._lock:
+            rewrite = (
+                digest != self._hash
+                or not self.path.exists()
+                or (self.max_age_seconds > 0 and now - self._written_at >= self.max_age_seconds)
+            )
+            if rewrite:
+                write_atomic(encode_report(report), self.path, fsync=self.fsync != "never")
+                self._hash = digest
+                self._written_at = now
+                self._report_timestamp = report.timestamp.isoformat()
+                self.writes += 1
+                logger.debug(f"Status written to {self.path}")
+            else:
+                self.skipped += 1
+            self._beat(report.timestamp)
+        return rewrite
+
+    def _beat(self, timestamp: datetime) -> None:
+        record = json.dumps(
+            {"timestamp": timestamp.isoformat(), "status_timestamp": self._report_timestamp},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        record = record.ljust(HEARTBEAT_RECORD_SIZE - 1) + b"\n"
+        # Overwritten in place: no temp file, no rename, no directory change
+        fd = os.open(self.heartbeat_path, os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            os.write(fd, record)
+            os.ftruncate(fd, len(record))
+            if self.fsync == "always":
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def read_heartbeat(status_path: Path) -> Optional[dict[str, Any]]:
+    """Heartbeat record of a status file, or None if missing or unreadable."""
+    try:
+        return json.loads(heartbeat_path_for(Path(status_path)).read_text(encoding="utf-8").strip())
+    except (OSError, ValueError):
+        return None
+
+
+def read_status(status_path: Path) -> dict[str, Any]:
+    """status.json with ``timestamp`` refreshed from its heartbeat.
+
+    ``status_timestamp`` keeps when the body itself was last written.
+
+    Raises:
+        OSError: If status.json cannot be read.
+        ValueError: If it is not valid JSON.
+    """
+    with open(status_path, encoding="utf-8") as f:
+        data = json.load(f)
+    heartbeat = read_heartbeat(status_path)
+    if heartbeat and heartbeat.get("timestamp", "") > data.get("timestamp", ""):
+        data["status_timestamp"] = data.get("timestamp")
+        data["timestamp"] = heartbeat["timestamp"]
+    return data
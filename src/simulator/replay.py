@@ -0,0 +1,166 @@
+"""Replay of recorded observation traces on a virtual clock.
+
+A trace written by ``ObservationRecorder`` holds what the probes saw in
+every cycle. ``replay`` feeds it, account by account, into a fresh
+``RemediationAction`` whose clock is set to each observation's timestamp
+instead of waiting: the persistence thresholds, cooldowns, hourly restart
+limit and ``get_notification_action`` rules run exactly as in the monitor,
+at thousands of times real speed. Restarts are recorded, not executed;
+notifications are recorded, not sent.
+
+By default the status of each cycle is resolved again from the raw probe
+values (``resolve_status``), so a change to the precedence rules can be
+checked against a customer's trace; ``resolve=False`` replays the statuses
+as they were reported.
+"""
+
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+from src.monitor.probes import resolve_status
+from src.monitor.recorder import Observation, read_trace
+from src.monitor.remediator import RemediationAction
+from src.shared.schemas import OneDriveStatus
+from src.simulator.runner import RecordedNotification, RecordingNotifier
+
+
+class VirtualClock:
+    """Time source moved by the replay instead of the wall clock."""
+
+    def __init__(self, t: float = 0.0) -> None:
+        self.t = t
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self.t)
+
+
+class Transition(NamedTuple):
+    """Status change seen during the replay."""
+
+    at: float  # Seconds since the first observation of the account
+    previous: Optional[OneDriveStatus]
+    status: OneDriveStatus
+
+
+class ReplayResult(NamedTuple):
+    """Decisions of the remediator over one account's trace."""
+
+    account: str
+    observations: int
+    span: float  # Trace seconds covered
+    elapsed: float  # Real seconds the replay took
+    transitions: list[Transition]
+    notifications: list[RecordedNotification]
+    restarts: list[float]  # Trace seconds at which a restart was triggered
+    mismatches: int  # Cycles whose re-resolved status differs from the recorded one
+
+    @property
+    def speedup(self) -> float:
+        """Trace seconds replayed per real second."""
+        return self.span / self.elapsed if self.elapsed > 0 else float("inf")
+
+
+def _resolve(observation: Observation) -> Optional[OneDriveStatus]:
+    """Status from the raw probe values, or None if the trace lacks them."""
+    if observation.registry is None or observation.process is None:
+        return None
+    if observation.registry and observation.process and observation.liveness is None:
+        return None
+    status, _, _ = resolve_status(
+        observation.registry,
+        observation.process,
+        bool(observation.tray_auth),
+        (observation.liveness or OneDriveStatus.UNKNOWN, observation.liveness_detail),
+        bool(observation.auth_window),
+    )
+    return status
+
+
+def replay(observations: Iterable[Observation], account: str, resolve: bool = True) -> ReplayResult:
+    """Drive a fresh remediator with one account's observations.
+
+    Args:
+        observations: Observations of ``account`` in recorded order.
+        account: Email used for the remediator and its notifier.
+        resolve: Re-resolve each status from the raw probe values.
+    """
+    clock = VirtualClock()
+    start: Optional[float] = None
+    restarts: list[float] = []
+    transitions: list[Transition] = []
+
+    def trace_seconds() -> float:
+        return round(clock.t - start, 3) if start is not None else 0.0
+
+    notifier = RecordingNotifier(account, trace_seconds)
+    remediator = RemediationAction(
+        account=account,
+        notifier=notifier,
+        restart_onedrive=lambda: restarts.append(trace_seconds()),
+        clock=clock.now,
+    )
+
+    count = mismatches = 0
+    last_status: Optional[OneDriveStatus] = None
+    out_of_sync_since: Optional[datetime] = None
+    begin = time.perf_counter()
+    for observation in observations:
+        count += 1
+        clock.t = observation.t
+        if start is None:
+            start = observation.t
+
+        status = observation.status
+        if resolve:
+            resolved = _resolve(observation)
+            if resolved is not None:
+                mismatches += resolved != status
+                status = resolved
+
+        # Same outage tracking as AccountMonitor.run_cycle
+        if status == OneDriveStatus.OK:
+            out_of_sync_since = None
+        elif out_of_sync_since is None:
+            out_of_sync_since = clock.now()
+
+        if status != last_status:
+            transitions.append(Transition(trace_seconds(), last_status, status))
+            last_status = status
+        remediator.act(status, outage_start_time=out_of_sync_since, sync_snapshot=observation.sync_snapshot())
+
+    return ReplayResult(
+        account=account,
+        observations=count,
+        span=trace_seconds(),
+        elapsed=time.perf_counter() - begin,
+        transitions=transitions,
+        notifications=notifier.sent,
+        restarts=restarts,
+        mismatches=mismatches,
+    )
+
+
+def replay_trace(path: Path, account: Optional[str] = None, resolve: bool = True) -> dict[str, ReplayResult]:
+    """Replay every account of a trace file (or only ``account``)."""
+    by_account: dict[str, list[Observation]] = {}
+    for observation in read_trace(path, account):
+        by_account.setdefault(observation.account, []).append(observation)
+    return {email: replay(observations, email, resolve) for email, observations in by_account.items()}
+
+
+def summarize(result: ReplayResult) -> str:
+    """Multi-line text report of a replay."""
+    lines = [
+        f"{result.account}: {result.observations} ciclos, {result.span / 3600:.1f} h de traza "
+        f"reproducidas en {result.elapsed:.3f} s ({result.speedup:,.0f}x)",
+        f"  Cambios de estado : {len(result.transitions)}",
+        f"  Reinicios         : {len(result.restarts)}"
+        + (f" (en {', '.join(f'{t:.0f}s' for t in result.restarts[:10])})" if result.restarts else ""),
+        f"  Notificaciones    : {len(result.notifications)}",
+    ]
+    lines += [f"    {n.at:10.0f}s {n.level:<7} {n.subject}" for n in result.notifications[:50]]
+    if result.mismatches:
+        lines.append(f"  Estados distintos al re-evaluar: {result.mismatches}")
+    return "\n".join(lines)
@@ -0,0 +1,268 @@
+"""Runs the real monitor pipeline against a ``SimulatedOneDrive``.
+
+``SimulationRunner`` wires the twin into an unmodified ``AccountMonitor``:
+checker probes, status.json, the SQLite history, the remediator (whose
+restart relaunches the simulated client) and the notification decisions
+(recorded instead of sent). It then plays a ``Scenario`` cycle by cycle
+and reports what the monitor saw and how long each detection took.
+
+Monitor time can be compressed with ``time_scale``: with 0.05 a 480 s
+scenario runs in 24 s. Event times, the check interval, liveness timeouts,
+persistence and cooldown thresholds are all multiplied by it; reported
+times are converted back to monitor seconds.
+"""
+
+import logging
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+from src.monitor.recorder import ObservationRecorder
+from src.monitor.remediator import RemediationAction
+from src.monitor.watchdog import CycleWatchdog
+from src.shared import database
+from src.shared.config import (
+    AlertingConfig,
+    AppConfig,
+    MonitorConfig,
+    NotificationConfig,
+    get_config,
+    set_config,
+)
+from src.shared.notifier import Notifier
+from src.shared.schemas import OneDriveStatus
+from src.simulator.scenario import Scenario, ScenarioEvent
+from src.simulator.twin import SimulatedOneDrive
+
+logger = logging.getLogger(__name__)
+
+
+class RecordedNotification(NamedTuple):
+    """A notification the monitor decided to send."""
+
+    at: float  # Monitor seconds since the scenario started
+    subject: str
+    level: str
+
+
+class TimelineEntry(NamedTuple):
+    """Status reported by one monitor cycle."""
+
+    at: float
+    status: OneDriveStatus
+    detail: Optional[str]
+    cycle_seconds: float
+
+
+class Detection(NamedTuple):
+    """How long the monitor took to report the status expected after an event."""
+
+    event: str
+    at: float
+    expected: OneDriveStatus
+    detected_at: Optional[float]  # None: never reported before the scenario ended
+
+    @property
+    def latency(self) -> Optional[float]:
+        return None if self.detected_at is None else round(self.detected_at - self.at, 1)
+
+
+class SimulationResult(NamedTuple):
+    """Outcome of one scenario run (all times in monitor seconds)."""
+
+    scenario: str
+    timeline: list[TimelineEntry]
+    notifications: list[RecordedNotification]
+    detections: list[Detection]
+    restarts: int
+    final_status: Optional[OneDriveStatus]
+    expect_final: Optional[OneDriveStatus]
+
+    @property
+    def cycle_seconds(self) -> list[float]:
+        """Wall-clock duration of every cycle (real seconds, not scaled)."""
+        return [entry.cycle_seconds for entry in self.timeline]
+
+    @property
+    def passed(self) -> bool:
+        """Every expected status was detected and the final status matches."""
+        if any(d.detected_at is None for d in self.detections):
+            return False
+        return self.expect_final is None or self.final_status == self.expect_final
+
+
+class RecordingNotifier(Notifier):
+    """Notifier that records every notification instead of sending it.
+
+    Channel settings and the notifier cooldown are ignored: the record is
+    what the remediator asked to send.
+    """
+
+    def __init__(self, account: Optional[str], clock: Callable[[], float]) -> None:
+        super().__init__(account)
+        self._clock = clock
+        self.sent: list[RecordedNotification] = []
+
+    def notify(self, subject: str, message: str, level: str = "WARNING", email_html: str = None):
+        self.sent.append(RecordedNotification(round(self._clock(), 1), subject, level))
+        logger.info(f"Simulador: notificación '{subject}' ({level})")
+
+
+class SimulationRunner:
+    """Plays scenarios through the monitor, remediator and notifier."""
+
+    def __init__(
+        self,
+        workdir: Optional[Path] = None,
+        time_scale: float = 1.0,
+        check_interval: float = 15.0,
+        sync_delay: float = 5.0,
+        background_processes: int = 200,
+        record_observations: Optional[Path] = None,
+    ) -> None:
+        """
+        Args:
+            workdir: Directory for the simulated profile, status.json and DB
+                (a temporary directory if None).
+            time_scale: Real seconds per monitor second (0.05 = 20x faster).
+            check_interval: Monitor seconds between cycles.
+            sync_delay: Monitor seconds the client takes to upload the canary.
+            background_processes: Unrelated processes in the fake process table.
+            record_observations: Trace file for the raw probe observations
+                (timestamps are real time, not monitor time).
+        """
+        if time_scale <= 0:
+            raise ValueError("time_scale must be positive")
+        self.workdir = Path(workdir) if workdir is not None else Path(tempfile.mkdtemp(prefix="onedrive_sim_"))
+        self.time_scale = time_scale
+        self.check_interval = check_interval
+        self.sync_delay = sync_delay
+        self.background_processes = background_processes
+        self.record_observations = record_observations
+
+    def _scaled(self, seconds: float) -> float:
+        return seconds * self.time_scale
+
+    def _build_config(self, twin: SimulatedOneDrive, run_dir: Path) -> AppConfig:
+        return AppConfig(
+            targets=[twin.target()],
+            monitor=MonitorConfig(
+                status_file=str(run_dir / "status.json"),
+                shell_worker_enabled=False,
+                placeholder_provider="native",
+                syncing_restart_timeout_seconds=max(1, round(self._scaled(300))),
+            ),
+            alerting=AlertingConfig(enabled=False),
+            notifications=NotificationConfig(
+                enabled=False,
+                failed_remediation_delay_seconds=max(1, round(self._scaled(300))),
+            ),
+        )
+
+    def _scale_remediator(self, remediator: RemediationAction) -> None:
+        remediator.COOLDOWN_SECONDS = self._scaled(remediator.COOLDOWN_SECONDS)
+        remediator.DEFAULT_PERSISTENCE = self._scaled(remediator.DEFAULT_PERSISTENCE)
+        remediator.PERSISTENCE_BY_STATUS = {
+            status: self._scaled(seconds) for status, seconds in remediator.PERSISTENCE_BY_STATUS.items()
+        }
+
+    def run(self, scenario: Scenario) -> SimulationResult:
+        """Play ``scenario`` and return what the monitor reported."""
+        run_dir = self.workdir / f"{scenario.name}_{datetime.now():%Y%m%d_%H%M%S_%f}"
+        twin = SimulatedOneDrive(
+            run_dir / "profile",
+            sync_delay=self._scaled(self.sync_delay),
+            background_processes=self.background_processes,
+        )
+        previous_db = database.DB_NAME
+        set_config(self._build_config(twin, run_dir))
+        database.DB_NAME = str(run_dir / "onedrive_monitor.db")
+        try:
+            database.init_db(default_account=twin.email)
+            return self._play(scenario, twin, run_dir)
+        finally:
+            database.close_pools()
+            database.DB_NAME = previous_db
+            # The simulation config must not leak: config.yaml is reloaded on next use
+            set_config(None)
+
+    def _play(self, scenario: Scenario, twin: SimulatedOneDrive, run_dir: Path) -> SimulationResult:
+        from src.monitor.machine import MachineObservations
+        from src.monitor.main import AccountMonitor
+
+        started = time.monotonic()
+
+        def clock() -> float:
+            """Monitor seconds since the scenario started."""
+            return (time.monotonic() - started) / self.time_scale
+
+        machine = MachineObservations(
+            twin.registry,
+            process_iter=twin.process_iter,
+            get_process=twin.get_process,
+            placeholder_provider=twin.placeholder_provider,
+            auth_window_source=twin.auth_window_titles,
+            tray_auth_source=twin.tray_auth_output,
+        )
+        recorder = ObservationRecorder(self.record_observations) if self.record_observations else None
+        account = AccountMonitor(twin.target(), run_dir / "status.json", machine, recorder=recorder)
+        account.checker.LIVENESS_PROBE_INTERVAL = self._scaled(account.checker.LIVENESS_PROBE_INTERVAL)
+        account.checker.LIVENESS_SYNC_TIMEOUT = self._scaled(account.checker.LIVENESS_SYNC_TIMEOUT)
+        notifier = RecordingNotifier(twin.email, clock)
+        account.remediator = RemediationAction(account=twin.email, notifier=notifier, restart_onedrive=twin.restart)
+        self._scale_remediator(account.remediator)
+        watchdog = CycleWatchdog(get_config().monitor.cycle_budget_seconds, account.flag_overrun)
+
+        events = sorted(scenario.events, key=lambda e: e.at)
+        applied: list[tuple[float, ScenarioEvent]] = []
+        timeline: list[TimelineEntry] = []
+        try:
+            while clock() < scenario.duration:
+                while events and events[0].at <= clock():
+                    event = events.pop(0)
+                    value = self._scaled(event.value) if event.action == "slow_sync" else event.value
+                    twin.apply(event.action, value)
+                    applied.append((round(clock(), 1), event))
+                twin.tick()
+
+                cycle_start = time.perf_counter()
+                watchdog.begin_cycle()
+                machine.begin_cycle()
+                try:
+                    account.run_cycle(watchdog)
+                except Exception as e:
+                    logger.error(f"Simulador: error en el ciclo de {twin.email}: {e}", exc_info=True)
+                watchdog.end_cycle()
+                elapsed = time.perf_counter() - cycle_start
+
+                report = account.last_report
+                if report is not None:
+                    timeline.append(TimelineEntry(round(clock(), 1), OneDriveStatus(report.status), report.status_detail, elapsed))
+                time.sleep(max(0.0, self._scaled(self.check_interval) - elapsed))
+        finally:
+            account.close()
+            machine.close()
+            if recorder is not None:
+                recorder.close()
+
+        return SimulationResult(
+            scenario=scenario.name,
+            timeline=timeline,
+            notifications=notifier.sent,
+            detections=_detections(applied, timeline),
+            restarts=twin.restarts,
+            final_status=timeline[-1].status if timeline else None,
+            expect_final=scenario.expect_final,
+        )
+
+
+def _detections(applied: list[tuple[float, ScenarioEvent]], timeline: list[TimelineEntry]) -> list[Detection]:
+    detections = []
+    for at, event in applied:
+        if event.expect is None:
+            continue
+        detected_at = next((e.at for e in timeline if e.at >= at and e.status == event.expect), None)
+        detections.append(Detection(event.action, at, event.expect, detected_at))
+    return detections
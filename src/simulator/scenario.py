@@ -0,0 +1,111 @@
+"""Scripted timelines for the OneDrive simulator.
+
+A scenario is a list of actions applied to ``SimulatedOneDrive`` at given
+times (seconds of monitor time from the start), each optionally with the
+status the monitor is expected to report afterwards::
+
+    name: crash_restart
+    duration: 240
+    events:
+      - {at: 60, action: kill, expect: NOT_RUNNING}
+
+Scenarios load from YAML or JSON files (``Scenario.load``) or come from
+``BUILTIN_SCENARIOS``.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+from pydantic import BaseModel, field_validator
+
+from src.shared.schemas import OneDriveStatus
+from src.simulator.twin import ACTIONS
+
+
+class ScenarioEvent(BaseModel):
+    """One action of a scenario timeline."""
+
+    # Seconds of monitor time since the scenario started
+    at: float
+    # SimulatedOneDrive action (kill, pause, sign_out...)
+    action: str
+    # Argument of the action (files for upload, seconds for slow_sync)
+    value: Optional[Any] = None
+    # Status the monitor should detect after this event
+    expect: Optional[OneDriveStatus] = None
+
+    @field_validator("action")
+    @classmethod
+    def _known_action(cls, action: str) -> str:
+        if action not in ACTIONS:
+            raise ValueError(f"unknown action {action!r} (valid: {', '.join(ACTIONS)})")
+        return action
+
+
+class Scenario(BaseModel):
+    """A named timeline of simulator events."""
+
+    name: str
+    description: str = ""
+    # Seconds of monitor time the scenario runs
+    duration: float
+    events: list[ScenarioEvent] = []
+    # Status expected in the last cycle (None: not checked)
+    expect_final: Optional[OneDriveStatus] = None
+
+    @classmethod
+    def load(cls, path: Path) -> "Scenario":
+        """Load a scenario from a .yaml/.yml or .json file."""
+        text = Path(path).read_text(encoding="utf-8")
+        data = json.loads(text) if Path(path).suffix == ".json" else yaml.safe_load(text)
+        return cls.model_validate(data)
+
+
+BUILTIN_SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario(
+            name="healthy",
+            description="Cliente sano con una carga de archivos; sin incidentes",
+            duration=240,
+            events=[ScenarioEvent(at=30, action="upload", value=200)],
+            expect_final=OneDriveStatus.OK,
+        ),
+        Scenario(
+            name="pause_resume",
+            description="Sincronización pausada; el monitor la detecta y el reinicio la reanuda",
+            duration=480,
+            events=[ScenarioEvent(at=30, action="pause", expect=OneDriveStatus.PAUSED)],
+            expect_final=OneDriveStatus.OK,
+        ),
+        Scenario(
+            name="crash_restart",
+            description="OneDrive.exe termina inesperadamente y el monitor lo reinicia",
+            duration=240,
+            events=[ScenarioEvent(at=30, action="kill", expect=OneDriveStatus.NOT_RUNNING)],
+            expect_final=OneDriveStatus.OK,
+        ),
+        Scenario(
+            name="auth_expired",
+            description="Credenciales caducadas; el reinicio no lo resuelve hasta que el usuario inicia sesión",
+            duration=480,
+            events=[
+                ScenarioEvent(at=30, action="sign_out", expect=OneDriveStatus.AUTH_REQUIRED),
+                ScenarioEvent(at=300, action="sign_in", expect=OneDriveStatus.OK),
+            ],
+            expect_final=OneDriveStatus.OK,
+        ),
+        Scenario(
+            name="signed_out",
+            description="Cuenta desvinculada del cliente (registro) y vuelta a vincular",
+            duration=300,
+            events=[
+                ScenarioEvent(at=30, action="remove_account", expect=OneDriveStatus.NOT_FOUND),
+                ScenarioEvent(at=180, action="add_account", expect=OneDriveStatus.OK),
+            ],
+            expect_final=OneDriveStatus.OK,
+        ),
+    )
+}
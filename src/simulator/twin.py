@@ -0,0 +1,326 @@
+"""Digital twin of a OneDrive for Business client, for Linux benchmarks and tests.
+
+``SimulatedOneDrive`` emulates everything the monitor observes on a Windows
+machine, backed by a temporary directory instead of the real client:
+
+* a fake process table (``OneDrive.exe /background`` with pid and create_time)
+  plugged into ``MachineObservations`` as ``process_iter``/``get_process``,
+* the OneDrive account registry (``InMemoryRegistryProvider``),
+* the account folder where the monitor writes its canary, whose placeholder
+  attribute bits flip to a synced reparse point once the client has been
+  healthy (running, signed in, not paused, registered) for ``sync_delay``
+  seconds after the write; a file synced before a crash stays synced,
+* a SyncDiagnostics.log that gets a new block on every ``tick()`` and an
+  auth marker while signed out, rotated (new file) whenever the client starts,
+* sign-in windows for the auth window and tray probes.
+
+State changes (``kill``, ``pause``, ``sign_out``...) are applied by the
+scenario runner on its timeline, or by the remediator through ``restart``.
+"""
+
+import itertools
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+import psutil
+
+from src.monitor.placeholder import FILE_ATTRIBUTE_REPARSE_POINT, PlaceholderProvider
+from src.monitor.registry_index import InMemoryRegistryProvider
+from src.shared.config import TargetConfig
+
+logger = logging.getLogger(__name__)
+
+FILE_ATTRIBUTE_ARCHIVE = 0x20
+
+# Title of the OneDrive sign-in window (matched by the auth window probe)
+SIGN_IN_WINDOW_TITLE = "Microsoft OneDrive - Iniciar sesión"
+
+# Actions a scenario timeline can apply (see ``SimulatedOneDrive.apply``)
+ACTIONS = (
+    "start", "kill", "restart", "pause", "resume", "sign_out", "sign_in",
+    "remove_account", "add_account", "upload", "slow_sync",
+)
+
+
+class SimulatedProcess:
+    """psutil.Process look-alike of one OneDrive.exe instance."""
+
+    def __init__(self, pid: int, name: str, cmdline: list[str], create_time: float) -> None:
+        self.pid = pid
+        self.info = {"name": name}
+        self._cmdline = cmdline
+        self._create_time = create_time
+        self.alive = True
+
+    def _check(self) -> None:
+        if not self.alive:
+            raise psutil.NoSuchProcess(self.pid)
+
+    def cmdline(self) -> list[str]:
+        self._check()
+        return list(self._cmdline)
+
+    def create_time(self) -> float:
+        self._check()
+        return self._create_time
+
+    def is_running(self) -> bool:
+        return self.alive
+
+
+class TwinPlaceholderProvider(PlaceholderProvider):
+    """Canary attribute bits as the simulated client would leave them."""
+
+    name = "twin"
+
+    def __init__(self, twin: "SimulatedOneDrive") -> None:
+        self.twin = twin
+
+    def attributes(self, path: Path) -> int:
+        mtime = os.stat(path).st_mtime  # FileNotFoundError -> MISSING
+        if self.twin.has_synced(mtime):
+            return FILE_ATTRIBUTE_ARCHIVE | FILE_ATTRIBUTE_REPARSE_POINT
+        return FILE_ATTRIBUTE_ARCHIVE
+
+
+class SimulatedOneDrive:
+    """One simulated OneDrive for Business account and its client process."""
+
+    def __init__(
+        self,
+        root: Path,
+        email: str = "usuario@contoso.com",
+        tenant: str = "Contoso",
+        subkey: str = "Business1",
+        sync_delay: float = 1.0,
+        background_processes: int = 0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Args:
+            root: Directory holding the simulated user profile.
+            email: Account email (registry ``UserEmail``).
+            tenant: Organization name (folder ``OneDrive - <tenant>``).
+            subkey: Registry / log folder name of the account.
+            sync_delay: Seconds the client takes to upload the canary.
+            background_processes: Unrelated processes listed before
+                OneDrive.exe (process table size for benchmarks).
+            clock: Wall clock; the checker compares canary mtimes with
+                ``time.time()``, so only tests should change it.
+        """
+        self.root = Path(root)
+        self.email = email
+        self.tenant = tenant
+        self.subkey = subkey
+        self.sync_delay = sync_delay
+        self.clock = clock
+
+        self.folder = self.root / f"OneDrive - {tenant}"
+        appdata = self.root / "AppData" / "Local" / "Microsoft" / "OneDrive"
+        self.log_path = appdata / "logs" / subkey / "SyncDiagnostics.log"
+        self.settings_dir = appdata / "settings" / subkey
+        for directory in (self.folder, self.log_path.parent, self.settings_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+
+        self.registry = InMemoryRegistryProvider()
+        self.placeholder_provider = TwinPlaceholderProvider(self)
+
+        self.running = False
+        self.paused = False
+        self.signed_in = True
+        self.pending_uploads = 0
+        self.restarts = 0
+        # Healthy periods of the client: the current one and the last closed ones
+        self._healthy_since: Optional[float] = None
+        self._healthy_periods: deque = deque(maxlen=32)
+        self._process: Optional[SimulatedProcess] = None
+        self._pids = itertools.count(4000)
+        self._background = [
+            SimulatedProcess(100 + i, f"svchost{i}.exe", ["svchost.exe", "-k", "netsvcs"], 0.0)
+            for i in range(background_processes)
+        ]
+        self._blocks = 0
+        self._lock = threading.RLock()
+
+        self.add_account()
+        self.start()
+
+    def target(self) -> TargetConfig:
+        """Monitor target pointing at this account."""
+        return TargetConfig(email=self.email, folder=str(self.folder), log_path=str(self.log_path))
+
+    # --- Observations (plugged into MachineObservations) ---
+
+    def process_iter(self, attrs: Optional[list[str]] = None) -> Iterator[SimulatedProcess]:
+        with self._lock:
+            procs = list(self._background)
+            if self._process is not None:
+                procs.append(self._process)
+        return iter(procs)
+
+    def get_process(self, pid: int) -> SimulatedProcess:
+        with self._lock:
+            if self._process is not None and self._process.pid == pid:
+                return self._process
+        raise psutil.NoSuchProcess(pid)
+
+    def auth_window_titles(self) -> list[str]:
+        with self._lock:
+            return [SIGN_IN_WINDOW_TITLE] if self.running and not self.signed_in else []
+
+    def tray_auth_output(self) -> str:
+        with self._lock:
+            return f"AUTH_WINDOW:{SIGN_IN_WINDOW_TITLE}" if self.running and not self.signed_in else ""
+
+    def has_synced(self, mtime: float) -> bool:
+        """Would the client have uploaded a file written at ``mtime`` by now?"""
+        with self._lock:
+            periods = list(self._healthy_periods)
+            if self._healthy_since is not None:
+                periods.append((self._healthy_since, self.clock()))
+            return any(max(mtime, start) + self.sync_delay <= end for start, end in periods)
+
+    @property
+    def healthy(self) -> bool:
+        return self.running and self.signed_in and not self.paused and self.registered
+
+    def _update_health(self) -> None:
+        now = self.clock()
+        if self.healthy and self._healthy_since is None:
+            self._healthy_since = now
+        elif not self.healthy and self._healthy_since is not None:
+            self._healthy_periods.append((self._healthy_since, now))
+            self._healthy_since = None
+
+    @property
+    def registered(self) -> bool:
+        return self.subkey in self.registry.accounts
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process is not None else None
+
+    # --- SyncDiagnostics.log ---
+
+    def tick(self) -> None:
+        """Let the client work: drain uploads and append a diagnostics block."""
+        with self._lock:
+            if not self.running:
+                return
+            if not self.paused and self.signed_in and self.pending_uploads:
+                self.pending_uploads = max(0, self.pending_uploads - 10)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(self._diagnostics_block())
+
+    def _diagnostics_block(self) -> str:
+        self._blocks += 1
+        lines = [
+            f"UtcNow = {datetime.fromtimestamp(self.clock(), timezone.utc):%Y-%m-%dT%H:%M:%S}Z",
+            f"SyncProgressState = {0 if self.pending_uploads == 0 else 1}",
+            f"FilesToUpload = {self.pending_uploads}",
+            f"BytesToUpload = {self.pending_uploads * 65536}",
+            "FilesToDownload = 0",
+            "BytesToDownload = 0",
+            f"SyncPaused = {int(self.paused)}",
+        ]
+        if not self.signed_in:
+            lines.append("AuthState = ReauthRequired")
+        return "\n".join(lines) + "\n"
+
+    def _rotate_log(self) -> None:
+        # OneDrive starts a new log file: replace it so the tailer sees a new identity
+        tmp = self.log_path.with_suffix(".tmp")
+        tmp.write_text(self._diagnostics_block(), encoding="utf-8")
+        tmp.replace(self.log_path)
+
+    # --- Actions ---
+
+    def apply(self, action: str, value: Any = None) -> None:
+        """Apply a scenario action by name (``value``: its argument, if any)."""
+        if action not in ACTIONS:
+            raise ValueError(f"unknown simulator action {action!r} (valid: {', '.join(ACTIONS)})")
+        method = getattr(self, action)
+        if value is None:
+            method()
+        else:
+            method(value)
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running:
+                return
+            self._process = SimulatedProcess(
+                next(self._pids), "OneDrive.exe", ["OneDrive.exe", "/background"], self.clock()
+            )
+            self.running = True
+            self.paused = False
+            self._update_health()
+            self._rotate_log()
+        logger.info(f"Simulador: OneDrive.exe iniciado (PID {self.pid})")
+
+    def kill(self) -> None:
+        with self._lock:
+            if self._process is not None:
+                self._process.alive = False
+            self._process = None
+            self.running = False
+            self._update_health()
+        logger.info("Simulador: OneDrive.exe terminado")
+
+    def restart(self) -> None:
+        """What the remediator does: kill and relaunch (a sign-out survives it)."""
+        with self._lock:
+            self.kill()
+            self.start()
+            self.restarts += 1
+
+    def pause(self) -> None:
+        with self._lock:
+            self.paused = True
+            self._update_health()
+        logger.info("Simulador: sincronización pausada")
+
+    def resume(self) -> None:
+        with self._lock:
+            self.paused = False
+            self._update_health()
+        logger.info("Simulador: sincronización reanudada")
+
+    def sign_out(self) -> None:
+        with self._lock:
+            self.signed_in = False
+            self._update_health()
+        logger.info("Simulador: credenciales caducadas")
+
+    def sign_in(self) -> None:
+        with self._lock:
+            self.signed_in = True
+            self._update_health()
+            if self.running:
+                self._rotate_log()
+        logger.info("Simulador: sesión iniciada de nuevo")
+
+    def remove_account(self) -> None:
+        with self._lock:
+            self.registry.remove_account(self.subkey)
+            self._update_health()
+        logger.info(f"Simulador: cuenta {self.email} eliminada del registro")
+
+    def add_account(self) -> None:
+        with self._lock:
+            self.registry.set_account(self.subkey, {"UserEmail": self.email, "UserFolder": str(self.folder)})
+            self._update_health()
+
+    def upload(self, files: int = 100) -> None:
+        with self._lock:
+            self.pending_uploads += int(files)
+
+    def slow_sync(self, delay: float) -> None:
+        with self._lock:
+            self.sync_delay = float(delay)
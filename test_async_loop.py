@@ -0,0 +1,192 @@
+"""Tests for the asyncio monitor loop: async probes, window scans and fast shutdown."""
+
+import asyncio
+import sys
+import threading
+import time
+import types
+
+import psutil
+import pytest
+
+import src.monitor.main as monitor_main
+from src.monitor import machine as machine_module
+from src.monitor.checker import OneDriveChecker
+from src.monitor.fs_watcher import FileChangeWatcher
+from src.monitor.machine import MachineObservations
+from src.monitor.registry_index import InMemoryRegistryProvider
+from src.monitor.watchdog import CycleWatchdog, ProbeTimeoutError, run_with_deadline_async
+from src.shared import database
+from src.shared.config import TargetConfig
+from src.shared.schemas import OneDriveStatus
+
+HANG = [sys.executable, "-c", "import time; time.sleep(60)"]
+
+
+def new_children(before: set[int]) -> list[psutil.Process]:
+    return [p for p in psutil.Process().children(recursive=True)
+            if p.pid not in before and p.is_running() and p.status() != psutil.STATUS_ZOMBIE]
+
+
+def test_async_probe_output_and_deadline():
+    async def scenario():
+        result = await run_with_deadline_async([sys.executable, "-c", "print('Sign in')"], timeout=10)
+        assert (result.returncode, result.stdout.strip()) == (0, "Sign in")
+        with pytest.raises(ProbeTimeoutError):
+            await run_with_deadline_async(HANG, timeout=0.5, name="auth_window_check")
+
+    before = {p.pid for p in psutil.Process().children(recursive=True)}
+    asyncio.run(scenario())
+    assert new_children(before) == []
+
+
+def test_cancelled_async_probe_is_killed():
+    async def scenario():
+        task = asyncio.create_task(run_with_deadline_async(HANG, timeout=60))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    before = {p.pid for p in psutil.Process().children(recursive=True)}
+    asyncio.run(scenario())
+    assert new_children(before) == []
+
+
+def test_window_scans_start_concurrently_after_the_gates(monkeypatch, tmp_path):
+    # Each scan sleeps 0.5 s
+    spawned = []
+
+    def command(script):
+        spawned.append(script)
+        return [sys.executable, "-c",
+                "import time; time.sleep(0.5); print('LOGIN_WINDOW:Sign in' if 'LOGIN' in %r else 'Sign in')" % script]
+
+    monkeypatch.setattr(machine_module, "powershell_command", command)
+    machine = MachineObservations(InMemoryRegistryProvider({}), lambda attrs=None: [], psutil.Process)
+    checker = OneDriveChecker(target=TargetConfig(email="a@x.com", folder=str(tmp_path)), machine=machine)
+
+    def after_gates():
+        machine.begin_cycle()
+        machine.start_scans()
+        machine.start_scans()  # Next account of the same cycle
+        start = time.monotonic()
+        return machine.auth_window_titles(), machine.tray_auth_output(), time.monotonic() - start
+
+    async def scenario():
+        machine.loop = asyncio.get_running_loop()
+        # No OneDrive process: the cycle stops at the gates without spawning PowerShell
+        status, _, _ = await asyncio.to_thread(checker.get_full_status)
+        assert status is OneDriveStatus.NOT_RUNNING and spawned == []
+        return await asyncio.to_thread(after_gates)
+
+    try:
+        titles, tray, elapsed = asyncio.run(scenario())
+    finally:
+        machine.close()
+    assert titles == ["Sign in"] and tray == "LOGIN_WINDOW:Sign in"
+    assert elapsed < 0.95 and len(spawned) == 2
+
+
+def test_cycle_stopped_by_shutdown_writes_nothing(monkeypatch, tmp_path):
+    machine = MachineObservations(InMemoryRegistryProvider({}), lambda attrs=None: [], psutil.Process)
+    account = monitor_main.AccountMonitor(TargetConfig(email="a@x.com", folder=str(tmp_path)), tmp_path / "status.json", machine)
+    logged = []
+    monkeypatch.setattr(database, "log_status", lambda *args, **kwargs: logged.append(args))
+
+    def full_status():
+        machine.stopping.set()  # Shutdown arrives while the probes run
+        return OneDriveStatus.OK, True, "Activo"
+
+    monkeypatch.setattr(account.checker, "get_full_status", full_status)
+    try:
+        account.run_cycle(CycleWatchdog(60, lambda elapsed: None))
+    finally:
+        machine.close()
+    assert logged == [] and account.last_report is None
+    assert not (tmp_path / "status.json").exists()
+
+
+class FakeLoop:
+    """Stands in for MonitorLoop: the second cycle hangs like a wedged COM call."""
+
+    instances = []
+
+    def __init__(self):
+        self.machine = types.SimpleNamespace(loop=None)
+        self.watcher = None
+        self.cycles = 0
+        self.closed = False
+        self.stop_requested = False
+        self.in_cycle = threading.Event()
+        self.release = threading.Event()
+        FakeLoop.instances.append(self)
+
+    def restart_onedrive_on_startup(self):
+        return 0
+
+    def start(self):
+        pass
+
+    def run_cycle(self):
+        self.cycles += 1
+        if self.cycles == 2:
+            self.in_cycle.set()
+            self.release.wait(30)
+
+    def request_stop(self):
+        self.stop_requested = True
+
+    def next_wait(self):
+        return 0.05 if self.cycles == 1 else 3600
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.parametrize("hang_in_cycle", [False, True])
+def test_shutdown_completes_within_a_second(monkeypatch, hang_in_cycle):
+    monkeypatch.setattr(monitor_main, "MonitorLoop", FakeLoop)
+    FakeLoop.instances.clear()
+
+    async def scenario():
+        shutdown = asyncio.Event()
+        task = asyncio.create_task(monitor_main.run_monitor_async(shutdown))
+        while not FakeLoop.instances or not FakeLoop.instances[0].in_cycle.is_set():
+            await asyncio.sleep(0.02)
+        loop = FakeLoop.instances[0]
+        if not hang_in_cycle:
+            loop.release.set()  # The cycle finishes and the loop sleeps for an hour
+            await asyncio.sleep(0.1)
+        start = time.monotonic()
+        shutdown.set()
+        await task
+        return loop, time.monotonic() - start
+
+    loop, elapsed = asyncio.run(scenario())
+    loop.release.set()
+    assert elapsed < 1
+    assert loop.closed and loop.cycles == 2
+    assert loop.stop_requested == hang_in_cycle
+
+
+def test_watcher_wakes_async_waiter(tmp_path):
+    canary = tmp_path / "canary.txt"
+    watcher = FileChangeWatcher([canary], debounce_seconds=0.1)
+    if not watcher.start():
+        pytest.skip("No change-notification backend on this platform")
+
+    async def scenario():
+        waiter = asyncio.create_task(watcher.wait_async(10))
+        await asyncio.sleep(0.1)
+        canary.write_text("x")
+        start = time.monotonic()
+        woke = await waiter
+        return woke, time.monotonic() - start
+
+    try:
+        woke, elapsed = asyncio.run(scenario())
+        assert woke and elapsed < 2
+        assert asyncio.run(watcher.wait_async(0.1)) is False
+    finally:
+        watcher.close()
@@ -0,0 +1,144 @@
+"""Tests for the fleet collector: batched ingest, fleet views and agent push."""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.collector.main import create_app
+from src.collector.store import FleetStore
+from src.monitor.collector_client import CollectorPusher
+from src.shared.schemas import OneDriveStatus, StatusReport
+
+
+def report(email, status, since=None):
+    return StatusReport(
+        timestamp=datetime.now(),
+        account_email=email,
+        account_folder="C:\\OneDrive",
+        status=status,
+        process_running=True,
+        out_of_sync_since=since,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FleetStore(str(tmp_path / "fleet.db"), batch_size=2)
+
+
+def test_batch_writes_latest_and_changes_only(store):
+    store.enqueue("pc-1", [report("a@x.com", OneDriveStatus.OK)] * 3)
+    store.enqueue("pc-1", [report("a@x.com", OneDriveStatus.PAUSED)])
+    assert store.flush() == 4
+    assert store.batches_written == 2
+
+    detail = store.host_detail("pc-1")
+    assert [a["status"] for a in detail["accounts"]] == ["PAUSED"]
+    assert [h["status"] for h in detail["history"]] == ["PAUSED", "OK"]
+    assert store.host_detail("pc-unknown") is None
+
+
+def test_failed_batch_keeps_status_change_pending(store, monkeypatch):
+    store.enqueue("pc-1", [report("a@x.com", OneDriveStatus.OK)])
+    store.flush()
+
+    def broken_connect():
+        raise sqlite3.OperationalError("disk I/O error")
+
+    connect = store._connect
+    monkeypatch.setattr(store, "_connect", broken_connect)
+    store.enqueue("pc-1", [report("a@x.com", OneDriveStatus.PAUSED)])
+    with pytest.raises(sqlite3.OperationalError):
+        store.flush()
+
+    # The agent reports PAUSED again once the database is back: the change is still recorded
+    monkeypatch.setattr(store, "_connect", connect)
+    store.enqueue("pc-1", [report("a@x.com", OneDriveStatus.PAUSED)])
+    store.flush()
+    assert [h["status"] for h in store.host_detail("pc-1")["history"]] == ["PAUSED", "OK"]
+
+
+def test_writer_thread_drains_on_stop_and_counts_lost_batches(store, monkeypatch):
+    writers = []
+    write_batch = store._write_batch
+
+    def recording_write(batch):
+        writers.append(threading.current_thread().name)
+        write_batch(batch)
+
+    monkeypatch.setattr(store, "_write_batch", recording_write)
+    store.enqueue("pc-1", [report("a@x.com", OneDriveStatus.OK), report("a@x.com", OneDriveStatus.PAUSED)] * 3)
+    store.start()
+    store.stop()
+    assert store.reports_written == 6 and set(writers) == {"fleet-writer"}
+
+    def broken_connect():
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(store, "_connect", broken_connect)
+    store.enqueue("pc-1", [report("a@x.com", OneDriveStatus.OK)] * 3)
+    store.start()
+    store.stop()
+    assert store.reports_rejected == 3 and store.pending == 0
+
+
+def test_fleet_views_rank_worst_first(store):
+    long_ago = datetime.now() - timedelta(hours=3)
+    store.enqueue("pc-1", [report("a@x.com", OneDriveStatus.OK)])
+    store.enqueue("pc-2", [report("b@x.com", OneDriveStatus.SYNCING, datetime.now())])
+    store.enqueue("pc-3", [report("c@x.com", OneDriveStatus.AUTH_REQUIRED, datetime.now())])
+    store.enqueue("pc-4", [report("d@x.com", OneDriveStatus.AUTH_REQUIRED, long_ago)])
+    store.flush()
+
+    summary = store.summary()
+    assert summary["hosts"] == 4
+    assert summary["by_status"] == {"OK": 1, "SYNCING": 1, "AUTH_REQUIRED": 2}
+    assert [w["host"] for w in store.worst()] == ["pc-4", "pc-3", "pc-2"]
+
+
+def test_ingest_api_and_drill_down(store):
+    with TestClient(create_app(store)) as client:
+        body = {"host": "pc-9", "reports": [report("a@x.com", OneDriveStatus.NOT_RUNNING).model_dump(mode="json")]}
+        response = client.post("/api/ingest", json=body)
+        assert response.status_code == 202
+        assert response.json() == {"accepted": 1}
+        deadline = time.monotonic() + 5
+        while store.reports_written < 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert client.get("/api/fleet/summary").json()["by_status"] == {"NOT_RUNNING": 1}
+        assert client.get("/api/fleet/hosts/pc-9").json()["accounts"][0]["account_email"] == "a@x.com"
+        assert client.get("/api/fleet/hosts/nope").status_code == 404
+        assert client.get("/api/fleet/worst", params={"limit": 100_000}).status_code == 400
+        assert client.get("/api/fleet/hosts/pc-9", params={"limit": 0}).status_code == 400
+
+
+def test_pusher_keeps_reports_while_collector_is_down():
+    received = []
+    up = {"value": False}
+
+    def handler(request):
+        if not up["value"]:
+            raise httpx.ConnectError("down")
+        received.append(request)
+        return httpx.Response(202, json={"accepted": 1})
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    pusher = CollectorPusher("http://collector", host_name="pc-1", buffer_size=2, client=client)
+    try:
+        for status in (OneDriveStatus.OK, OneDriveStatus.PAUSED, OneDriveStatus.SYNCING):
+            pusher._pending.append(report("a@x.com", status))
+        assert not pusher.flush()
+        assert [r.status for r in pusher._pending] == ["PAUSED", "SYNCING"]
+
+        up["value"] = True
+        assert pusher.flush()
+        assert pusher.sent == 2 and not pusher._pending
+        assert b'"host":"pc-1"' in received[0].content
+    finally:
+        pusher.close()
@@ -0,0 +1,92 @@
+"""Tests for per-cycle probe memoization."""
+
+import threading
+import time
+
+import pytest
+
+from src.monitor.cycle_context import CycleContext, cycle_cached
+
+
+class FakeChecker:
+    def __init__(self):
+        self.cycle = None
+        self.calls = 0
+
+    @cycle_cached("auth_window_check")
+    def check_auth_window(self):
+        self.calls += 1
+        time.sleep(0.1)
+        return True
+
+    @cycle_cached("shell_status")
+    def shell_status(self, path):
+        self.calls += 1
+        return f"status:{path}"
+
+
+def test_repeated_calls_hit_cache():
+    checker = FakeChecker()
+    checker.cycle = CycleContext()
+
+    assert all(checker.check_auth_window() for _ in range(3))
+    assert checker.calls == 1
+    assert checker.cycle.hits["auth_window_check"] == 2
+    assert checker.cycle.miss_count == 1
+
+
+def test_arguments_are_part_of_key():
+    checker = FakeChecker()
+    checker.cycle = CycleContext()
+
+    assert checker.shell_status("a") == "status:a"
+    assert checker.shell_status("b") == "status:b"
+    assert checker.shell_status("a") == "status:a"
+    assert checker.calls == 2
+    assert checker.cycle.hits["shell_status"] == 1
+
+
+def test_concurrent_callers_share_in_flight_work():
+    checker = FakeChecker()
+    checker.cycle = CycleContext()
+    results = []
+
+    threads = [threading.Thread(target=lambda: results.append(checker.check_auth_window())) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == [True] * 4
+    assert checker.calls == 1
+    assert checker.cycle.hit_count == 3
+
+
+def test_new_cycle_and_no_cycle_are_uncached():
+    checker = FakeChecker()
+    checker.check_auth_window()
+    checker.check_auth_window()
+    assert checker.calls == 2
+
+    checker.cycle = CycleContext(1)
+    checker.check_auth_window()
+    checker.cycle = CycleContext(2)
+    checker.check_auth_window()
+    assert checker.calls == 4
+
+
+def test_errors_are_shared_and_seed_wins():
+    context = CycleContext()
+    calls = []
+
+    def boom():
+        calls.append(1)
+        raise OSError("powershell missing")
+
+    for _ in range(2):
+        with pytest.raises(OSError):
+            context.get("auth_window_check", boom)
+    assert len(calls) == 1
+
+    context.seed("sync_snapshot", "seeded")
+    assert context.get("sync_snapshot", lambda: "computed") == "seeded"
@@ -0,0 +1,86 @@
+"""Tests for the incidents table maintained as status rows are written."""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.shared import database
+
+T0 = datetime(2024, 3, 1, 10, 0, 0)
+
+
+def write(writer, account, *statuses, start=T0, step=15):
+    for i, status in enumerate(statuses):
+        writer.enqueue((start + timedelta(seconds=i * step), status, status, False, account))
+
+
+def incidents(path):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return [{k: r[k] for k in r.keys() if k != "id"} for r in conn.execute("SELECT * FROM incidents ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def test_incident_is_opened_extended_and_closed_across_batches(db):
+    writer = database.start_writer(batch_size=2, flush_interval=0.05)
+    write(writer, "a@x.com", "OK", "PAUSED", "UNKNOWN", "NOT_RUNNING", "PAUSED")
+    write(writer, "b@x.com", "SYNCING")  # Other account, own incident
+    writer.enqueue(database.RemediationEvent(T0, "a@x.com"))
+    write(writer, "a@x.com", "OK", "OK", start=T0 + timedelta(seconds=120))
+    writer.enqueue(database.RemediationEvent(T0, "a@x.com"))  # No open incident: ignored
+    assert writer.flush()
+
+    a, b = incidents(db)
+    assert a["started_at"] == "2024-03-01 10:00:15" and a["ended_at"] == "2024-03-01 10:02:00"
+    assert (a["first_status"], a["worst_status"], a["last_status"]) == ("PAUSED", "NOT_RUNNING", "OK")
+    assert a["transitions"] == 3 and a["duration_seconds"] == 105 and a["remediation_attempts"] == 1
+    assert b["account"] == "b@x.com" and b["ended_at"] is None and b["duration_seconds"] is None
+    assert database.get_open_incident()["account"] == "b@x.com"
+    assert database.get_open_incident("a@x.com") is None
+
+
+def test_synchronous_log_status_maintains_incidents(db):
+    database.log_status("AUTH_REQUIRED", "x", account="a@x.com")
+    database.log_remediation("a@x.com")
+    database.log_remediation("a@x.com")
+    assert database.get_open_incident("a@x.com")["remediation_attempts"] == 2
+    database.log_status("OK", "x", account="a@x.com")
+    assert database.get_open_incident("a@x.com") is None
+    assert database.get_monthly_incident_count(account="a@x.com") == 1
+
+
+def test_backfill_matches_incremental_maintenance(db):
+    writer = database.start_writer(batch_size=3, flush_interval=0.05)
+    write(writer, "a@x.com", "OK", "PAUSED", "OK", "ERROR", "AUTH_REQUIRED", "OK", "NOT_FOUND")
+    assert writer.flush()
+    incremental = incidents(db)
+
+    conn = sqlite3.connect(db)
+    conn.execute("DELETE FROM incidents")
+    conn.commit()
+    conn.close()
+    assert database.backfill_incidents() == 3
+    assert incidents(db) == incremental
+
+
+def test_summary_queries_read_single_rows_from_indexes(db):
+    writer = database.start_writer(flush_interval=0.05)
+    write(writer, "a@x.com", "PAUSED", "OK", step=60)  # 60 s
+    write(writer, "a@x.com", "NOT_RUNNING", "NOT_RUNNING", "OK", step=60, start=T0 + timedelta(hours=1))  # 120 s
+    write(writer, "b@x.com", "ERROR", "OK", step=30, start=T0 + timedelta(hours=2))  # 30 s
+    assert writer.flush()
+
+    assert database.get_mttr() == pytest.approx(70)
+    assert database.get_mttr(account="b@x.com") == 30
+    assert database.get_mttr(since=T0 + timedelta(minutes=30), account="a@x.com") == 120
+    assert database.get_longest_incident()["first_status"] == "NOT_RUNNING"
+    assert database.get_longest_incident(since=T0 + timedelta(hours=2))["account"] == "b@x.com"
+    assert database.get_monthly_incident_count(2024, 3) == 3
+
+    conn = sqlite3.connect(db)
+    plan = " ".join(r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + database.LONGEST_INCIDENT_SQL, (None, None, None, None)))
+    conn.close()
+    assert "idx_incidents_duration" in plan
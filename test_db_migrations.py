@@ -0,0 +1,83 @@
+"""Tests for the versioned schema migrations and the indexed history queries."""
+
+import sqlite3
+
+from src.shared import database
+
+
+def insert(path, *rows):
+    conn = sqlite3.connect(path)
+    conn.executemany("INSERT INTO status_history (timestamp, status, message, account) VALUES (?, ?, 'x', 'a@x.com')", rows)
+    conn.commit()
+    conn.close()
+    database.backfill_incidents()  # Rows written behind the writer's back
+
+
+def plans(path, sql, params):
+    conn = sqlite3.connect(path)
+    try:
+        return " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+    finally:
+        conn.close()
+
+
+def test_fresh_database_gets_every_migration(db_path):
+    database.init_db()
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == database.SCHEMA_VERSION
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    conn.close()
+    assert {"idx_status_history_timestamp", "idx_status_history_status", "idx_incidents_started"} <= indexes
+
+    database.init_db()  # Idempotent
+    month = dict(zip(("start", "end"), database._month_bounds(2024, 1)), account=None)
+    assert "SCAN incidents" not in plans(db_path, database.MONTH_INCIDENTS_SQL, month)
+    assert "idx_status_history_status" in plans(db_path, database.LAST_OK_SQL, (None, None))
+    assert "INTEGER PRIMARY KEY" in plans(db_path, database.FIRST_AFTER_SQL, (1, None, None))
+
+
+def test_unversioned_legacy_database_is_migrated(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE status_history (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                 "timestamp DATETIME, status TEXT NOT NULL, message TEXT, is_change BOOLEAN DEFAULT 0)")
+    conn.execute("INSERT INTO status_history (timestamp, status) VALUES ('2024-01-01 10:00:00', 'OK')")
+    conn.commit()
+    conn.close()
+
+    database.init_db(default_account="a@x.com")
+    assert [r["account"] for r in database.get_recent_history()] == ["a@x.com"]
+    assert sqlite3.connect(db_path).execute("PRAGMA user_version").fetchone()[0] == database.SCHEMA_VERSION
+
+
+def test_newer_schema_is_left_alone(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"PRAGMA user_version={database.SCHEMA_VERSION + 5}")
+    assert database.migrate(conn) == database.SCHEMA_VERSION + 5
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+    conn.close()
+
+
+def test_month_range_includes_its_edges_only(db_path):
+    database.init_db()
+    insert(
+        db_path,
+        ("2023-12-31 23:59:59.999999", "PAUSED"),  # Previous month
+        ("2024-01-01 00:00:00", "NOT_RUNNING"),
+        ("2024-01-10 12:00:00", "OK"),
+        ("2024-01-20 12:00:00", "AUTH_REQUIRED"),
+        ("2024-01-31 23:59:59.5", "AUTH_REQUIRED"),
+        ("2024-02-01 00:00:00", "ERROR"),  # Next month
+    )
+    assert database.get_monthly_incident_count(2024, 1) == 2
+    assert database.get_monthly_incident_count(2023, 12) == 1
+    assert database.get_monthly_incident_count(2024, 2) == 1
+    assert database._month_bounds(2024, 12) == ("2024-12-01", "2025-01-01")
+
+
+def test_outage_start_is_first_row_after_last_ok(db_path):
+    database.init_db()
+    insert(db_path, ("2024-01-01 10:00:00", "PAUSED"), ("2024-01-01 10:00:15", "OK"),
+           ("2024-01-01 10:00:30", "NOT_RUNNING"), ("2024-01-01 10:00:45", "NOT_RUNNING"))
+    assert str(database.get_outage_start_time("a@x.com")) == "2024-01-01 10:00:30"
+    insert(db_path, ("2024-01-01 10:01:00", "OK"))
+    assert database.get_outage_start_time("a@x.com") is None
@@ -0,0 +1,57 @@
+"""Tests for the pooled read-only connections of the status history database."""
+
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.shared import database
+
+
+def test_readers_without_database_do_not_create_it(db_path):
+    assert database.get_recent_history() == []
+    assert database.get_chart_data() == []
+    assert database.get_monthly_incident_count(2024, 1) == 0
+    assert database.get_outage_start_time() is None
+    assert not db_path.exists()
+
+
+def test_monthly_count_does_not_create_tables(db_path):
+    sqlite3.connect(db_path).close()  # Empty database file, no status_history
+    assert database.get_monthly_incident_count(2024, 1) == 0
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0] == 0
+    conn.close()
+
+
+def test_pooled_connections_are_reused_read_only_and_configured(db_path):
+    database.init_db()
+    for status in ("OK", "PAUSED", "OK"):
+        database.log_status(status, status, True, account="a@x.com")
+    for _ in range(50):
+        assert len(database.get_recent_history(account="a@x.com")) == 3
+    pool = database._read_pool()
+    assert pool.created == 1
+
+    with pool.connection() as conn:
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM status_history")
+
+
+def test_reads_proceed_while_a_write_transaction_is_open(db_path):
+    database.init_db()
+    database.log_status("OK", "ok", True)
+    writer = sqlite3.connect(db_path)
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("INSERT INTO status_history (timestamp, status, message) VALUES ('2024-01-01', 'PAUSED', 'x')")
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda _: len(database.get_recent_history()), range(64)))
+        assert results == [1] * 64  # WAL: readers see the last commit, no "database is locked"
+        assert database._read_pool().created <= 4
+    finally:
+        writer.commit()
+        writer.close()
+    assert len(database.get_recent_history()) == 2
@@ -0,0 +1,100 @@
+"""Tests for the minute/hour/day rollups behind the long-range chart."""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+from src.shared import database
+from src.shared.schemas import OneDriveStatus
+
+T0 = datetime(2024, 3, 1, 10, 59, 30)
+
+
+def write(account, *timeline):
+    """Rows of (seconds after T0, status) through the background writer."""
+    writer = database.get_writer() or database.start_writer(batch_size=2, flush_interval=0.05)
+    for seconds, status in timeline:
+        writer.enqueue((T0 + timedelta(seconds=seconds), status, status, False, account))
+    assert writer.flush()
+
+
+def cells(path, table):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    try:
+        return {
+            (r["bucket"], r["account"]): dict(r)
+            for r in conn.execute(f"SELECT * FROM {table} ORDER BY bucket, account")
+        }
+    finally:
+        conn.close()
+
+
+def test_every_status_has_a_migrated_rollup_column(db):
+    # A new OneDriveStatus needs a migration adding its column (and a ROLLUP_STATUSES entry)
+    assert sorted(database.ROLLUP_STATUSES) == sorted(status.value for status in OneDriveStatus)
+    conn = sqlite3.connect(db)
+    for table in database.ROLLUP_TABLES.values():
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        assert [c for c in columns if c.endswith("_seconds")] == database.ROLLUP_COLUMNS
+    conn.close()
+
+
+def test_intervals_are_split_at_bucket_edges(db):
+    # OK 10:59:30-11:00:20, PAUSED 11:00:20-11:01:10, OK from then on
+    write("a@x.com", (0, "OK"), (50, "PAUSED"), (100, "OK"))
+
+    minutes = cells(db, "rollup_minute")
+    first = minutes[("2024-03-01 10:59:00", "a@x.com")]
+    assert first["ok_seconds"] == 30 and first["transitions"] == 0 and first["worst_status"] == "OK"
+    second = minutes[("2024-03-01 11:00:00", "a@x.com")]
+    assert (second["ok_seconds"], second["paused_seconds"]) == (20, 40)
+    assert second["transitions"] == 1 and second["worst_status"] == "PAUSED"
+    third = minutes[("2024-03-01 11:01:00", "a@x.com")]
+    assert third["paused_seconds"] == 10 and third["transitions"] == 1
+
+    hours = cells(db, "rollup_hour")
+    assert hours[("2024-03-01 10:00:00", "a@x.com")]["ok_seconds"] == 30
+    assert hours[("2024-03-01 11:00:00", "a@x.com")]["transitions"] == 2
+    day = cells(db, "rollup_day")[("2024-03-01 00:00:00", "a@x.com")]
+    assert (day["ok_seconds"], day["paused_seconds"], day["transitions"]) == (50, 50, 2)
+
+
+def test_monitor_downtime_is_not_attributed(db):
+    # Next row 2 h later: only rollup_max_gap_seconds (900) count as NOT_RUNNING
+    write("a@x.com", (0, "NOT_RUNNING"), (7200, "OK"))
+    day = cells(db, "rollup_day")[("2024-03-01 00:00:00", "a@x.com")]
+    assert day["not_running_seconds"] == 900 and day["worst_status"] == "NOT_RUNNING"
+
+
+def test_backfill_matches_incremental_rollups(db):
+    write("a@x.com", (0, "OK"), (15, "SYNCING"), (3600, "AUTH_REQUIRED"), (3615, "OK"), (90_000, "OK"))
+    write("b@x.com", (5, "ERROR"), (65, "OK"))
+    incremental = [cells(db, table) for table in database.ROLLUP_TABLES.values()]
+    database.backfill_rollups()
+    assert [cells(db, table) for table in database.ROLLUP_TABLES.values()] == incremental
+
+
+def test_chart_series_picks_resolution_from_range(db):
+    # Rows on whole minutes from 11:00:00
+    write("a@x.com", (30, "OK"), (90, "PAUSED"), (150, "OK"), (210, "OK"))
+    write("b@x.com", (30, "OK"), (90, "AUTH_REQUIRED"), (150, "OK"))
+    end = T0 + timedelta(hours=1)
+
+    assert database.chart_resolution(timedelta(hours=24)) == "minute"
+    assert database.chart_resolution(timedelta(days=7)) == "hour"
+    assert database.chart_resolution(timedelta(days=90)) == "day"
+
+    minute = database.get_chart_series(hours=24, end=end)
+    assert [p["status"] for p in minute] == ["OK", "AUTH_REQUIRED", "OK"]
+    assert minute[1]["seconds"] == {"PAUSED": 60, "AUTH_REQUIRED": 60} and minute[1]["transitions"] == 2
+    assert database.get_chart_series(hours=24, account="a@x.com", end=end)[1]["status"] == "PAUSED"
+
+    (day,) = database.get_chart_series(hours=24 * 90, end=end)
+    assert day["resolution"] == "day" and day["timestamp"] == "2024-03-01 00:00:00"
+    assert day["seconds"]["OK"] == 180 and day["transitions"] == 4
+
+    conn = sqlite3.connect(db)
+    sql = database._rollup_series_sql("rollup_day")
+    plan = " ".join(r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, ("2024-01-01", "2024-04-01", None, None)))
+    conn.close()
+    assert "SCAN" not in plan
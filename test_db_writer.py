@@ -0,0 +1,69 @@
+"""Tests for the write-behind status history writer."""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from src.shared import database
+
+
+def rows(path):
+    conn = sqlite3.connect(path)
+    try:
+        return [r[0] for r in conn.execute("SELECT status FROM status_history ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def test_log_status_is_queued_and_batched(db):
+    commits = []
+    writer = database.start_writer(batch_size=50, flush_interval=0.2,
+                                   on_commit=lambda seconds, failed: commits.append(failed))
+    start = time.perf_counter()
+    for i in range(120):
+        database.log_status("OK" if i % 2 else "PAUSED", "x", account="a@x.com")
+    assert time.perf_counter() - start < 0.5  # No commit on the caller's thread
+
+    assert writer.flush()
+    assert len(rows(db)) == 120
+    assert writer.batches_written <= 4 and commits and not any(commits)
+    assert sqlite3.connect(db).execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    snapshot = writer.snapshot()
+    assert (snapshot.rows_written, snapshot.queue_depth, snapshot.rows_dropped) == (120, 0, 0)
+    assert snapshot.max_queue_depth > 0
+
+
+def test_stop_flushes_pending_rows(db):
+    writer = database.start_writer(batch_size=1000, flush_interval=30)
+    for _ in range(10):
+        database.log_status("OK", "x")
+    start = time.monotonic()
+    database.stop_writer()
+    assert time.monotonic() - start < 2
+    assert rows(db) == ["OK"] * 10
+    assert database.get_writer() is None and not writer._thread.is_alive()
+
+    # Without a writer rows are written synchronously again
+    database.log_status("PAUSED", "y")
+    assert rows(db)[-1] == "PAUSED"
+
+
+def test_full_queue_drops_rows_without_blocking(db, caplog):
+    writer = database.StatusWriter(max_queue=3)  # Not started: nothing drains the queue
+    accepted = [writer.enqueue((None, "OK", "x", False, None)) for _ in range(5)]
+    assert accepted == [True, True, True, False, False]
+    assert writer.snapshot().rows_dropped == 2
+
+    assert not writer.enqueue(database.RemediationEvent(datetime(2024, 3, 1, 10, 0), "a@x.com"))
+    assert "estado OK (None, None) descartado" in caplog.text
+    assert "intento de remediación (a@x.com, 2024-03-01 10:00:00) descartado" in caplog.text
+
+
+def test_failed_batch_is_counted(db):
+    failures = threading.Event()
+    writer = database.start_writer(flush_interval=0.05,
+                                   on_commit=lambda seconds, failed: failed and failures.set())
+    database.log_status(None, "status is NOT NULL")
+    assert failures.wait(5)
+    assert writer.snapshot().errors == 1
@@ -0,0 +1,60 @@
+"""Tests for the filesystem change watcher (inotify backend)."""
+
+import sys
+import time
+
+import pytest
+
+from src.monitor.fs_watcher import ChangeBackend, FileChangeWatcher
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify backend is Linux-only")
+
+
+@pytest.fixture
+def watched(tmp_path):
+    canary = tmp_path / ".monitor_canary"
+    canary.write_text("0")
+    watcher = FileChangeWatcher([canary], debounce_seconds=0.1)
+    assert watcher.start()
+    yield canary, watcher
+    watcher.close()
+
+
+def test_change_wakes_watcher(watched):
+    canary, watcher = watched
+    start = time.monotonic()
+    canary.write_text("1")
+
+    assert watcher.wait(2.0)
+    assert time.monotonic() - start < 1.0
+    assert watcher.last_changes == [".monitor_canary"]
+
+
+def test_unrelated_files_are_ignored(watched, tmp_path):
+    _, watcher = watched
+    (tmp_path / "other.txt").write_text("x")
+
+    assert not watcher.wait(0.4)
+    assert watcher.wakeups == 0
+
+
+def test_burst_is_debounced(watched):
+    canary, watcher = watched
+    for i in range(20):
+        canary.write_text(str(i))
+        time.sleep(0.005)
+
+    assert watcher.wait(2.0)
+    assert not watcher.wait(0.3)
+    assert watcher.wakeups == 1
+    assert watcher.events_seen >= 20
+
+
+def test_watcher_without_backend_does_not_start(tmp_path):
+    class NoWatchBackend(ChangeBackend):
+        def add_watch(self, directory):
+            raise OSError("not supported")
+
+    watcher = FileChangeWatcher([tmp_path / "x"], backend=NoWatchBackend())
+    assert not watcher.start()
+    assert not watcher.active
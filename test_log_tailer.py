@@ -0,0 +1,89 @@
+"""Tests for the incremental SyncDiagnostics.log tailer."""
+
+import os
+
+from src.monitor.log_tailer import LogTailer
+
+
+def _append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_reads_only_new_complete_lines(tmp_path):
+    log = tmp_path / "SyncDiagnostics.log"
+    log.write_text("FilesToUpload = 3\n", encoding="utf-8")
+    chunks = []
+    tailer = LogTailer(log)
+    tailer.subscribe(lambda text, start, end: chunks.append((text, start, end)))
+
+    assert tailer.poll() == "FilesToUpload = 3\n"
+    assert tailer.poll() == ""
+
+    _append(log, "FilesToUpload = 0\nPartial")
+    assert tailer.poll() == "FilesToUpload = 0\n"
+    _append(log, " line\n")
+    assert tailer.poll() == "Partial line\n"
+
+    assert [c[0] for c in chunks] == ["FilesToUpload = 3\n", "FilesToUpload = 0\n", "Partial line\n"]
+    assert chunks[-1][2] == log.stat().st_size
+    assert tailer.bytes_read == log.stat().st_size
+
+
+def test_backfill_is_limited_and_line_aligned(tmp_path):
+    log = tmp_path / "SyncDiagnostics.log"
+    log.write_text("".join(f"line {i:04d}\n" for i in range(1000)), encoding="utf-8")
+    tailer = LogTailer(log, backfill_bytes=100)
+
+    text = tailer.poll()
+    assert len(text) <= 100
+    assert text.startswith("line ")
+    assert text.endswith("line 0999\n")
+
+
+def test_truncation_resets_subscribers(tmp_path):
+    log = tmp_path / "SyncDiagnostics.log"
+    log.write_text("SignIn required\nmore text\n", encoding="utf-8")
+    resets = []
+    tailer = LogTailer(log)
+    tailer.subscribe(lambda *a: None, lambda: resets.append(True))
+    tailer.poll()
+
+    with open(log, "w", encoding="utf-8") as f:
+        f.write("ok\n")
+    assert tailer.poll() == "ok\n"
+    assert resets == [True]
+    assert tailer.rotations == 1
+
+
+def test_rotation_detected_by_identity(tmp_path):
+    log = tmp_path / "SyncDiagnostics.log"
+    log.write_text("old 1\nold 2\nold 3\n", encoding="utf-8")
+    tailer = LogTailer(log)
+    tailer.poll()
+
+    rotated = tmp_path / "SyncDiagnostics.new"
+    rotated.write_text("new content that is longer than before\n", encoding="utf-8")
+    os.replace(rotated, log)
+
+    assert tailer.poll() == "new content that is longer than before\n"
+    assert tailer.rotations == 1
+
+
+def test_rewrite_in_place_detected(tmp_path):
+    log = tmp_path / "SyncDiagnostics.log"
+    log.write_text("FilesToUpload = 5\n", encoding="utf-8")
+    tailer = LogTailer(log)
+    tailer.poll()
+
+    # Same inode, rewritten with longer content
+    with open(log, "r+", encoding="utf-8") as f:
+        f.write("FilesToUpload = 0\nUtcNow = later\n")
+    assert tailer.poll() == "FilesToUpload = 0\nUtcNow = later\n"
+    assert tailer.rotations == 1
+
+
+def test_missing_file(tmp_path):
+    tailer = LogTailer(tmp_path / "missing.log")
+    assert tailer.poll() == ""
+    assert tailer.identity is None
@@ -0,0 +1,99 @@
+"""Tests for per-validation latency, error, timeout and spawn metrics."""
+
+import sys
+
+import pytest
+
+from src.monitor import checker as checker_module
+from src.monitor.checker import OneDriveChecker
+from src.monitor.cycle_context import CycleContext, cycle_cached
+from src.monitor.machine import MachineObservations
+from src.monitor.metrics import LatencyHistogram, get_metrics, instrumented
+from src.monitor.registry_index import RegistryProvider
+from src.monitor.watchdog import ProbeTimeoutError, run_with_deadline
+from src.shared.config import TargetConfig
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    get_metrics().reset()
+    yield
+    get_metrics().reset()
+
+
+class Probes:
+    def __init__(self):
+        self.cycle = CycleContext()
+
+    @cycle_cached("registry_check")
+    @instrumented("registry_check")
+    def registry(self):
+        return True
+
+    @instrumented("tray_auth_check")
+    def broken(self):
+        raise OSError("registry unavailable")
+
+    @instrumented("auth_window_check")
+    def hung(self):
+        raise ProbeTimeoutError("auth_window_check exceeded 10s")
+
+
+def test_histogram_buckets_and_quantiles():
+    hist = LatencyHistogram((10, 100))
+    for ms in (1, 2, 50, 500):
+        hist.observe(ms)
+    assert hist.buckets == [2, 1, 1]
+    assert hist.quantile(0.5) == 10
+    assert hist.quantile(0.95) == 500
+
+
+def test_cached_calls_errors_and_timeouts_are_counted():
+    probes = Probes()
+    probes.registry()
+    probes.registry()  # cycle cache hit: not a new execution
+    with pytest.raises(OSError):
+        probes.broken()
+    with pytest.raises(ProbeTimeoutError):
+        probes.hung()
+
+    snapshot = get_metrics().snapshot()
+    assert snapshot["registry_check"].count == 1
+    assert snapshot["tray_auth_check"].errors == 1
+    assert snapshot["auth_window_check"].timeouts == 1
+    assert sum(snapshot["registry_check"].buckets.values()) == 1
+
+
+def test_subprocess_spawns_are_counted():
+    run_with_deadline([sys.executable, "-c", "pass"], timeout=10, name="auth_window_check")
+    assert get_metrics().snapshot()["auth_window_check"].spawns == 1
+
+
+class BrokenRegistry(RegistryProvider):
+    def read_accounts(self):
+        raise OSError("Accounts key missing")
+
+    def has_changed(self):
+        return True
+
+
+def test_errors_handled_inside_checker_probes_are_counted(monkeypatch, tmp_path):
+    monkeypatch.setattr(checker_module, "is_validation_enabled", lambda name: True)
+
+    def powershell_failed():
+        raise RuntimeError("powershell.exe not found")
+
+    machine = MachineObservations(BrokenRegistry(), lambda attrs=None: [],
+                                  auth_window_source=powershell_failed, tray_auth_source=powershell_failed)
+    checker = OneDriveChecker(target=TargetConfig(email="a@x.com", folder=str(tmp_path)), machine=machine)
+    try:
+        # Each probe falls back to False instead of raising
+        assert checker.verify_registry_account() is False
+        assert checker.check_auth_window() is False
+        assert checker.check_tray_auth_required() is False
+    finally:
+        machine.close()
+
+    snapshot = get_metrics().snapshot()
+    for name in ("registry_check", "auth_window_check", "tray_auth_check"):
+        assert (snapshot[name].count, snapshot[name].errors) == (1, 1)
@@ -0,0 +1,123 @@
+"""Tests for multi-account support: shared machine observations, config, DB."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.monitor import checker as checker_module
+from src.monitor.checker import OneDriveChecker
+from src.monitor.machine import MachineObservations
+from src.monitor.registry_index import InMemoryRegistryProvider
+from src.shared import database
+from src.shared.config import AppConfig, TargetConfig, status_path_for
+
+ACCOUNTS = {
+    "Business1": {"UserEmail": "ana@contoso.com", "UserFolder": r"C:\Users\ana\OneDrive - Contoso"},
+    "Business2": {"UserEmail": "ana@fabrikam.com", "UserFolder": r"C:\Users\ana\OneDrive - Fabrikam"},
+}
+
+
+class FakeProcess:
+    def __init__(self, pid, name, cmdline):
+        self.pid = pid
+        self.info = {"name": name}
+        self._cmdline = cmdline
+
+    def cmdline(self):
+        return self._cmdline
+
+    def create_time(self):
+        return 1.0
+
+    def is_running(self):
+        return True
+
+
+@pytest.fixture
+def machine():
+    table = {7: FakeProcess(7, "OneDrive.exe", ["OneDrive.exe", "/background"])}
+    scans = []
+
+    def process_iter(attrs=None):
+        scans.append(1)
+        return list(table.values())
+
+    machine = MachineObservations(InMemoryRegistryProvider(ACCOUNTS), process_iter, table.__getitem__)
+    machine.scans = scans
+    yield machine
+    machine.close()
+
+
+def test_machine_observations_shared_within_cycle(machine):
+    machine.begin_cycle()
+    # Two Business accounts ask for the process and the registry in the same cycle
+    for email in ("ana@contoso.com", "ana@fabrikam.com", "ana@contoso.com"):
+        assert machine.find_onedrive(False) == 7
+        assert machine.lookup_account(email, False) is not None
+
+    assert machine.cycle.misses["onedrive_pid"] == 1
+    assert machine.cycle.hits["onedrive_pid"] == 2
+    assert machine.cycle.hits["registry_account"] == 1
+    assert machine.account_index.provider.read_count == 1
+
+
+def test_registry_check_matches_the_target_kind(monkeypatch):
+    monkeypatch.setattr(checker_module, "is_validation_enabled", lambda name: True)
+    accounts = {**ACCOUNTS, "Personal": {"UserEmail": "ana@contoso.com", "UserFolder": r"C:\Users\ana\OneDrive - Personal"}}
+    machine = MachineObservations(InMemoryRegistryProvider(accounts), lambda attrs=None: [])
+    try:
+        for folder in (ACCOUNTS["Business1"]["UserFolder"], accounts["Personal"]["UserFolder"]):
+            checker = OneDriveChecker(target=TargetConfig(email="ana@contoso.com", folder=folder), machine=machine)
+            assert checker.verify_registry_account()
+    finally:
+        machine.close()
+
+
+def test_new_cycle_observes_again(machine):
+    machine.begin_cycle()
+    machine.find_onedrive(False)
+    machine.begin_cycle()
+    machine.find_onedrive(False)
+    assert machine.cycle.misses["onedrive_pid"] == 1
+    assert len(machine.scans) == 1  # PID pinned: second cycle only revalidates
+
+
+def test_config_accepts_target_or_targets():
+    legacy = AppConfig(target={"email": "a@x.com", "folder": "A"})
+    assert [t.email for t in legacy.targets] == ["a@x.com"]
+
+    multi = AppConfig(targets=[{"email": "a@x.com", "folder": "A"}, {"email": "b@y.com", "folder": "B"}])
+    assert multi.target.email == "a@x.com"
+
+    with pytest.raises(ValueError):
+        AppConfig()
+
+
+def test_status_path_per_account():
+    default = Path("status.json")
+    first = TargetConfig(email="a@x.com", folder="A")
+    second = TargetConfig(email="Ana.B@Fabrikam.com", folder="B")
+    explicit = TargetConfig(email="c@z.com", folder="C", status_file="c.json")
+
+    assert status_path_for(first, 0, default) == default
+    assert status_path_for(second, 1, default) == Path("status_ana_b_fabrikam_com.json")
+    assert status_path_for(explicit, 2, default) == Path("c.json")
+
+
+def test_db_account_column_migrates_legacy_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE status_history (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                 "timestamp DATETIME, status TEXT NOT NULL, message TEXT, is_change BOOLEAN DEFAULT 0)")
+    conn.execute("INSERT INTO status_history (timestamp, status, message) VALUES ('2024-01-01 10:00:00', 'OK', 'x')")
+    conn.commit()
+    conn.close()
+
+    database.init_db(default_account="a@x.com")
+    database.log_status("PAUSED", "paused", True, account="b@y.com")
+
+    assert [r["account"] for r in database.get_recent_history(account="a@x.com")] == ["a@x.com"]
+    assert [r["status"] for r in database.get_recent_history(account="b@y.com")] == ["PAUSED"]
+    assert len(database.get_recent_history()) == 2
+    assert database.get_outage_start_time("a@x.com") is None
+    assert database.get_outage_start_time("b@y.com") is not None
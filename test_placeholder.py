@@ -0,0 +1,118 @@
+"""Tests for the placeholder state provider (attribute bits, no COM)."""
+
+import os
+import time
+
+import pytest
+
+from src.monitor.checker import OneDriveChecker
+from src.monitor.machine import MachineObservations
+from src.monitor.registry_index import InMemoryRegistryProvider
+from src.monitor.placeholder import (
+    FILE_ATTRIBUTE_PINNED,
+    FILE_ATTRIBUTE_RECALL_ON_DATA_ACCESS,
+    FILE_ATTRIBUTE_REPARSE_POINT,
+    FILE_ATTRIBUTE_UNPINNED,
+    PlaceholderState,
+    XattrAttributesProvider,
+    decode_attributes,
+    describe_attributes,
+)
+from src.shared.config import TargetConfig
+from src.shared.schemas import OneDriveStatus
+
+HIDDEN_ARCHIVE = 0x22
+
+
+@pytest.mark.parametrize("attrs, expected", [
+    (HIDDEN_ARCHIVE, PlaceholderState.NOT_PLACEHOLDER),
+    (HIDDEN_ARCHIVE | FILE_ATTRIBUTE_REPARSE_POINT, PlaceholderState.IN_SYNC),
+    (FILE_ATTRIBUTE_REPARSE_POINT | FILE_ATTRIBUTE_PINNED, PlaceholderState.PINNED),
+    (FILE_ATTRIBUTE_REPARSE_POINT | FILE_ATTRIBUTE_UNPINNED | FILE_ATTRIBUTE_RECALL_ON_DATA_ACCESS,
+     PlaceholderState.CLOUD_ONLY),
+])
+def test_decode_attributes(attrs, expected):
+    assert decode_attributes(attrs) is expected
+    assert expected.is_placeholder == (expected is not PlaceholderState.NOT_PLACEHOLDER)
+
+
+def test_describe_attributes():
+    assert describe_attributes(FILE_ATTRIBUTE_REPARSE_POINT | FILE_ATTRIBUTE_PINNED) == "0x80400 (REPARSE_POINT, PINNED)"
+
+
+@pytest.mark.skipif(not hasattr(os, "setxattr"), reason="requires extended attributes")
+def test_xattr_backend_emulates_onedrive(tmp_path):
+    canary = tmp_path / ".monitor_canary"
+    provider = XattrAttributesProvider()
+    assert provider.state(canary) is PlaceholderState.MISSING
+
+    canary.write_text("Monitor Verification")
+    try:
+        assert provider.state(canary) is PlaceholderState.NOT_PLACEHOLDER
+    except AssertionError:
+        pytest.skip("filesystem without user xattrs")
+
+    provider.set_attributes(canary, HIDDEN_ARCHIVE | FILE_ATTRIBUTE_REPARSE_POINT)
+    assert provider.state(canary) is PlaceholderState.IN_SYNC
+
+    provider.clear_attributes(canary)
+    assert provider.state(canary) is PlaceholderState.NOT_PLACEHOLDER
+
+
+@pytest.mark.skipif(not hasattr(os, "setxattr"), reason="requires extended attributes")
+def test_state_lookup_reads_only_the_attributes(tmp_path, monkeypatch):
+    canary = tmp_path / ".monitor_canary"
+    canary.write_text("x")
+    provider = XattrAttributesProvider()
+    try:
+        provider.set_attributes(canary, FILE_ATTRIBUTE_REPARSE_POINT)
+    except OSError:
+        pytest.skip("filesystem without user xattrs")
+
+    # No PowerShell/COM process, no file content read: one attribute lookup
+    monkeypatch.setattr("subprocess.Popen", lambda *a, **k: pytest.fail("process spawned"))
+    monkeypatch.setattr("builtins.open", lambda *a, **k: pytest.fail("file opened"))
+    assert provider.state(canary) is PlaceholderState.IN_SYNC
+    assert provider.state(canary) is PlaceholderState.IN_SYNC
+
+
+class LocalCanaryProvider:
+    """Attribute bits of a canary OneDrive has not uploaded yet."""
+
+    def state(self, path):
+        return PlaceholderState.NOT_PLACEHOLDER if path.exists() else PlaceholderState.MISSING
+
+
+@pytest.fixture
+def checker(tmp_path):
+    machine = MachineObservations(InMemoryRegistryProvider({}), process_iter=lambda attrs=None: [])
+    checker = OneDriveChecker(target=TargetConfig(email="a@x.com", folder=str(tmp_path)), machine=machine)
+    checker.check_auth_window = lambda: False
+    checker.is_only_canary_syncing = lambda: False
+    yield checker
+    machine.close()
+
+
+def age_canary(checker, seconds):
+    checker.canary_path.write_text("Monitor Verification")
+    mtime = time.time() - seconds
+    os.utime(checker.canary_path, (mtime, mtime))
+
+
+@pytest.mark.parametrize("provider", [LocalCanaryProvider(), None], ids=["native", "shell"])
+def test_pending_upload_past_sync_timeout_is_syncing(checker, provider):
+    checker.placeholder_provider = provider
+    shell_queries = []
+    checker._get_shell_status_ps = lambda path: shell_queries.append(path) or "Pendiente de sincronización"
+
+    age_canary(checker, checker.LIVENESS_SYNC_TIMEOUT * 2)
+    status, detail = checker.active_liveness_check()
+    assert status is OneDriveStatus.SYNCING and detail.startswith("Sincronizando (Pendiente")
+    assert shell_queries
+
+    # Within the grace period the native bits answer without the Shell column
+    shell_queries.clear()
+    age_canary(checker, 1)
+    status, _ = checker.active_liveness_check()
+    assert status is (OneDriveStatus.OK if provider else OneDriveStatus.SYNCING)
+    assert bool(shell_queries) == (provider is None)
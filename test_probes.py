@@ -0,0 +1,76 @@
+"""Tests for concurrent probe execution and status precedence."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.monitor.probes import resolve_status, run_probes
+from src.shared.schemas import OneDriveStatus
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=4)
+    yield pool
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _sleeper(seconds, value):
+    def probe():
+        time.sleep(seconds)
+        return value
+    return probe
+
+
+def test_probes_run_concurrently(executor):
+    start = time.monotonic()
+    results = run_probes(
+        executor,
+        {"a": _sleeper(0.3, 1), "b": _sleeper(0.3, 2), "c": _sleeper(0.3, 3)},
+        deadlines={"a": 5, "b": 5, "c": 5},
+        defaults={},
+    )
+    elapsed = time.monotonic() - start
+
+    assert [r.value for r in results.values()] == [1, 2, 3]
+    assert elapsed < 0.8
+    assert all(0.25 < r.elapsed < 0.8 for r in results.values())
+
+
+def test_probe_deadline_uses_default(executor):
+    results = run_probes(
+        executor,
+        {"fast": _sleeper(0, True), "slow": _sleeper(2, True)},
+        deadlines={"fast": 1, "slow": 0.2},
+        defaults={"slow": False},
+    )
+    assert results["fast"].value is True
+    assert results["slow"].timed_out
+    assert results["slow"].value is False
+
+
+def test_probe_error_uses_default(executor):
+    def boom():
+        raise RuntimeError("COM failure")
+
+    results = run_probes(executor, {"x": boom}, deadlines={"x": 1}, defaults={"x": "default"})
+    assert results["x"].value == "default"
+    assert results["x"].error == "COM failure"
+
+
+LIVE_OK = (OneDriveStatus.OK, "Activo")
+
+
+@pytest.mark.parametrize("args,expected", [
+    ((False, True, True, LIVE_OK, True), OneDriveStatus.NOT_FOUND),
+    ((True, False, True, LIVE_OK, True), OneDriveStatus.NOT_RUNNING),
+    ((True, True, True, LIVE_OK, False), OneDriveStatus.AUTH_REQUIRED),
+    ((True, True, False, (OneDriveStatus.SYNCING, "x"), True), OneDriveStatus.AUTH_REQUIRED),
+    ((True, True, False, (OneDriveStatus.PAUSED, "x"), False), OneDriveStatus.PAUSED),
+    ((True, True, False, LIVE_OK, False), OneDriveStatus.OK),
+])
+def test_resolve_status_precedence(args, expected):
+    status, running, _ = resolve_status(*args)
+    assert status == expected
+    assert running == (expected not in (OneDriveStatus.NOT_FOUND, OneDriveStatus.NOT_RUNNING))
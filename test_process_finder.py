@@ -0,0 +1,117 @@
+"""Tests for PID-pinned OneDrive.exe discovery against a synthetic process table."""
+
+import psutil
+
+from src.monitor.process_finder import OneDriveProcessLocator, cmdline_matches
+
+
+class FakeProcess:
+    def __init__(self, table, pid, name, cmdline, create_time=1000.0):
+        self.table = table
+        self.pid = pid
+        self.info = {"name": name}
+        self._cmdline = cmdline
+        self._create_time = create_time
+        self.cmdline_calls = 0
+
+    def cmdline(self):
+        self.cmdline_calls += 1
+        self.table.cmdline_calls += 1
+        return self._cmdline
+
+    def create_time(self):
+        return self._create_time
+
+    def is_running(self):
+        return self.pid in self.table.procs
+
+
+class FakeProcessTable:
+    def __init__(self):
+        self.procs = {}
+        self.iter_calls = 0
+        self.cmdline_calls = 0
+
+    def add(self, pid, name, cmdline, create_time=1000.0):
+        self.procs[pid] = FakeProcess(self, pid, name, cmdline, create_time)
+        return self.procs[pid]
+
+    def process_iter(self, attrs=None):
+        self.iter_calls += 1
+        return list(self.procs.values())
+
+    def get_process(self, pid):
+        if pid not in self.procs:
+            raise psutil.NoSuchProcess(pid)
+        return self.procs[pid]
+
+
+def _locator(table, personal=False):
+    return OneDriveProcessLocator(personal, process_iter=table.process_iter, get_process=table.get_process)
+
+
+def _table_with_noise(n=200):
+    table = FakeProcessTable()
+    for pid in range(1, n):
+        table.add(pid, "svchost.exe", ["svchost.exe", "-k", "netsvcs"])
+    return table
+
+
+def test_cmdline_matching():
+    assert cmdline_matches(["OneDrive.exe", "/background"], False)
+    assert not cmdline_matches(["OneDrive.exe", "/client=Personal"], False)
+    assert cmdline_matches(["OneDrive.exe", "/client=Personal"], True)
+    assert not cmdline_matches([], False)
+
+
+def test_full_scan_filters_by_name_before_cmdline():
+    table = _table_with_noise()
+    table.add(5000, "OneDrive.exe", ["OneDrive.exe", "/background"])
+
+    assert _locator(table).find() == 5000
+    assert table.cmdline_calls == 1
+
+
+def test_pinned_pid_is_revalidated_without_scanning():
+    table = _table_with_noise()
+    table.add(5000, "OneDrive.exe", ["OneDrive.exe", "/background"])
+    locator = _locator(table)
+
+    for _ in range(10):
+        assert locator.find() == 5000
+    assert table.iter_calls == 1
+    assert locator.full_scans == 1
+    assert locator.revalidations == 9
+
+
+def test_rescan_when_pinned_process_exits():
+    table = _table_with_noise()
+    table.add(5000, "OneDrive.exe", ["OneDrive.exe"])
+    locator = _locator(table)
+    locator.find()
+
+    del table.procs[5000]
+    assert locator.find() is None
+    table.add(6000, "OneDrive.exe", ["OneDrive.exe", "/background"], create_time=2000.0)
+    assert locator.find() == 6000
+    assert locator.full_scans == 3
+
+
+def test_pid_reuse_detected_by_create_time():
+    table = _table_with_noise()
+    table.add(5000, "OneDrive.exe", ["OneDrive.exe"])
+    locator = _locator(table)
+    locator.find()
+
+    # Same PID, different process
+    table.add(5000, "notepad.exe", ["notepad.exe"], create_time=3000.0)
+    assert locator.find() is None
+
+
+def test_personal_target_ignores_business_instance():
+    table = _table_with_noise()
+    table.add(5000, "OneDrive.exe", ["OneDrive.exe", "/background"])
+    table.add(5001, "OneDrive.exe", ["OneDrive.exe", "/client=Personal"])
+
+    assert _locator(table, personal=True).find() == 5001
+    assert _locator(table, personal=False).find() == 5000
@@ -0,0 +1,49 @@
+"""Tests for the on-demand cycle profiler."""
+
+import json
+import pstats
+from concurrent.futures import ThreadPoolExecutor
+
+from src.monitor.profiler import CycleProfiler
+
+
+def busy_probe():
+    return sum(i * i for i in range(300000))
+
+
+def test_idle_profiler_writes_nothing(tmp_path):
+    profiler = CycleProfiler(tmp_path / "profiles")
+    with profiler.cycle(1):
+        assert not profiler.active
+    assert profiler.written == []
+
+
+def test_sampling_covers_pool_threads_and_stops(tmp_path):
+    request = tmp_path / "profile_request.json"
+    request.write_text(json.dumps({"cycles": 2}))
+    profiler = CycleProfiler(tmp_path / "profiles", request, sample_interval=0.001)
+    profiler.poll_request()
+    assert not request.exists()
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="probe") as pool:
+        for cycle in (1, 2, 3):
+            with profiler.cycle(cycle):
+                pool.submit(busy_probe).result()
+
+    assert len(profiler.written) == 2 and profiler.remaining == 0
+    profile = json.loads(profiler.written[0].read_text())
+    names = {f["name"] for f in profile["shared"]["frames"]}
+    assert "busy_probe" in names
+    assert any(p["name"].startswith("probe") for p in profile["profiles"])
+
+
+def test_cprofile_mode_runs_probes_inline(tmp_path):
+    profiler = CycleProfiler(tmp_path / "profiles", mode="cprofile")
+    profiler.request(1)
+    with profiler.cycle(1):
+        assert profiler.inline_probes
+        busy_probe()
+    assert not profiler.inline_probes
+
+    stats = pstats.Stats(str(profiler.written[0]))
+    assert any(func[2] == "busy_probe" for func in stats.stats)
@@ -0,0 +1,82 @@
+"""Tests for the cached registry account index (in-memory provider)."""
+
+import pytest
+
+from src.monitor.registry_index import AccountIndex, InMemoryRegistryProvider, RegistryProvider
+
+BUSINESS1 = {
+    "UserEmail": "Ana@Contoso.com",
+    "UserFolder": r"C:\Users\ana\OneDrive - Contoso",
+    "DisplayName": "Contoso",
+}
+
+
+def test_lookup_is_case_insensitive():
+    index = AccountIndex(InMemoryRegistryProvider({"Business1": BUSINESS1}))
+
+    entry = index.lookup("ana@contoso.com")
+    assert entry.subkey == "Business1"
+    assert entry.user_folder == BUSINESS1["UserFolder"]
+    assert entry.values["DisplayName"] == "Contoso"
+
+
+def test_index_not_rebuilt_without_changes():
+    provider = InMemoryRegistryProvider({"Business1": BUSINESS1})
+    index = AccountIndex(provider)
+
+    for _ in range(20):
+        assert index.lookup("ana@contoso.com") is not None
+    assert provider.read_count == 1
+    assert index.rebuilds == 1
+
+
+def test_change_invalidates_index():
+    provider = InMemoryRegistryProvider({"Business1": BUSINESS1})
+    index = AccountIndex(provider)
+    index.lookup("ana@contoso.com")
+
+    # User signs out: OneDrive removes the account subkey
+    provider.remove_account("Business1")
+    assert index.lookup("ana@contoso.com") is None
+
+    provider.set_account("Business2", {**BUSINESS1, "UserEmail": "ana@contoso.com"})
+    assert index.lookup("ana@contoso.com").subkey == "Business2"
+    assert index.rebuilds == 3
+
+
+def test_business_and_personal_accounts_share_an_email():
+    personal = {"UserEmail": "ana@contoso.com", "UserFolder": r"C:\Users\ana\OneDrive"}
+    index = AccountIndex(InMemoryRegistryProvider({"Business1": BUSINESS1, "Personal": personal}))
+
+    assert index.lookup("ana@contoso.com", "Business").subkey == "Business1"
+    assert index.lookup("ana@contoso.com", "Personal").user_folder == personal["UserFolder"]
+    assert index.lookup("ana@contoso.com", "Business2") is None
+    assert len(index.accounts()) == 2
+
+
+def test_accounts_without_folder_are_skipped():
+    provider = InMemoryRegistryProvider({"Business1": {"UserEmail": "x@contoso.com"}})
+    assert AccountIndex(provider).lookup("x@contoso.com") is None
+
+
+class FailingProvider(RegistryProvider):
+    def __init__(self):
+        self.fail = True
+
+    def read_accounts(self):
+        if self.fail:
+            raise OSError("Accounts key missing")
+        return {"Business1": BUSINESS1}
+
+    def has_changed(self):
+        return False
+
+
+def test_failed_read_is_retried():
+    provider = FailingProvider()
+    index = AccountIndex(provider)
+    with pytest.raises(OSError):
+        index.lookup("ana@contoso.com")
+
+    provider.fail = False
+    assert index.lookup("ana@contoso.com") is not None
@@ -0,0 +1,106 @@
+"""Tests for the observation recorder and the virtual-clock replay."""
+
+from src.monitor.recorder import Observation, ObservationRecorder, decode, encode, read_trace
+from src.shared.schemas import OneDriveStatus
+from src.simulator.replay import replay, replay_trace
+from src.simulator.runner import SimulationRunner
+from src.simulator.scenario import BUILTIN_SCENARIOS
+
+ACCOUNT = "usuario@contoso.com"
+OK = OneDriveStatus.OK
+NOT_RUNNING = OneDriveStatus.NOT_RUNNING
+
+
+def obs(t: float, status: OneDriveStatus, **raw) -> Observation:
+    running = status != NOT_RUNNING
+    fields = dict(process=running, registry=True)
+    if running:
+        fields.update(tray_auth=False, auth_window=False, liveness=status, canary_age=5.0)
+    fields.update(raw)
+    return Observation(t=t, account=ACCOUNT, status=status, **fields)
+
+
+def timeline(*statuses: OneDriveStatus, step: float = 5.0) -> list[Observation]:
+    return [obs(1_700_000_000 + i * step, s) for i, s in enumerate(statuses)]
+
+
+def test_trace_lines_are_compact_and_round_trip():
+    observation = obs(1_700_000_000.5, OK, shell="Disponible", sync={"files_to_upload": 1, "blocks_parsed": 3})
+    line = encode(observation)
+    assert " " not in line.replace("Disponible", "") and "null" not in line
+    assert decode(line) == observation
+    assert decode(line).sync_snapshot().files_to_upload == 1
+
+
+def test_recorder_appends_gzip_trace(tmp_path):
+    path = tmp_path / "trace.jsonl.gz"
+    for statuses in ([OK, OK], [NOT_RUNNING]):  # Two monitor runs appending
+        recorder = ObservationRecorder(path)
+        for observation in timeline(*statuses):
+            recorder.record(observation)
+        recorder.close()
+    assert [o.status for o in read_trace(path)] == [OK, OK, NOT_RUNNING]
+    assert list(read_trace(path, account="otro@contoso.com")) == []
+
+
+def test_recorder_flushes_in_batches_not_per_line(tmp_path):
+    now = [0.0]
+    path = tmp_path / "trace.jsonl.gz"
+    recorder = ObservationRecorder(path, flush_every=50, flush_interval=60, clock=lambda: now[0])
+    for observation in timeline(*[OK] * 120):
+        recorder.record(observation)
+    assert recorder.flushes == 2  # After 50 and 100 records
+
+    recorder.record(obs(1_700_001_000, NOT_RUNNING))
+    now[0] = 61.0  # The timer flushes a quiet trace
+    recorder.record(obs(1_700_001_005, OK))
+    assert recorder.flushes == 3
+    assert len(list(read_trace(path))) == 122  # Readable up to the last flush
+
+    recorder.close()
+    recorder.close()
+    assert path.stat().st_size < 1000  # Flushing every line made these 122 lines ~1.5 KB
+
+
+def test_persistent_outage_restarts_after_virtual_persistence():
+    # NOT_RUNNING from t=15 for 20 s: persistence (10 s) is reached at t=25
+    result = replay(timeline(OK, OK, OK, NOT_RUNNING, NOT_RUNNING, NOT_RUNNING, NOT_RUNNING, OK), ACCOUNT)
+    assert result.restarts == [25.0]
+    assert [(t.previous, t.status) for t in result.transitions] == [(None, OK), (OK, NOT_RUNNING), (NOT_RUNNING, OK)]
+    subjects = [n.subject for n in result.notifications]
+    assert "NOT_RUNNING" in subjects[1] and "RESUELTO" in subjects[2]
+    assert result.elapsed < 1
+
+
+def test_short_blip_does_not_restart():
+    result = replay(timeline(OK, NOT_RUNNING, OK, OK), ACCOUNT)
+    assert result.restarts == []
+
+
+def test_replay_re_resolves_status_from_raw_probes(tmp_path):
+    # Recorded as OK, but the tray auth probe fired: the rules say AUTH_REQUIRED
+    observations = timeline(OK, OK) + [obs(1_700_000_010, OK, tray_auth=True)]
+    assert replay(observations, ACCOUNT).transitions[-1].status is OneDriveStatus.AUTH_REQUIRED
+    assert replay(observations, ACCOUNT).mismatches == 1
+    assert len(replay(observations, ACCOUNT, resolve=False).transitions) == 1
+
+    path = tmp_path / "trace.jsonl"
+    recorder = ObservationRecorder(path)
+    for observation in observations:
+        recorder.record(observation)
+    recorder.close()
+    assert replay_trace(path)[ACCOUNT].mismatches == 1
+
+
+def test_monitor_records_raw_observations(tmp_path):
+    path = tmp_path / "sim.jsonl"
+    runner = SimulationRunner(tmp_path, time_scale=0.01, check_interval=5, background_processes=0,
+                              record_observations=path)
+    runner.run(BUILTIN_SCENARIOS["crash_restart"])
+
+    trace = list(read_trace(path))
+    assert trace and all(o.account == ACCOUNT for o in trace)
+    down = [o for o in trace if o.status is NOT_RUNNING]
+    assert down and all(o.process is False and o.liveness is None for o in down)
+    up = trace[-1]
+    assert up.process and up.registry and up.liveness is OK and up.canary_state and up.sync is not None
@@ -0,0 +1,76 @@
+"""Tests for the state-adaptive polling scheduler."""
+
+import random
+
+from src.monitor.scheduler import AdaptiveScheduler
+from src.shared.schemas import OneDriveStatus
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make(clock, **kwargs):
+    kwargs.setdefault("persistence", {OneDriveStatus.PAUSED: 90, OneDriveStatus.NOT_RUNNING: 10})
+    return AdaptiveScheduler(clock=clock, rng=random.Random(7), **kwargs)
+
+
+def run(scheduler, clock, status, cycles):
+    intervals = []
+    for _ in range(cycles):
+        scheduler.observe(status)
+        interval = scheduler.next_interval()
+        intervals.append(interval)
+        clock.now += interval
+    return intervals
+
+
+def test_stable_ok_backs_off_to_upper_bound():
+    clock = FakeClock()
+    scheduler = make(clock, jitter=0.0)
+
+    intervals = run(scheduler, clock, OneDriveStatus.OK, 12)
+    assert intervals == sorted(intervals)
+    assert intervals[-1] == 120.0
+
+
+def test_jitter_stays_within_bounds():
+    clock = FakeClock()
+    scheduler = make(clock, jitter=0.2)
+
+    intervals = run(scheduler, clock, OneDriveStatus.OK, 30)[10:]
+    assert all(15.0 <= i <= 120.0 for i in intervals)
+    assert len(set(intervals)) > 1
+
+
+def test_state_change_speeds_up():
+    clock = FakeClock()
+    scheduler = make(clock, jitter=0.0)
+    run(scheduler, clock, OneDriveStatus.OK, 12)
+
+    scheduler.observe(OneDriveStatus.NOT_RUNNING)
+    assert scheduler.next_interval() == 2.0
+
+
+def test_check_lands_on_persistence_threshold():
+    clock = FakeClock()
+    scheduler = make(clock, jitter=0.0, bounds={OneDriveStatus.PAUSED: (40.0, 60.0)})
+    scheduler.observe(OneDriveStatus.PAUSED)
+
+    elapsed = 0.0
+    while elapsed < 90:
+        interval = scheduler.next_interval()
+        elapsed += interval
+        clock.now += interval
+        scheduler.observe(OneDriveStatus.PAUSED)
+    # Confirmed at the first check after 90s, not up to 40s later
+    assert 90 <= elapsed <= 91
+
+
+def test_bounds_from_config():
+    scheduler = AdaptiveScheduler.from_config({"ok": [30, 300], "bogus": [1, 2]})
+    assert scheduler.bounds[OneDriveStatus.OK] == (30.0, 300.0)
@@ -0,0 +1,30 @@
+"""Tests for the mtime-gated settings file scan."""
+
+import os
+
+from src.monitor.settings_scan import SETTINGS_FILES, SettingsFileCache
+
+
+def test_unchanged_file_is_not_rescanned(tmp_path):
+    dat = tmp_path / "global.dat"
+    dat.write_bytes(b"\x00\x01UserState\x00Active\x00" * 1000)
+    cache = SettingsFileCache()
+
+    assert cache.find(dat) is None
+    assert cache.find(dat) is None
+    assert (cache.scans, cache.skips) == (1, 1)
+
+    dat.write_bytes(b"\x00\x01UserState\x00SignedOut\x00" * 1000)
+    os.utime(dat, ns=(1, 2_000_000_000))
+    assert cache.find(dat) == "SignedOut"
+    assert cache.scans == 2
+
+
+def test_utf16_ini_and_missing_files(tmp_path):
+    (tmp_path / "ClientPolicy.ini").write_bytes("[Policy]\r\nRequireSignIn = 1\r\n".encode("utf-16-le"))
+    (tmp_path / "global.ini").write_bytes(b"")
+    cache = SettingsFileCache()
+
+    hit = cache.find_any(tmp_path / name for name in SETTINGS_FILES)
+    assert hit == (tmp_path / "ClientPolicy.ini", "RequireSignIn")
+    assert cache.find(tmp_path / "missing.dat") is None
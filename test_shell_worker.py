@@ -0,0 +1,91 @@
+"""Tests for the persistent Shell.Application worker client.
+
+Uses the Python stand-in worker so it runs on any platform:
+    python -m pytest test_shell_worker.py
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.monitor.shell_worker import ShellStatusWorker
+
+
+@pytest.fixture
+def statuses(tmp_path):
+    path = tmp_path / "statuses.json"
+    path.write_text(json.dumps({".monitor_canary": "Disponible en este dispositivo"}), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def worker(statuses):
+    w = ShellStatusWorker(
+        command=[sys.executable, "-m", "src.monitor.shell_worker_stub", str(statuses)],
+        timeout=2,
+    )
+    yield w
+    w.close()
+
+
+def test_query_returns_column_value(worker, tmp_path):
+    assert worker.query(tmp_path / ".monitor_canary") == "Disponible en este dispositivo"
+
+
+def test_unknown_file_returns_none(worker, tmp_path):
+    assert worker.query(tmp_path / "otro.txt") is None
+
+
+def test_worker_is_reused_between_queries(worker, statuses, tmp_path):
+    canary = tmp_path / ".monitor_canary"
+    worker.query(canary)
+    pid = worker.pid
+
+    statuses.write_text(json.dumps({".monitor_canary": "Sincronizando"}), encoding="utf-8")
+    assert worker.query(canary) == "Sincronizando"
+    assert worker.pid == pid
+    assert worker.restart_count == 0
+
+
+def test_worker_restarts_after_crash(worker, tmp_path):
+    canary = tmp_path / ".monitor_canary"
+    worker.query(canary)
+    first_pid = worker.pid
+
+    assert worker.query(tmp_path / "__crash__") is None
+    assert worker.query(canary) == "Disponible en este dispositivo"
+    assert worker.pid != first_pid
+    assert worker.restart_count == 1
+
+
+def test_worker_restarts_after_timeout(statuses, tmp_path):
+    w = ShellStatusWorker(
+        command=[sys.executable, "-m", "src.monitor.shell_worker_stub", str(statuses)],
+        timeout=0.5,
+    )
+    try:
+        assert w.query(tmp_path / "__hang__") is None
+        assert w.pid is None
+        assert w.query(tmp_path / ".monitor_canary") == "Disponible en este dispositivo"
+    finally:
+        w.close()
+
+
+def test_worker_recycled_after_max_requests(statuses, tmp_path):
+    w = ShellStatusWorker(
+        command=[sys.executable, "-m", "src.monitor.shell_worker_stub", str(statuses)],
+        timeout=2,
+        max_requests=2,
+    )
+    try:
+        canary = Path(tmp_path / ".monitor_canary")
+        w.query(canary)
+        first_pid = w.pid
+        w.query(canary)
+        assert w.pid is None
+        assert w.query(canary) == "Disponible en este dispositivo"
+        assert w.pid != first_pid
+    finally:
+        w.close()
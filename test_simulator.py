@@ -0,0 +1,93 @@
+"""Tests for the OneDrive digital twin and the scenario runner."""
+
+import psutil
+import pytest
+
+from src.monitor.placeholder import PlaceholderState
+from src.monitor.process_finder import OneDriveProcessLocator
+from src.shared.schemas import OneDriveStatus
+from src.simulator.runner import SimulationRunner
+from src.simulator.scenario import BUILTIN_SCENARIOS, Scenario
+from src.simulator.twin import SimulatedOneDrive
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_twin_process_table_follows_kill_and_restart(tmp_path):
+    twin = SimulatedOneDrive(tmp_path, background_processes=5)
+    locator = OneDriveProcessLocator(False, process_iter=twin.process_iter, get_process=twin.get_process)
+    first = locator.find()
+    assert first == twin.pid
+
+    twin.kill()
+    assert locator.find() is None
+    with pytest.raises(psutil.NoSuchProcess):
+        twin.get_process(first)
+
+    twin.restart()
+    assert locator.find() == twin.pid != first
+
+
+def test_canary_syncs_only_while_healthy(tmp_path):
+    clock = FakeClock()
+    twin = SimulatedOneDrive(tmp_path, sync_delay=5, clock=clock)
+    canary = twin.folder / ".monitor_canary"
+    canary.write_text("x")
+    written = canary.stat().st_mtime
+    clock.now = written + 1
+    assert twin.placeholder_provider.state(canary) is PlaceholderState.NOT_PLACEHOLDER
+
+    twin.pause()
+    clock.now = written + 60
+    assert twin.placeholder_provider.state(canary) is PlaceholderState.NOT_PLACEHOLDER
+
+    twin.resume()
+    clock.now = written + 66
+    assert twin.placeholder_provider.state(canary) is PlaceholderState.IN_SYNC
+
+    # Already uploaded files stay placeholders when the client dies
+    twin.kill()
+    assert twin.placeholder_provider.state(canary) is PlaceholderState.IN_SYNC
+
+
+def test_sign_out_shows_auth_everywhere_until_sign_in(tmp_path):
+    twin = SimulatedOneDrive(tmp_path)
+    twin.sign_out()
+    twin.tick()
+    assert twin.auth_window_titles() and "AUTH_WINDOW:" in twin.tray_auth_output()
+    assert "ReauthRequired" in twin.log_path.read_text(encoding="utf-8")
+
+    inode = twin.log_path.stat().st_ino
+    twin.sign_in()
+    assert not twin.auth_window_titles()
+    assert "ReauthRequired" not in twin.log_path.read_text(encoding="utf-8")
+    assert twin.log_path.stat().st_ino != inode
+
+
+def test_scenario_loads_from_yaml(tmp_path):
+    path = tmp_path / "outage.yaml"
+    path.write_text("name: outage\nduration: 60\nevents:\n  - {at: 10, action: kill, expect: NOT_RUNNING}\n")
+    scenario = Scenario.load(path)
+    assert scenario.events[0].expect is OneDriveStatus.NOT_RUNNING
+
+    path.write_text("name: bad\nduration: 60\nevents:\n  - {at: 10, action: explode}\n")
+    with pytest.raises(ValueError):
+        Scenario.load(path)
+
+
+@pytest.mark.parametrize("name", ["crash_restart", "auth_expired"])
+def test_pipeline_detects_and_remediates(tmp_path, name):
+    runner = SimulationRunner(tmp_path, time_scale=0.01, check_interval=5, background_processes=20)
+    result = runner.run(BUILTIN_SCENARIOS[name])
+
+    assert result.passed, result.timeline
+    assert result.restarts >= 1
+    subjects = [n.subject for n in result.notifications]
+    assert any(result.detections[0].expected.value in s for s in subjects)
+    assert any("RESUELTO" in s for s in subjects)
@@ -0,0 +1,113 @@
+"""Tests for change-aware status.json publication and its heartbeat."""
+
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytest
+
+from src.shared.schemas import OneDriveStatus, ProbeMetricsSnapshot, StatusReport
+from src.shared.status_file import StatusPublisher, heartbeat_path_for, read_status
+
+T0 = datetime(2026, 1, 5, 9, 0, 0)
+
+
+def report(seconds: int = 0, status: OneDriveStatus = OneDriveStatus.OK, calls: int = 1,
+           detail: Optional[str] = None) -> StatusReport:
+    return StatusReport(
+        timestamp=T0 + timedelta(seconds=seconds),
+        account_email="ana@contoso.com",
+        account_folder=r"C:\Users\ana\OneDrive - Contoso",
+        status=status,
+        status_detail=detail,
+        process_running=True,
+        message="OK",
+        probe_metrics={"process_check": ProbeMetricsSnapshot(calls=calls)},
+    )
+
+
+def test_unchanged_body_only_beats(tmp_path):
+    path = tmp_path / "status.json"
+    publisher = StatusPublisher(path)
+    assert publisher.publish(report(0))
+    inode = os.stat(path).st_ino
+
+    # Only the timestamp and the metrics move: status.json is left alone
+    for i in range(1, 20):
+        assert not publisher.publish(report(15 * i, calls=i + 1))
+    assert (publisher.writes, publisher.skipped) == (1, 19)
+    assert os.stat(path).st_ino == inode
+    assert set(os.listdir(tmp_path)) == {"status.json", "status.heartbeat.json"}
+
+    data = read_status(path)
+    assert data["timestamp"] == (T0 + timedelta(seconds=285)).isoformat()
+    assert data["status_timestamp"] == T0.isoformat()
+    assert b" " not in path.read_bytes().replace(b"OneDrive - Contoso", b"")
+
+    # A status change rewrites it
+    assert publisher.publish(report(300, OneDriveStatus.PAUSED))
+    assert json.loads(path.read_text(encoding="utf-8"))["status"] == "PAUSED"
+    assert read_status(path)["timestamp"] == (T0 + timedelta(seconds=300)).isoformat()
+
+
+def test_only_ok_and_syncing_counters_are_left_out_of_the_hash(tmp_path):
+    publisher = StatusPublisher(tmp_path / "status.json")
+    assert publisher.publish(report(0, detail="Activo (Sincronizado hace 3s)"))
+    assert not publisher.publish(report(15, detail="Activo (Sincronizado hace 18s)"))
+    assert publisher.publish(report(30, OneDriveStatus.SYNCING, detail="Sincronizando (Pendiente 75s)"))
+    assert not publisher.publish(report(45, OneDriveStatus.SYNCING, detail="Sincronizando (Pendiente 90s)"))
+
+    # A new cause of the same failure status is published right away
+    assert publisher.publish(report(60, OneDriveStatus.PAUSED, detail="Pausado/Error (Pausado)"))
+    assert publisher.publish(report(75, OneDriveStatus.PAUSED, detail="Pausado/Error (Error de sincronización)"))
+    assert read_status(publisher.path)["status_detail"] == "Pausado/Error (Error de sincronización)"
+
+
+def test_heartbeat_is_fixed_size_and_overwritten_in_place(tmp_path):
+    publisher = StatusPublisher(tmp_path / "status.json", fsync="always")
+    heartbeat = heartbeat_path_for(publisher.path)
+    publisher.publish(report(0))
+    inode = os.stat(heartbeat).st_ino
+    publisher.publish(report(15))
+    assert os.stat(heartbeat).st_ino == inode
+    assert len(heartbeat.read_bytes()) == 128
+
+
+def test_max_age_and_missing_file_force_rewrite(tmp_path):
+    path = tmp_path / "status.json"
+    publisher = StatusPublisher(path, max_age_seconds=0.01)
+    publisher.publish(report(0))
+    publisher._written_at -= 1
+    assert publisher.publish(report(15))
+
+    publisher = StatusPublisher(path, max_age_seconds=0)
+    publisher.publish(report(30))
+    path.unlink()
+    assert publisher.publish(report(45))
+
+
+def test_status_without_heartbeat_and_bad_policy(tmp_path):
+    path = tmp_path / "status.json"
+    path.write_text(report(0).model_dump_json(), encoding="utf-8")
+    assert read_status(path)["timestamp"] == T0.isoformat()
+    with pytest.raises(ValueError):
+        StatusPublisher(path, fsync="sometimes")
+
+
+def test_steady_simulated_monitor_skips_unchanged_reports(tmp_path, monkeypatch):
+    from src.shared import status_file
+    from src.simulator.runner import SimulationRunner
+    from src.simulator.scenario import Scenario
+
+    rewrites = []
+    publish = status_file.StatusPublisher.publish
+    monkeypatch.setattr(status_file.StatusPublisher, "publish",
+                        lambda self, report: rewrites.append(publish(self, report)) or rewrites[-1])
+
+    # Real checker reports: canary ages, probe phases and SyncDiagnostics blocks move every cycle
+    runner = SimulationRunner(tmp_path, time_scale=0.01, check_interval=5, background_processes=0)
+    result = runner.run(Scenario(name="steady", duration=240))
+    assert result.final_status is OneDriveStatus.OK
+    assert len({entry.detail for entry in result.timeline}) > 2
+    assert len(rewrites) > 20 and sum(rewrites) <= 3
@@ -0,0 +1,82 @@
+"""Tests for the typed SyncDiagnostics.log parser."""
+
+from src.monitor.log_tailer import LogTailer
+from src.monitor.sync_diagnostics import SyncDiagnosticsParser, only_canary_pending
+
+BLOCK = """UtcNow = {utc}
+SyncProgressState = {state}
+FilesToUpload = {up}
+FilesToDownload = 0
+BytesToUpload = {bytes_up}
+DiskSpaceAvailable = 1234
+"""
+
+
+def _block(utc="2026-10-17T10:00:00Z", state=0, up=0, bytes_up=0):
+    return BLOCK.format(utc=utc, state=state, up=up, bytes_up=bytes_up)
+
+
+def _tail(tmp_path, content, **parser_kwargs):
+    log = tmp_path / "SyncDiagnostics.log"
+    log.write_text(content, encoding="utf-8")
+    tailer = LogTailer(log)
+    parser = SyncDiagnosticsParser(**parser_kwargs)
+    tailer.subscribe(parser.feed, parser.reset)
+    tailer.poll()
+    return log, tailer, parser
+
+
+def test_latest_block_is_typed(tmp_path):
+    content = _block(up=7, bytes_up=900) + _block(utc="2026-10-17T10:01:00Z", state=16777216, up=1, bytes_up=10)
+    _, tailer, parser = _tail(tmp_path, content)
+
+    snap = parser.snapshot(tailer.offset)
+    assert snap.utc_now == "2026-10-17T10:01:00Z"
+    assert snap.sync_progress_state == 16777216
+    assert snap.files_to_upload == 1
+    assert snap.files_to_download == 0
+    assert snap.bytes_to_upload == 10
+    assert snap.extra == {"DiskSpaceAvailable": "1234"}
+    assert snap.blocks_parsed == 2
+    assert snap.auth_indicator is None
+    assert only_canary_pending(snap)
+
+
+def test_incremental_blocks(tmp_path):
+    log, tailer, parser = _tail(tmp_path, _block(up=0))
+    assert parser.snapshot(tailer.offset).files_to_upload == 0
+
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(_block(up=25))
+    tailer.poll()
+    snap = parser.snapshot(tailer.offset)
+    assert snap.files_to_upload == 25
+    assert not only_canary_pending(snap)
+
+
+def test_auth_indicator_single_matcher(tmp_path):
+    _, tailer, parser = _tail(tmp_path, _block() + "Status: reauthrequired for account\n")
+    assert parser.snapshot(tailer.offset).auth_indicator == "ReauthRequired"
+
+
+def test_auth_indicator_expires_outside_window(tmp_path):
+    log, tailer, parser = _tail(tmp_path, "TokenExpired\n", auth_window_bytes=100)
+    assert parser.snapshot(tailer.offset).auth_indicator == "TokenExpired"
+
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(_block() * 5)
+    tailer.poll()
+    assert parser.snapshot(tailer.offset).auth_indicator is None
+
+
+def test_reset_on_truncation(tmp_path):
+    log, tailer, parser = _tail(tmp_path, _block(up=9) + "SignIn\n")
+    log.write_text("FilesToUpload = 0\n", encoding="utf-8")
+    tailer.poll()
+    snap = parser.snapshot(tailer.offset)
+    assert snap.files_to_upload == 0
+    assert snap.auth_indicator is None
+
+
+def test_only_canary_pending_without_log():
+    assert only_canary_pending(None) is False
@@ -0,0 +1,72 @@
+"""Tests for probe deadlines, process-tree kill and the cycle watchdog."""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+import pytest
+
+from src.monitor.probes import run_probes
+from src.monitor.watchdog import CycleWatchdog, ProbeTimeoutError, run_with_deadline
+
+SPAWN_CHILD_AND_HANG = (
+    "import subprocess, sys, time;"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']);"
+    "print(child.pid, flush=True);"
+    "time.sleep(60)"
+)
+
+
+def test_fast_probe_returns_output():
+    result = run_with_deadline([sys.executable, "-c", "print('Sign in')"], timeout=10)
+    assert result.returncode == 0
+    assert result.stdout.strip() == "Sign in"
+
+
+def test_hung_probe_tree_is_killed(tmp_path):
+    script = tmp_path / "hang.py"
+    script.write_text(SPAWN_CHILD_AND_HANG)
+    before = {p.pid for p in psutil.Process().children(recursive=True)}
+
+    start = time.monotonic()
+    with pytest.raises(ProbeTimeoutError):
+        run_with_deadline([sys.executable, str(script)], timeout=1, name="auth_window_check")
+    assert time.monotonic() - start < 5
+
+    leftovers = [p for p in psutil.Process().children(recursive=True)
+                 if p.pid not in before and p.is_running() and p.status() != psutil.STATUS_ZOMBIE]
+    assert leftovers == []
+
+
+def test_timed_out_probe_uses_last_good_result():
+    def hangs():
+        raise ProbeTimeoutError("auth_window_check exceeded 10s")
+
+    last_good = {}
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = run_probes(pool, {"auth_window_check": lambda: True}, {}, {"auth_window_check": False}, last_good)
+        second = run_probes(pool, {"auth_window_check": hangs}, {}, {"auth_window_check": False}, last_good)
+
+    assert not first["auth_window_check"].stale
+    result = second["auth_window_check"]
+    assert result.timed_out and result.stale
+    assert result.value is True
+
+
+def test_cycle_overrun_is_flagged_once():
+    flagged = []
+    watchdog = CycleWatchdog(0.2, flagged.append, poll_seconds=0.05)
+    watchdog.start()
+    try:
+        watchdog.begin_cycle()
+        time.sleep(0.5)
+        assert len(flagged) == 1 and flagged[0] > 0.2
+        assert watchdog.current_overrun() is not None
+        assert watchdog.end_cycle() > 0.2
+
+        watchdog.begin_cycle()
+        assert watchdog.end_cycle() is None
+        assert watchdog.overruns == 1
+    finally:
+        watchdog.close()